@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+HTTP Server Benchmarks - Shadow Edition
+Load & throughput benchmarks for http_server.py
+
+USAGE:
+    python3 bench_http_server.py burst --clients 2000
+    python3 bench_http_server.py index --files 100000
+    python3 bench_http_server.py bigfile --sizes 1G,10G
+    python3 bench_http_server.py login --users 32 --concurrency 64
+    python3 bench_http_server.py archive --files 5000
+"""
+
+import asyncio
+import os
+import random
+import ssl
+import sys
+import time
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from http_server import (  # noqa: E402
+    ServerConfig, StaticIndex, SQLiteCredentialStore, generate_self_signed_cert, start_server
+)
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def bench_config(workdir: Path, **overrides) -> ServerConfig:
+    """Loopback config with rate limiting off and all state in workdir"""
+    return ServerConfig(
+        host="127.0.0.1",
+        port=0,
+        rate_limit_enabled=False,
+        serve_dir=workdir,
+        upload_dir=workdir / "uploads",
+        log_dir=workdir / "logs",
+        silent_mode=True,
+        **overrides
+    )
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def print_row(name: str, stats: Dict):
+    """Print one result row"""
+    print(
+        f"{name:<28} ok={stats['ok']:<6} 503={stats['shed']:<6} err={stats['errors']:<6} "
+        f"p50={stats['p50'] * 1000:8.1f}ms p99={stats['p99'] * 1000:8.1f}ms "
+        f"wall={stats['wall']:6.2f}s"
+    )
+
+# ============================================================================
+# BURST LOAD
+# ============================================================================
+
+async def _burst(url: str, clients: int) -> Dict:
+    """Open `clients` fresh connections at once and fetch url on each"""
+    latencies: List[float] = []
+    counts = {"ok": 0, "shed": 0, "errors": 0}
+
+    connector = aiohttp.TCPConnector(limit=0, force_close=True)
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def one():
+            start = time.perf_counter()
+            try:
+                async with session.get(url) as resp:
+                    await resp.read()
+                    if resp.status == 200:
+                        counts["ok"] += 1
+                        latencies.append(time.perf_counter() - start)
+                    elif resp.status == 503:
+                        counts["shed"] += 1
+                    else:
+                        counts["errors"] += 1
+            except Exception:
+                counts["errors"] += 1
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(clients)))
+        wall = time.perf_counter() - wall
+
+    return {
+        **counts,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": percentile(latencies, 99),
+        "wall": wall,
+    }
+
+async def bench_burst(clients: int, payload_kb: int):
+    """Compare default vs tuned listener under a connection burst"""
+    scenarios = [
+        ("default (backlog=128)", {"backlog": 128}),
+        ("tuned (backlog=4096)", {"backlog": 4096}),
+        ("tuned + admission=256", {"backlog": 4096, "max_connections": 256}),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "payload.bin").write_bytes(b"\0" * payload_kb * 1024)
+
+        print(f"Burst: {clients} concurrent connections, {payload_kb}KB payload")
+        for name, overrides in scenarios:
+            runner = await start_server(bench_config(workdir, **overrides))
+            port = runner.addresses[0][1]
+            try:
+                stats = await _burst(f"http://127.0.0.1:{port}/payload.bin", clients)
+            finally:
+                await runner.cleanup()
+            print_row(name, stats)
+
+# ============================================================================
+# STATIC INDEX
+# ============================================================================
+
+def _make_tree(root: Path, files: int, fanout: int = 100):
+    """Create `files` empty files spread over fanout-sized directories"""
+    for i in range(files):
+        directory = root / f"d{i // fanout // fanout}" / f"d{i // fanout}"
+        if i % fanout == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"f{i}.txt").touch()
+
+async def _hammer(url_base: str, paths: List[str], workers: int) -> Dict:
+    """Fetch paths over keep-alive connections, return status counts & latency"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    queue = list(paths)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=workers)) as session:
+        async def worker():
+            while queue:
+                path = queue.pop()
+                start = time.perf_counter()
+                async with session.get(url_base + path) as resp:
+                    await resp.read()
+                latencies.append(time.perf_counter() - start)
+                statuses[resp.status] = statuses.get(resp.status, 0) + 1
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        wall = time.perf_counter() - wall
+
+    return {"statuses": statuses, "p50": statistics.median(latencies), "rps": len(paths) / wall}
+
+async def bench_index(files: int, requests: int, workers: int):
+    """Random-path scanner traffic with and without the static index"""
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        serve = workdir / "www"
+        serve.mkdir()
+        print(f"Creating {files} files...")
+        _make_tree(serve, files)
+
+        misses = [f"d{random.randrange(100)}/wp-admin/{random.getrandbits(32):x}.php"
+                  for _ in range(requests)]
+
+        # Raw lookup cost per miss
+        index = StaticIndex(serve)
+        index.start()
+        index.ready.wait()
+        sample = misses[:10000]
+        start = time.perf_counter()
+        for path in sample:
+            index.lookup(path)
+        indexed = (time.perf_counter() - start) / len(sample)
+        start = time.perf_counter()
+        for path in sample:
+            target = (serve / path).resolve()
+            target.is_dir() or target.is_file()
+        disk = (time.perf_counter() - start) / len(sample)
+        stats = index.memory_stats()
+        index.stop()
+
+        print(f"Index build: {index.build_time:.2f}s for {stats['entries']} entries, "
+              f"{stats['bytes'] / 1024 / 1024:.1f}MB (~{stats['mb_per_million']:.0f}MB per million)")
+        print(f"Miss lookup: index={indexed * 1e6:.2f}us disk={disk * 1e6:.2f}us")
+
+        # End-to-end 404 throughput
+        for name, enabled in (("disk lookups", False), ("static index", True)):
+            runner = await start_server(bench_config(serve, static_index=enabled))
+            port = runner.addresses[0][1]
+            try:
+                if enabled:
+                    await asyncio.to_thread(runner.app['static_index'].ready.wait)
+                result = await _hammer(f"http://127.0.0.1:{port}/", misses, workers)
+            finally:
+                await runner.cleanup()
+            print(f"{name:<14} {result['rps']:8.0f} req/s p50={result['p50'] * 1000:.2f}ms "
+                  f"statuses={result['statuses']}")
+
+# ============================================================================
+# LARGE FILES OVER TLS
+# ============================================================================
+
+def parse_size(text: str) -> int:
+    """'512M' / '1G' / '4096' -> bytes"""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper()
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def _make_file(path: Path, size: int, sparse: bool):
+    """Dense file from a repeated random block, or a half-hole sparse file"""
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        if sparse:
+            # Data in the first quarter and the last quarter, holes elsewhere
+            quarter = size // 4
+            for _ in range(quarter // len(block)):
+                f.write(block)
+            f.seek(size - quarter)
+        written = f.tell()
+        while written < size:
+            chunk = block[:size - written]
+            f.write(chunk)
+            written += len(chunk)
+        f.truncate(size)
+
+async def _download(url: str) -> float:
+    """Download url, discard the body, return seconds taken"""
+    connector = aiohttp.TCPConnector(ssl=False)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        async with session.get(url) as resp:
+            async for _ in resp.content.iter_chunked(1024 * 1024):
+                pass
+        return time.perf_counter() - start
+
+async def bench_bigfile(sizes: List[int], sparse: bool, repeat: int):
+    """TLS download throughput: FileResponse vs large file engine"""
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        cert, key = workdir / "server.crt", workdir / "server.key"
+        if not await generate_self_signed_cert(cert, key):
+            print("openssl is required for the TLS benchmark")
+            return
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(cert, key)
+
+        for size in sizes:
+            name = f"file_{size}.bin"
+            print(f"Creating {size / 1024 ** 3:.2f}GB {'sparse' if sparse else 'dense'} file...")
+            _make_file(workdir / name, size, sparse)
+
+            for engine, enabled in (("FileResponse", False), ("large file", True)):
+                config = bench_config(workdir, use_ssl=True, large_file_engine=enabled)
+                runner = await start_server(config, ssl_context)
+                port = runner.addresses[0][1]
+                try:
+                    best = min([await _download(f"https://127.0.0.1:{port}/{name}")
+                                for _ in range(repeat)])
+                finally:
+                    await runner.cleanup()
+                print(f"  {engine:<14} {size / best / 1024 ** 2:8.1f} MB/s ({best:.2f}s)")
+
+            (workdir / name).unlink()
+
+# ============================================================================
+# LOGIN THROUGHPUT
+# ============================================================================
+
+async def _login_round(session: aiohttp.ClientSession, base: str, bodies: List[Dict],
+                       concurrency: int, path: str = "/auth/login") -> Dict:
+    """POST bodies with bounded concurrency while probing /health latency"""
+    latencies: List[float] = []
+    health: List[float] = []
+    results: List[Dict] = []
+    queue = list(bodies)
+    done = asyncio.Event()
+
+    async def worker():
+        while queue:
+            body = queue.pop()
+            start = time.perf_counter()
+            async with session.post(base + path, json=body) as resp:
+                results.append(await resp.json() if resp.status == 200 else {})
+            latencies.append(time.perf_counter() - start)
+
+    async def prober():
+        while not done.is_set():
+            start = time.perf_counter()
+            async with session.get(base + "/health") as resp:
+                await resp.read()
+            health.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    probe = asyncio.create_task(prober())
+    wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall
+    done.set()
+    await probe
+
+    return {
+        "rate": len(bodies) / wall,
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "health_p99": percentile(health, 99),
+        "ok": sum(1 for r in results if "token" in r),
+        "results": results,
+    }
+
+async def bench_login(users: int, logins: int, concurrency: int):
+    """Cold (bcrypt) vs cached logins vs refresh-token exchanges"""
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        store = SQLiteCredentialStore(workdir / "users.db")
+        print(f"Hashing {users} users...")
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(lambda i: store.set_password(f"user{i}", f"pass{i}"), range(users)))
+
+        config = bench_config(workdir, credential_store=workdir / "users.db")
+        runner = await start_server(config)
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        bodies = [{"username": f"user{i % users}", "password": f"pass{i % users}"}
+                  for i in range(logins)]
+
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+                rounds = [
+                    ("cold (hash per user)", bodies[:users]),
+                    ("cached (repeat logins)", bodies),
+                ]
+                for name, batch in rounds:
+                    stats = await _login_round(session, base, batch, concurrency)
+                    print(f"{name:<24} {stats['rate']:8.1f}/s ok={stats['ok']:<6} "
+                          f"p50={stats['p50'] * 1000:7.1f}ms p99={stats['p99'] * 1000:7.1f}ms "
+                          f"health_p99={stats['health_p99'] * 1000:6.1f}ms")
+
+                refresh = [{"refresh_token": r["refresh_token"]} for r in stats["results"] if r]
+                stats = await _login_round(session, base, refresh, concurrency, "/auth/refresh")
+                print(f"{'refresh exchange':<24} {stats['rate']:8.1f}/s ok={stats['ok']:<6} "
+                      f"p50={stats['p50'] * 1000:7.1f}ms p99={stats['p99'] * 1000:7.1f}ms "
+                      f"health_p99={stats['health_p99'] * 1000:6.1f}ms")
+        finally:
+            await runner.cleanup()
+
+# ============================================================================
+# ARCHIVE DOWNLOADS
+# ============================================================================
+
+async def _fetch_all(session: aiohttp.ClientSession, base: str, paths: List[str],
+                     workers: int) -> int:
+    """Fetch every path individually over keep-alive connections"""
+    queue = list(paths)
+    total = 0
+
+    async def worker():
+        nonlocal total
+        while queue:
+            async with session.get(base + queue.pop()) as resp:
+                total += len(await resp.read())
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return total
+
+async def _fetch_archive(session: aiohttp.ClientSession, url: str) -> int:
+    """Stream an archive response, return its size"""
+    total = 0
+    async with session.get(url) as resp:
+        async for chunk in resp.content.iter_chunked(256 * 1024):
+            total += len(chunk)
+    return total
+
+async def bench_archive(files: int, file_kb: int, workers: int):
+    """One streamed archive vs one request per file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        tree = workdir / "tree"
+        print(f"Creating {files} x {file_kb}KB files...")
+        paths = []
+        for i in range(files):
+            directory = tree / f"d{i // 100}"
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"f{i}.txt").write_bytes(os.urandom(file_kb * 512) * 2)
+            paths.append(f"tree/d{i // 100}/f{i}.txt")
+
+        runner = await start_server(bench_config(workdir, archive_downloads=True))
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+        runs = [
+            (f"individual x{workers}", lambda s: _fetch_all(s, base, paths, workers)),
+            ("archive=tar", lambda s: _fetch_archive(s, base + "tree/?archive=tar")),
+            ("archive=tar.zst", lambda s: _fetch_archive(s, base + "tree/?archive=tar.zst")),
+            ("archive=zip", lambda s: _fetch_archive(s, base + "tree/?archive=zip")),
+            ("archive=zip level=6", lambda s: _fetch_archive(s, base + "tree/?archive=zip&level=6")),
+        ]
+
+        try:
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=workers)) as session:
+                for name, run in runs:
+                    start = time.perf_counter()
+                    size = await run(session)
+                    wall = time.perf_counter() - start
+                    print(f"{name:<22} {wall:7.2f}s {size / 1024 ** 2:8.1f}MB "
+                          f"{files / wall:9.0f} files/s")
+            await _stalled_archives(base + "tree/?archive=tar")
+        finally:
+            await runner.cleanup()
+
+async def _stalled_archives(url: str):
+    """Clients that never read: past archive_workers they get 503, and the
+    default executor (DNS, aiofiles) stays responsive"""
+    loop = asyncio.get_running_loop()
+    stalled = min(32, (os.cpu_count() or 1) + 4)  # default executor size
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        responses = await asyncio.gather(*(session.get(url) for _ in range(stalled)))
+        try:
+            await asyncio.sleep(0.5)  # let the accepted producers fill their buffers and block
+            start = time.perf_counter()
+            await asyncio.wait_for(loop.getaddrinfo("localhost", 80), 10)
+            dns = time.perf_counter() - start
+            statuses = sorted(resp.status for resp in responses)
+            print(f"{stalled} stalled archive clients: "
+                  f"{statuses.count(200)} streaming, {statuses.count(503)} x 503, "
+                  f"getaddrinfo meanwhile {dns * 1000:.1f}ms")
+        finally:
+            for resp in responses:
+                resp.close()
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HTTP Server Benchmarks - Shadow Edition")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    burst = sub.add_parser("burst", help="Connection burst vs backlog/admission limits")
+    burst.add_argument("--clients", type=int, default=2000, help="Concurrent connections")
+    burst.add_argument("--payload-kb", type=int, default=256, help="Response size in KB")
+
+    index = sub.add_parser("index", help="404 throughput with/without static index")
+    index.add_argument("--files", type=int, default=100000, help="Files in the served tree")
+    index.add_argument("--requests", type=int, default=20000, help="Random-miss requests")
+    index.add_argument("--workers", type=int, default=64, help="Concurrent keep-alive clients")
+
+    bigfile = sub.add_parser("bigfile", help="TLS throughput: FileResponse vs large file engine")
+    bigfile.add_argument("--sizes", default="1G,10G", help="Comma-separated file sizes")
+    bigfile.add_argument("--sparse", action="store_true", help="Use half-hole sparse files")
+    bigfile.add_argument("--repeat", type=int, default=3, help="Downloads per engine (best kept)")
+
+    login = sub.add_parser("login", help="/auth/login throughput with a bcrypt store")
+    login.add_argument("--users", type=int, default=32, help="Users in the store")
+    login.add_argument("--logins", type=int, default=2000, help="Cached-login requests")
+    login.add_argument("--concurrency", type=int, default=64, help="Concurrent clients")
+
+    archive = sub.add_parser("archive", help="Streamed directory archive vs per-file fetches")
+    archive.add_argument("--files", type=int, default=5000, help="Files in the tree")
+    archive.add_argument("--file-kb", type=int, default=16, help="Size of each file in KB")
+    archive.add_argument("--workers", type=int, default=16, help="Concurrent per-file clients")
+
+    args = parser.parse_args()
+
+    if args.bench == "burst":
+        asyncio.run(bench_burst(args.clients, args.payload_kb))
+    elif args.bench == "index":
+        asyncio.run(bench_index(args.files, args.requests, args.workers))
+    elif args.bench == "bigfile":
+        sizes = [parse_size(size) for size in args.sizes.split(",")]
+        asyncio.run(bench_bigfile(sizes, args.sparse, args.repeat))
+    elif args.bench == "login":
+        asyncio.run(bench_login(args.users, args.logins, args.concurrency))
+    elif args.bench == "archive":
+        asyncio.run(bench_archive(args.files, args.file_kb, args.workers))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,944 @@
+#!/usr/bin/env python3
+"""
+═══════════════════════════════════════════════════════════════════
+    WiFi RECON & AUTO-CONNECT - BENCHMARKS
+    Offline benchmarks for wifi_auto_login.py (no radios required)
+═══════════════════════════════════════════════════════════════════
+
+USAGE:
+    python3 bench_wifi_auto_login.py probe --timeout 2
+    python3 bench_wifi_auto_login.py e2e --runs 20 --connect-latency 0.3
+    python3 bench_wifi_auto_login.py match --ssids 10000 --patterns 100
+    python3 bench_wifi_auto_login.py parse --lines 50000
+    python3 bench_wifi_auto_login.py fuzz --cases 100000
+    python3 bench_wifi_auto_login.py connect --runs 10 --connect-latency 0.5 --scan-latency 2
+    python3 bench_wifi_auto_login.py adapters --runs 5 --connect-latency 0.5 --scan-latency 0.5
+    python3 bench_wifi_auto_login.py startup --runs 10 [--script old_wifi_auto_login.py]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import tempfile
+import time
+import statistics
+import subprocess
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import wifi_auto_login  # noqa: E402
+from wifi_auto_login import (  # noqa: E402
+    Config, ConnectionManager, NetworkTools, ShadowWiFiArsenal, SSIDMatcher, WiFiNetwork, WiFiRecon,
+    split_terse, summarize_runs
+)
+
+# ═══════════════════════════════════════════════════════════════════
+# LOCAL PROBE TARGETS
+# ═══════════════════════════════════════════════════════════════════
+
+async def start_probe_server() -> web.AppRunner:
+    """Loopback stand-in for connectivity endpoints"""
+
+    async def blackhole(request: web.Request) -> web.Response:
+        await asyncio.sleep(3600)  # accepts, never answers
+        return web.Response()
+
+    async def generate_204(request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    async def redirect(request: web.Request) -> web.Response:
+        raise web.HTTPFound("http://portal.local/login")
+
+    async def network_auth_required(request: web.Request) -> web.Response:
+        return web.Response(status=511, text="<html>login required</html>")
+
+    app = web.Application()
+    app.router.add_get("/blackhole", blackhole)
+    app.router.add_get("/generate_204", generate_204)
+    app.router.add_get("/redirect", redirect)
+    app.router.add_get("/511", network_auth_required)
+
+    runner = web.AppRunner(app, shutdown_timeout=0.1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner
+
+# ═══════════════════════════════════════════════════════════════════
+# PROBE LATENCY
+# ═══════════════════════════════════════════════════════════════════
+
+async def bench_probe(timeout: float, hedge: float, repeat: int):
+    """Sequential vs hedged vs racing probes against black holes"""
+    runner = await start_probe_server()
+    base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    scenarios: Dict[str, List[str]] = {
+        "online (204 first)": ["/generate_204", "/blackhole", "/blackhole"],
+        "online (2 black holes)": ["/blackhole", "/blackhole", "/generate_204"],
+        "portal redirect": ["/blackhole", "/redirect", "/blackhole"],
+        "portal 511": ["/blackhole", "/blackhole", "/511"],
+    }
+    modes = [
+        ("sequential", timeout),  # next probe only after a timeout/failure
+        (f"hedged {hedge}s", hedge),
+        ("race", 0.0),
+    ]
+
+    print(f"Probe timeout {timeout}s, median of {repeat}")
+    try:
+        async with aiohttp.ClientSession() as session:
+            for name, paths in scenarios.items():
+                endpoints = [base + path for path in paths]
+                row = []
+                for mode, delay in modes:
+                    samples = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        result = await NetworkTools.probe(session, endpoints, timeout, delay)
+                        samples.append(time.perf_counter() - start)
+                    verdict = result[0] if result else "none"
+                    row.append(f"{mode}={statistics.median(samples) * 1000:7.1f}ms ({verdict})")
+                print(f"{name:<24} " + "  ".join(row))
+    finally:
+        await runner.cleanup()
+
+# ═══════════════════════════════════════════════════════════════════
+# FAKE RADIO (nmcli / iw on PATH)
+# ═══════════════════════════════════════════════════════════════════
+
+FAKE_NMCLI = """#!{python}
+import fcntl, glob, json, os, sys, time
+path = os.environ["FAKE_WIFI_STATE"]
+state = json.load(open(path))
+args = sys.argv[1:]
+profiles = state.setdefault("profiles", {{}})
+locks = state.setdefault("bssid_locks", {{}})  # profile -> 802-11-wireless.bssid
+
+def arg(name):
+    return args[args.index(name) + 1] if name in args else None
+
+def fail(message, code=4):
+    sys.stderr.write("Error: {{}}\\n".format(message))
+    sys.exit(code)
+
+def update(change):
+    # Radios run nmcli concurrently: re-read, change and replace the state under a lock
+    with open(path + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        current = json.load(open(path))
+        change(current)
+        tmp = "{{}}.{{}}".format(path, os.getpid())
+        json.dump(current, open(tmp, "w"))
+        os.replace(tmp, path)
+
+def read(name):
+    try:
+        return open(name).read()
+    except OSError:
+        return ""
+
+def owner(name):
+    return "{{}}.profile.{{}}".format(path, name.encode().hex())
+
+def release(iface):
+    for held in glob.glob(glob.escape(path) + ".profile.*"):
+        if read(held) == iface:
+            os.remove(held)
+
+def claim(name, iface):
+    # NetworkManager runs a profile on one device at a time
+    release(iface)  # and one connection per device
+    tmp = "{{}}.{{}}".format(owner(name), os.getpid())
+    open(tmp, "w").write(iface)
+    try:
+        os.link(tmp, owner(name))
+    except FileExistsError:
+        held = read(owner(name))
+        if held and held != iface:
+            fail("Connection activation failed: '{{}}' is already active on {{}}.".format(name, held))
+    finally:
+        os.remove(tmp)
+
+def activate(name, ssid, bssid, lock=None):
+    iface = arg("ifname") or state.get("interface", "wlan0")
+    claim(name, iface)
+    time.sleep(state.get("connect_latency", 0))
+    if ssid in state.get("fail", []) or bssid in state.get("fail", []):
+        release(iface)
+        fail("Connection activation failed.")
+    def change(current):
+        current["active_bssid"] = bssid
+        current.setdefault("profiles", {{}})[name] = ssid
+        if lock:
+            current.setdefault("bssid_locks", {{}})[name] = lock
+    update(change)
+    # Per adapter, so concurrent connects on several radios don't race on the state file
+    open(path + ".active." + iface, "w").write(bssid or "")
+    print("Device '{{}}' successfully activated.".format(iface))
+
+if "wifi" in args and "list" in args:
+    if arg("--rescan") == "yes":
+        time.sleep(state.get("scan_latency", 0))
+    sys.stdout.write(state.get("scans", {{}}).get(arg("ifname"), state.get("scan", "")))
+elif "dev" in args and "disconnect" in args:
+    active = path + ".active." + arg("disconnect")
+    if os.path.exists(active):
+        os.remove(active)
+    release(arg("disconnect"))
+elif "con" in args and "modify" in args:
+    name = arg("modify")
+    if name not in profiles:
+        fail("unknown connection '{{}}'.".format(name), 10)
+    def change(current):
+        if "802-11-wireless.bssid" in args:
+            current["bssid_locks"].pop(name, None)
+            if arg("802-11-wireless.bssid"):
+                current["bssid_locks"][name] = arg("802-11-wireless.bssid")
+    update(change)
+elif "con" in args and "show" in args:
+    for name in profiles:
+        print(name.replace("\\\\", "\\\\\\\\").replace(":", "\\\\:"))
+elif "con" in args and "up" in args:
+    name = arg("id")
+    if name not in profiles:
+        fail("unknown connection '{{}}'.".format(name), 10)
+    locked = locks.get(name)
+    if locked and arg("ap") not in (None, locked):
+        # A profile with a BSSID only matches that AP
+        fail("Connection activation failed: no compatible access point.")
+    activate(name, profiles[name], arg("ap") or locked)
+elif "connect" in args:
+    ssid = arg("connect")
+    bssid = arg("bssid")
+    if bssid is None:
+        # NetworkManager picks the AP itself, scanning first
+        time.sleep(state.get("scan_latency", 0))
+        bssid = state.get("aps", {{}}).get(ssid)
+    # A bssid argument is stored in the new profile
+    activate(arg("name") or ssid, ssid, bssid, lock=arg("bssid"))
+"""
+
+FAKE_IW = """#!{python}
+import json, os
+state = json.load(open(os.environ["FAKE_WIFI_STATE"]))
+for phy, iface in enumerate(state.get("interfaces") or [state.get("interface", "wlan0")]):
+    print("phy#{{}}\\n\\tInterface {{}}".format(phy, iface))
+"""
+
+def terse_escape(value: str) -> str:
+    """Escape a field the way `nmcli -t` does"""
+    return value.replace("\\", "\\\\").replace(":", "\\:")
+
+def terse_line(ssid: str, bssid: str, signal: int, channel: int = 6,
+               security: str = "WPA2", in_use: bool = False) -> str:
+    """One `nmcli -t -f IN-USE,BSSID,SSID,CHAN,SIGNAL,SECURITY,FREQ` line"""
+    freq = "2437 MHz" if channel <= 14 else "5180 MHz"
+    fields = ["*" if in_use else " ", bssid, ssid, str(channel), str(signal), security, freq]
+    return ":".join(terse_escape(f) for f in fields)
+
+def default_route_interface() -> str:
+    """Interface holding the default route, so link-readiness checks pass"""
+    try:
+        with open("/proc/net/route") as f:
+            next(f)
+            for line in f:
+                fields = line.split()
+                if len(fields) > 1 and fields[1] == "00000000":
+                    return fields[0]
+    except (OSError, StopIteration):
+        pass
+    return "wlan0"
+
+class FakeRadio:
+    """Scripted nmcli/iw installed at the front of PATH"""
+    
+    def __init__(self, root: Path):
+        self.bin_dir = root / "bin"
+        self.state_file = root / "radio.json"
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        for name, template in (("nmcli", FAKE_NMCLI), ("iw", FAKE_IW)):
+            tool = self.bin_dir / name
+            tool.write_text(template.format(python=sys.executable))
+            tool.chmod(0o755)
+        self.configure([])
+    
+    def configure(self, networks: List[Tuple[str, str, int]], connect_latency: float = 0.0,
+                  scan_latency: float = 0.0, fail: Optional[List[str]] = None,
+                  interface: Optional[str] = None,
+                  adapters: Optional[Dict[str, List[Tuple[str, str, int]]]] = None):
+        """
+        Set scan results (ssid, bssid, signal) and tool latencies
+        
+        adapters maps extra radios to what each one hears; `networks` is
+        then what nmcli lists without an ifname. fail holds SSIDs or
+        BSSIDs whose activation fails.
+        """
+        def lines(rows):
+            return "".join(terse_line(ssid, bssid, signal) + "\n" for ssid, bssid, signal in rows)
+        
+        aps: Dict[str, str] = {}
+        for ssid, bssid, _ in networks:
+            aps.setdefault(ssid, bssid)  # the AP NetworkManager would pick: first listed
+        for pattern in (".active.*", ".profile.*"):
+            for stale in self.state_file.parent.glob(self.state_file.name + pattern):
+                stale.unlink()
+        self.state_file.write_text(json.dumps({
+            "scan": lines(networks),
+            "scans": {iface: lines(rows) for iface, rows in (adapters or {}).items()},
+            "interfaces": list(adapters or []),
+            "aps": aps,
+            "connect_latency": connect_latency,
+            "scan_latency": scan_latency,
+            "fail": fail or [],
+            "interface": interface or default_route_interface(),
+        }))
+    
+    def active(self, interface: str) -> Optional[str]:
+        """BSSID the fake NetworkManager has up on interface"""
+        path = self.state_file.parent / f"{self.state_file.name}.active.{interface}"
+        return path.read_text() if path.exists() else None
+    
+    def state(self) -> Dict:
+        return json.loads(self.state_file.read_text())
+    
+    def install(self):
+        os.environ["PATH"] = f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+        os.environ["FAKE_WIFI_STATE"] = str(self.state_file)
+
+# ═══════════════════════════════════════════════════════════════════
+# CAPTIVE PORTAL SIMULATOR
+# ═══════════════════════════════════════════════════════════════════
+
+class PortalSimulator:
+    """
+    Local captive portal: intercepts the probe URL until a login succeeds
+    
+    mode "redirect" answers probes with 302 to /login, mode "511" with
+    Network Authentication Required carrying the login form. Mode
+    "cookie" redirects like "redirect" but the redirect sets a session
+    cookie that the login page and form post must carry. Mode "soft_reject"
+    redirects like "redirect" but answers a failed login with 200 and the
+    form again, under a "Welcome ... Login unsuccessful" banner. Every form
+    has a one-time hidden CSRF token; `delay` slows every portal page.
+    Client TCP connections are counted in `connections`.
+    """
+    
+    LOGIN_FORM = (
+        "<html><body><h1>Guest WiFi</h1>"
+        "<form method='post' action='/login'>"
+        "<input type='hidden' name='csrf_token' value='{token}'>"
+        "<input type='text' name='user_id' placeholder='Username'>"
+        "<input type='password' name='pass_word'>"
+        "<button type='submit'>Sign in</button>"
+        "</form></body></html>"
+    )
+    
+    def __init__(self, username: str, password: str, mode: str = "redirect", delay: float = 0.0):
+        self.username = username
+        self.password = password
+        self.mode = mode
+        self.delay = delay
+        self.authenticated = False
+        self._tokens = set()
+        self._sessions = set()
+        self._peers = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.base = ""
+    
+    def reset(self, mode: Optional[str] = None, delay: Optional[float] = None):
+        self.authenticated = False
+        self._tokens.clear()
+        self._sessions.clear()
+        self._peers.clear()
+        if mode is not None:
+            self.mode = mode
+        if delay is not None:
+            self.delay = delay
+    
+    @property
+    def connections(self) -> int:
+        return len(self._peers)
+    
+    @web.middleware
+    async def _count_peers(self, request: web.Request, handler):
+        self._peers.add(request.transport.get_extra_info("peername"))
+        return await handler(request)
+    
+    def _session_ok(self, request: web.Request) -> bool:
+        return self.mode != "cookie" or request.cookies.get("portal_session") in self._sessions
+    
+    def _form(self) -> str:
+        token = secrets.token_hex(16)
+        self._tokens.add(token)
+        return self.LOGIN_FORM.format(token=token)
+    
+    async def _probe(self, request: web.Request) -> web.Response:
+        if self.authenticated:
+            return web.Response(status=204)
+        if self.mode == "511":
+            return web.Response(status=511, text=self._form(), content_type="text/html")
+        redirect = web.HTTPFound(f"{self.base}/login?continue=generate_204")
+        if self.mode == "cookie":
+            session = secrets.token_hex(8)
+            self._sessions.add(session)
+            redirect.set_cookie("portal_session", session)
+        raise redirect
+    
+    async def _login_page(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.delay)
+        if not self._session_ok(request):
+            return web.Response(status=403, text="<html>Session expired</html>", content_type="text/html")
+        return web.Response(text=self._form(), content_type="text/html")
+    
+    async def _login(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.delay)
+        form = await request.post()
+        token = form.get("csrf_token")
+        if (token in self._tokens and self._session_ok(request) and form.get("user_id") == self.username
+                and form.get("pass_word") == self.password):
+            self._tokens.discard(token)
+            self.authenticated = True
+            return web.Response(text="<html>Welcome! You are logged in.</html>", content_type="text/html")
+        if self.mode == "soft_reject":
+            page = self._form().replace("<h1>Guest WiFi</h1>", "<h1>Welcome to Guest WiFi</h1><p>Login unsuccessful</p>")
+            return web.Response(text=page, content_type="text/html")
+        return web.Response(status=403, text=self._form(), content_type="text/html")
+    
+    async def start(self) -> str:
+        app = web.Application(middlewares=[self._count_peers])
+        app.router.add_get("/generate_204", self._probe)
+        app.router.add_get("/login", self._login_page)
+        app.router.add_post("/login", self._login)
+        self._runner = web.AppRunner(app, shutdown_timeout=0.1)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.base = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self.base
+    
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+# ═══════════════════════════════════════════════════════════════════
+# END-TO-END TIME TO INTERNET
+# ═══════════════════════════════════════════════════════════════════
+
+BENCH_NETWORKS = [
+    ("Cafe-Guest", "AA:BB:CC:00:00:01", 72),
+    ("BENCH-2", "AA:BB:CC:00:00:02", 64),
+    ("BENCH-1", "AA:BB:CC:00:00:03", 81),
+    ("eduroam", "AA:BB:CC:00:00:04", 55),
+]
+
+def cached_login(cache_dir: Path) -> bool:
+    """Whether the auth cache holds a live session"""
+    try:
+        entries = json.loads((cache_dir / "auth_cache.json").read_text())
+    except (OSError, ValueError):
+        return False
+    return any(entry.get("authenticated_at") for entry in entries.values())
+
+async def bench_e2e(runs: int, connect_latency: float, scan_latency: float, slow: float):
+    """Time-to-internet of ShadowWiFiArsenal.execute against fakes, per portal flow"""
+    root = Path(tempfile.mkdtemp(prefix="wifi_bench_"))
+    os.environ["HOME"] = str(root / "home")  # credentials/keys stay out of the real home
+    
+    radio = FakeRadio(root)
+    radio.configure(BENCH_NETWORKS, connect_latency, scan_latency)
+    radio.install()
+    
+    # The simulator needs no JavaScript: measure the browser-free path only
+    wifi_auto_login.SELENIUM_AVAILABLE = False
+    
+    portal = PortalSimulator("bench", "bench-pass")
+    base = await portal.start()
+    
+    scenarios = [
+        ("redirect", "redirect", 0.0, "bench-pass"),
+        ("511", "511", 0.0, "bench-pass"),
+        ("session cookie", "cookie", 0.0, "bench-pass"),
+        (f"slow {slow}s", "redirect", slow, "bench-pass"),
+        # Wrong password, rejected with 200 + the form: must not count as a login
+        ("rejected with 200", "soft_reject", 0.0, "wrong-pass"),
+    ]
+    print(f"{runs} runs per flow, connect {connect_latency}s, scan {scan_latency}s")
+    try:
+        for name, mode, delay, password in scenarios:
+            cache_dir = root / name.replace(" ", "_") / "cache"
+            config = Config(
+                wifi_patterns=["BENCH-*"],
+                portal_url=f"{base}/login",
+                username="bench",
+                password=password,
+                silent_mode=True,
+                max_retries=1,
+                connection_timeout=5,
+                probe_endpoints=[f"{base}/generate_204"],
+                probe_timeout=2.0,
+                log_dir=cache_dir.parent / "logs",
+                cache_dir=cache_dir,
+            )
+            samples, failures, connections, false_logins = [], 0, 0, 0
+            for _ in range(runs):
+                portal.reset(mode, delay)
+                (cache_dir / "auth_cache.json").unlink(missing_ok=True)
+                arsenal = ShadowWiFiArsenal(config)
+                start = time.perf_counter()
+                ok = await arsenal.execute()
+                elapsed = time.perf_counter() - start
+                connections += portal.connections
+                if ok and portal.authenticated:
+                    samples.append(elapsed)
+                else:
+                    failures += 1
+                    false_logins += ok or cached_login(cache_dir)
+            
+            print(f"\n== {name}: {len(samples)}/{runs} online ==")
+            if false_logins:
+                print(f"FALSE SUCCESS (reported or cached without a login): {false_logins}/{runs}")
+            if samples:
+                samples.sort()
+                p95 = samples[max(0, int(len(samples) * 0.95 + 0.5) - 1)]
+                print(f"time to internet  p50 {statistics.median(samples) * 1000:7.1f}ms  "
+                      f"p95 {p95 * 1000:7.1f}ms  max {samples[-1] * 1000:7.1f}ms")
+            print(f"portal TCP connections per run: {connections / runs:.1f}")
+            print(summarize_runs(cache_dir))
+    finally:
+        await portal.stop()
+
+# ═══════════════════════════════════════════════════════════════════
+# CONNECT LATENCY
+# ═══════════════════════════════════════════════════════════════════
+
+async def bench_connect(runs: int, connect_latency: float, scan_latency: float):
+    """
+    `dev wifi connect <ssid>` vs a BSSID-pinned `con up ... ap <bssid>`
+    
+    The fake nmcli models NetworkManager choosing the AP itself (the first
+    listed, after a rescan) for the unpinned path; real radios will differ
+    in the numbers, not in which AP gets used.
+    """
+    root = Path(tempfile.mkdtemp(prefix="wifi_bench_"))
+    os.environ["HOME"] = str(root / "home")
+    networks = [
+        ("CampusNet", "AA:BB:CC:00:10:01", 48),  # listed first, weaker
+        ("CampusNet", "AA:BB:CC:00:10:02", 86),  # ranked best
+    ]
+    radio = FakeRadio(root)
+    radio.configure(networks, connect_latency, scan_latency)
+    radio.install()
+    
+    config = Config(
+        wifi_patterns=["CampusNet"],
+        portal_url="http://127.0.0.1/",
+        username="bench",
+        password="bench",
+        silent_mode=True,
+        connection_timeout=10,
+        log_dir=root / "logs",
+        cache_dir=root / "cache",
+    )
+    logger = logging.getLogger("bench_connect")
+    manager = ConnectionManager(config, wifi_auto_login.WiFiRecon(logger), logger)
+    await manager.scan()
+    best = manager.candidates[0]
+    
+    async def legacy() -> bool:
+        ok, _ = await manager._run_nmcli(["dev", "wifi", "connect", best.ssid], timeout=config.connection_timeout)
+        return ok
+    
+    print(f"{runs} connects, fake connect {connect_latency}s, rescan {scan_latency}s, best AP {best.bssid}")
+    for name, connect in (("dev wifi connect", legacy), ("pinned con up", lambda: manager.connect_to_network(best))):
+        samples, on_best = [], 0
+        for _ in range(runs):
+            start = time.perf_counter()
+            ok = await connect()
+            samples.append(time.perf_counter() - start)
+            on_best += ok and radio.state().get("active_bssid") == best.bssid
+        samples.sort()
+        print(f"{name:<18} p50 {statistics.median(samples) * 1000:7.1f}ms  "
+              f"max {samples[-1] * 1000:7.1f}ms  "
+              f"on ranked AP {on_best}/{runs}")
+    
+    # The same profile must still be usable once another AP ranks best
+    other = manager.candidates[1]
+    ok = await manager.connect_to_network(other)
+    print(f"{'switch to other AP':<18} {'ok' if ok and radio.state().get('active_bssid') == other.bssid else 'FAILED'} "
+          f"({other.bssid})")
+    state = radio.state()
+    print(f"profiles: {sorted(state.get('profiles', {}))}  bssid locks: {state.get('bssid_locks')}")
+
+# ═══════════════════════════════════════════════════════════════════
+# MULTIPLE ADAPTERS
+# ═══════════════════════════════════════════════════════════════════
+
+ADAPTER_NETWORKS = {
+    # built-in radio, near the east wing AP
+    "wlan0": [("Library", "AA:BB:CC:00:20:01", 44), ("Library", "AA:BB:CC:00:20:02", 74)],
+    # USB radio by the window
+    "wlan1": [("Library", "AA:BB:CC:00:20:01", 83), ("Library", "AA:BB:CC:00:20:02", 49),
+              ("Library", "AA:BB:CC:00:20:03", 52)],
+}
+
+async def bench_adapters(runs: int, connect_latency: float, scan_latency: float):
+    """
+    Primary adapter only vs every adapter: scan time, the AP/adapter
+    picked, and failover time when the best AP refuses us
+    """
+    root = Path(tempfile.mkdtemp(prefix="wifi_bench_"))
+    os.environ["HOME"] = str(root / "home")
+    radio = FakeRadio(root)
+    heard = [net for rows in ADAPTER_NETWORKS.values() for net in rows]
+    radio.configure(heard, connect_latency, scan_latency, adapters=ADAPTER_NETWORKS)
+    radio.install()
+    
+    config = Config(
+        wifi_patterns=["Library"],
+        portal_url="http://127.0.0.1/",
+        username="bench",
+        password="bench",
+        silent_mode=True,
+        connection_timeout=10,
+        log_dir=root / "logs",
+        cache_dir=root / "cache",
+    )
+    logger = logging.getLogger("bench_adapters")
+    logger.addHandler(logging.NullHandler())  # refused connects are expected below
+    
+    def manager(all_adapters: bool) -> ConnectionManager:
+        recon = WiFiRecon(logger)
+        if not all_adapters:
+            recon.interfaces = recon.interfaces[:1]
+            recon.interface = recon.interfaces[0]
+        return ConnectionManager(config, recon, logger)
+    
+    def timed_ms(samples: List[float]) -> str:
+        return f"p50 {statistics.median(samples) * 1000:7.1f}ms  max {max(samples) * 1000:7.1f}ms"
+    
+    print(f"{runs} runs, adapters {list(ADAPTER_NETWORKS)}, "
+          f"fake connect {connect_latency}s, rescan {scan_latency}s")
+    
+    # Scan: one adapter after the other vs all at once
+    multi = manager(True)
+    serial, concurrent = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for iface in multi.recon.interfaces:
+            await multi.recon._scan_interface(iface, 15.0)
+        serial.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await multi.scan()
+        concurrent.append(time.perf_counter() - start)
+    print(f"{'scan one by one':<22} {timed_ms(serial)}")
+    print(f"{'scan concurrently':<22} {timed_ms(concurrent)}")
+    
+    # What gets picked
+    for name, all_adapters in (("primary adapter only", False), ("all adapters", True)):
+        mgr = manager(all_adapters)
+        await mgr.scan()
+        best = mgr.assign_adapters(mgr.candidates)[0]
+        print(f"{name:<22} picks {best.bssid} on {best.interface} ({best.signal}%)")
+    
+    # Failover: the ranked-best AP refuses the connection
+    radio.configure(heard, connect_latency, scan_latency, fail=[best.bssid], adapters=ADAPTER_NETWORKS)
+    for name, all_adapters in (("failover one by one", False), ("failover across radios", True)):
+        mgr = manager(True)
+        await mgr.scan()
+        if not all_adapters:
+            mgr.recon.interfaces = mgr.recon.interfaces[:1]  # same candidates, one at a time
+        samples, linked = [], 0
+        for _ in range(runs):
+            mgr.current_network = None
+            for iface in ADAPTER_NETWORKS:  # offline: nothing left up from the last run
+                await mgr._run_nmcli(["dev", "disconnect", iface], timeout=5)
+            start = time.perf_counter()
+            ok = await mgr.auto_connect_best(max_age=60)
+            samples.append(time.perf_counter() - start)
+            net = mgr.current_network
+            linked += ok and net is not None and radio.active(net.interface or "wlan0") == net.bssid
+        extra = [i for i in ADAPTER_NETWORKS if radio.active(i) and (not net or i != net.interface)]
+        print(f"{name:<22} {timed_ms(samples)}  up {linked}/{runs}  "
+              f"-> {net.bssid if net else None} on {net.interface if net else None}"
+              f"{f'  (also up: {extra})' if extra else ''}")
+
+# ═══════════════════════════════════════════════════════════════════
+# SSID MATCHING
+# ═══════════════════════════════════════════════════════════════════
+
+def legacy_find_matching(networks: List[WiFiNetwork], patterns: List[str]) -> List[WiFiNetwork]:
+    """The previous per-(network, pattern) regex rebuild, for comparison"""
+    matched = []
+    for network in networks:
+        for pattern in patterns:
+            regex_pattern = f"^{pattern.replace('*', '.*').replace('?', '.')}$"
+            if re.match(regex_pattern, network.ssid, re.IGNORECASE):
+                matched.append(network)
+                break
+    return matched
+
+def make_ssids(count: int, rng: random.Random) -> List[str]:
+    stems = ["STWCU_LR", "STWCU_ICR", "Cafe", "eduroam", "HP-Print", "Guest.WiFi", "Lab(5G)", "Net+"]
+    return [f"{rng.choice(stems)}-{rng.randrange(200)}" for _ in range(count)]
+
+def make_patterns(count: int, rng: random.Random) -> List[str]:
+    shapes = [
+        lambda i: f"SITE{i}_LR-*",                # literal prefix
+        lambda i: f"Office-{i}",                  # exact
+        lambda i: f"Floor?{i}-*-AP",              # general glob
+        lambda i: f"Guest.WiFi-{i}",              # metacharacters, literal
+    ]
+    patterns = [shapes[i % len(shapes)](i) for i in range(count - 2)]
+    return patterns + ["STWCU_LR-*", "STWCU_ICR-*"]
+
+def bench_match(ssid_count: int, pattern_count: int, repeat: int):
+    """Legacy per-pair regexes vs the precompiled SSIDMatcher"""
+    rng = random.Random(7)
+    networks = [WiFiNetwork(ssid, "00:00:00:00:00:00", 50, 6, "WPA2", "2437 MHz", False)
+                for ssid in make_ssids(ssid_count, rng)]
+    patterns = make_patterns(pattern_count, rng)
+    
+    def timed(fn) -> Tuple[float, List[WiFiNetwork]]:
+        samples, result = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples), result
+    
+    legacy_time, legacy = timed(lambda: legacy_find_matching(networks, patterns))
+    compile_time, _ = timed(lambda: SSIDMatcher(patterns))
+    matcher = SSIDMatcher(patterns)
+    matcher_time, matched = timed(lambda: matcher.filter(networks))
+    
+    print(f"{ssid_count} SSIDs x {pattern_count} patterns, median of {repeat}")
+    print(f"legacy    {legacy_time * 1000:9.1f}ms  ({len(legacy)} matched)")
+    print(f"compile   {compile_time * 1000:9.3f}ms")
+    print(f"matcher   {matcher_time * 1000:9.1f}ms  ({len(matched)} matched)  "
+          f"{legacy_time / matcher_time:.0f}x faster")
+    
+    # Where they disagree, it's the legacy regex treating '.' as a wildcard
+    extra = {n.ssid for n in legacy} - {n.ssid for n in matched}
+    print(f"legacy-only matches: {len(extra)}  e.g. {sorted(extra)[:3]}")
+    probe = SSIDMatcher(["Guest.WiFi-1"])
+    print(f"'Guest.WiFi-1' vs 'GuestXWiFi-1': matcher={probe.matches('GuestXWiFi-1')} "
+          f"legacy={bool(legacy_find_matching([networks[0]._replace(ssid='GuestXWiFi-1')], ['Guest.WiFi-1']))}")
+
+# ═══════════════════════════════════════════════════════════════════
+# TERSE OUTPUT PARSING
+# ═══════════════════════════════════════════════════════════════════
+
+def legacy_split(line: str) -> List[str]:
+    """The previous look-behind split + chained replaces, for comparison"""
+    parts = re.split(r"(?<!\\):", line)
+    return [p.replace("\\:", ":").replace("\\\\", "\\") for p in parts]
+
+FUZZ_ALPHABET = ["a", "Z", "0", " ", "-", "_", ":", "\\", "\\:", "::", "\\\\", "é", "☕", "*", "\x00", "\x01"]
+
+def fuzz_terse(cases: int, seed: int):
+    """Round-trip random fields through nmcli's escaping rules"""
+    rng = random.Random(seed)
+    failures, legacy_failures = 0, 0
+    for _ in range(cases):
+        fields = ["".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randrange(6)))
+                  for _ in range(rng.randrange(1, 9))]
+        line = ":".join(terse_escape(f) for f in fields)
+        if split_terse(line) != fields:
+            failures += 1
+            if failures <= 3:
+                print(f"MISMATCH {line!r}: {split_terse(line)!r} != {fields!r}")
+        if legacy_split(line) != fields:
+            legacy_failures += 1
+    print(f"{cases} random lines (seed {seed}): split_terse {failures} failures, "
+          f"legacy split {legacy_failures} failures")
+    if failures:
+        sys.exit(1)
+
+def make_scan_output(lines: int, rng: random.Random) -> str:
+    rows = []
+    for i in range(lines):
+        bssid = ":".join(f"{rng.randrange(256):02X}" for _ in range(6))
+        ssid = rng.choice(["STWCU_LR-", "Cafe:Guest-", "eduroam", "Lab\\5G-", ""]) + str(i % 500) + rng.choice(["", "", "\\"])
+        rows.append(terse_line(ssid, bssid, rng.randrange(101), rng.choice([1, 6, 11, 36]),
+                               rng.choice(["WPA2", "WPA1 WPA2", ""]), i == 0))
+    return "\n".join(rows) + "\n"
+
+def legacy_parse(output: str, logger: logging.Logger, debug: bool) -> List[WiFiNetwork]:
+    """The previous scan parser (eager f-string debug logging), for comparison"""
+    networks = []
+    for line in output.strip().split("\n"):
+        if not line.strip():
+            continue
+        parts = legacy_split(line)
+        if debug:
+            logger.debug(f"Parsing line: {line}")
+            logger.debug(f"Parts ({len(parts)}): {parts}")
+        if len(parts) < 7:
+            continue
+        ssid = parts[2].strip()
+        if not ssid or ssid == "--":
+            continue
+        signal_str, channel_str = parts[4].strip(), parts[3].strip()
+        network = WiFiNetwork(
+            ssid=ssid, bssid=parts[1].strip(),
+            signal=int(signal_str) if signal_str.isdigit() else 0,
+            channel=int(channel_str) if channel_str.isdigit() else 0,
+            security=parts[5].strip() or "--", frequency=parts[6].strip() or "Unknown",
+            in_use=parts[0].strip() == "*"
+        )
+        networks.append(network)
+        if debug:
+            logger.debug(f"✅ Parsed: {network}")
+    return networks
+
+def bench_parse(line_count: int, repeat: int):
+    """Legacy regex split vs single-pass tokenizer on a dense scan"""
+    output = make_scan_output(line_count, random.Random(11))
+    logger = logging.getLogger("bench_parse")
+    logger.setLevel(logging.INFO)  # debug_mode on, DEBUG records filtered out
+    
+    recon = WiFiRecon.__new__(WiFiRecon)  # skip interface detection
+    recon.logger = logger
+    
+    def timed(fn):
+        samples, result = [], None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples), result
+    
+    print(f"{line_count} scan lines, median of {repeat}")
+    for debug in (False, True):
+        recon.debug = debug
+        legacy_time, legacy = timed(lambda: legacy_parse(output, logger, debug))
+        new_time, parsed = timed(lambda: recon._parse_scan_output(output))
+        wrong = sum((Counter(parsed) - Counter(legacy)).values())
+        print(f"debug={str(debug):<5} legacy {legacy_time * 1000:8.1f}ms  "
+              f"tokenizer {new_time * 1000:8.1f}ms  {legacy_time / new_time:4.1f}x  "
+              f"({len(parsed)} networks, {wrong} legacy mis-parses)")
+
+# ═══════════════════════════════════════════════════════════════════
+# COLD START
+# ═══════════════════════════════════════════════════════════════════
+
+HEAVY_MODULES = ("aiohttp", "selenium", "cryptography", "keyring")
+
+def import_times(script: Path) -> Dict[str, int]:
+    """Cumulative -X importtime (us) per module for a fresh `import script`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {script.stem}"],
+        cwd=script.parent, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | module" (nesting indents the name)
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            times[fields[2].strip()] = int(fields[1])
+    return times
+
+def bench_startup(runs: int, script: Path):
+    """Cold-start cost: module import and CLI commands that never touch the network"""
+    home = Path(tempfile.mkdtemp(prefix="wifi_bench_"))
+    env = dict(os.environ, HOME=str(home))
+    print(f"{script.name}, median of {runs} cold starts")
+    
+    samples: Dict[str, List[float]] = {}
+    heavy: Counter = Counter()
+    for _ in range(runs):
+        times = import_times(script)
+        samples.setdefault("import", []).append(times[script.stem] / 1e6)
+        heavy.update(name for name in HEAVY_MODULES if name in times)
+        for command in ("--report", "--status", "--help"):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(script), command], env=env, capture_output=True)
+            samples.setdefault(command, []).append(time.perf_counter() - start)
+    
+    for name, values in samples.items():
+        label = f"import {script.stem}" if name == "import" else f"{script.name} {name}"
+        print(f"{label:<36} p50 {statistics.median(values) * 1000:7.1f}ms  max {max(values) * 1000:7.1f}ms")
+    loaded = ", ".join(f"{name} ({heavy[name]}/{runs})" for name in HEAVY_MODULES if heavy[name]) or "none"
+    print(f"heavy modules imported at load: {loaded}")
+
+# ═══════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WiFi Auto-Connect Benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    probe = sub.add_parser("probe", help="Connectivity/portal probe latency")
+    probe.add_argument("--timeout", type=float, default=2.0, help="Per-probe timeout (s)")
+    probe.add_argument("--hedge", type=float, default=0.3, help="Hedge delay (s)")
+    probe.add_argument("--repeat", type=int, default=3, help="Runs per mode")
+
+    e2e = sub.add_parser("e2e", help="Time to internet against fake nmcli/iw and a portal simulator")
+    e2e.add_argument("--runs", type=int, default=10, help="Runs per portal flow")
+    e2e.add_argument("--connect-latency", type=float, default=0.2, help="Fake nmcli connect time (s)")
+    e2e.add_argument("--scan-latency", type=float, default=0.1, help="Fake nmcli rescan time (s)")
+    e2e.add_argument("--slow", type=float, default=0.5, help="Portal page delay for the slow flow (s)")
+
+    match = sub.add_parser("match", help="SSID pattern matching throughput")
+    match.add_argument("--ssids", type=int, default=10000, help="Scanned SSIDs")
+    match.add_argument("--patterns", type=int, default=100, help="Configured patterns")
+    match.add_argument("--repeat", type=int, default=3, help="Runs per matcher")
+
+    parse = sub.add_parser("parse", help="nmcli terse-output parsing throughput")
+    parse.add_argument("--lines", type=int, default=50000, help="Scan output lines")
+    parse.add_argument("--repeat", type=int, default=3, help="Runs per parser")
+
+    fuzz = sub.add_parser("fuzz", help="Round-trip fuzz of the terse tokenizer")
+    fuzz.add_argument("--cases", type=int, default=100000, help="Random lines")
+    fuzz.add_argument("--seed", type=int, default=1, help="RNG seed")
+
+    connect = sub.add_parser("connect", help="Unpinned vs BSSID-pinned connect latency (fake nmcli)")
+    connect.add_argument("--runs", type=int, default=10, help="Connects per method")
+    connect.add_argument("--connect-latency", type=float, default=0.5, help="Fake association time (s)")
+    connect.add_argument("--scan-latency", type=float, default=2.0, help="Fake NetworkManager rescan (s)")
+
+    adapters = sub.add_parser("adapters", help="Single vs multi-adapter scan, pick and failover (fake tools)")
+    adapters.add_argument("--runs", type=int, default=5, help="Runs per method")
+    adapters.add_argument("--connect-latency", type=float, default=0.5, help="Fake association time (s)")
+    adapters.add_argument("--scan-latency", type=float, default=0.5, help="Fake rescan time per adapter (s)")
+
+    startup = sub.add_parser("startup", help="Cold-start import and CLI latency")
+    startup.add_argument("--runs", type=int, default=10, help="Cold starts")
+    startup.add_argument("--script", type=Path, default=Path(__file__).resolve().parent / "wifi_auto_login.py",
+                         help="Copy of wifi_auto_login.py to measure (e.g. an older revision)")
+
+    args = parser.parse_args()
+
+    if args.bench == "probe":
+        asyncio.run(bench_probe(args.timeout, args.hedge, args.repeat))
+    elif args.bench == "e2e":
+        asyncio.run(bench_e2e(args.runs, args.connect_latency, args.scan_latency, args.slow))
+    elif args.bench == "connect":
+        asyncio.run(bench_connect(args.runs, args.connect_latency, args.scan_latency))
+    elif args.bench == "match":
+        bench_match(args.ssids, args.patterns, args.repeat)
+    elif args.bench == "parse":
+        bench_parse(args.lines, args.repeat)
+    elif args.bench == "fuzz":
+        fuzz_terse(args.cases, args.seed)
+    elif args.bench == "adapters":
+        asyncio.run(bench_adapters(args.runs, args.connect_latency, args.scan_latency))
+    elif args.bench == "startup":
+        bench_startup(args.runs, args.script.resolve())
+
+if __name__ == "__main__":
+    main()
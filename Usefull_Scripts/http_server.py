@@ -14,29 +14,59 @@ FEATURES:
 - WebSocket support - real-time comms
 - Automatic SSL cert generation - async
 - Anti-forensic logging - obfuscated logs
+- Socket tuning & admission control - backlog, buffers, 503 load shedding
+- Static tree index - inotify-backed, syscall-free 404s
+- Large file engine - pread + read-ahead hints, sparse-aware, for TLS
+- Credential store - bcrypt hashes verified off-loop, refresh tokens
+- Archive downloads - streaming tar / tar.zst / zip of whole directories
 """
 
 import asyncio
+import errno
 import os
 import sys
 import ssl
+import socket
 import hmac
 import hashlib
 import secrets
 import time
 import json
+import shutil
+import sqlite3
+import tarfile
+import zipfile
+import select
+import struct
+import threading
 import mimetypes
+import stat
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import defaultdict
 
 import aiohttp
 from aiohttp import web, MultipartReader
+from aiohttp.log import server_logger
 import aiofiles
 import jwt
 
+try:
+    import bcrypt
+    BCRYPT_AVAILABLE = True
+except ImportError:
+    BCRYPT_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -54,6 +84,11 @@ class ServerConfig:
     jwt_secret: str = field(default_factory=lambda: secrets.token_hex(32))
     jwt_algorithm: str = "HS256"
     jwt_expiry: int = 3600  # 1 hour
+    refresh_expiry: int = 86400  # 1 day
+    max_refresh_tokens: int = 5  # per user
+    credential_store: Optional[Path] = None  # .json or .db; None = accept any login
+    hash_workers: int = field(default_factory=lambda: os.cpu_count() or 4)
+    verify_cache_ttl: int = 300
     allowed_origins: Set[str] = field(default_factory=lambda: {"*"})
     
     # Rate limiting
@@ -76,6 +111,21 @@ class ServerConfig:
     serve_dir: Path = Path(".")
     index_files: list = field(default_factory=lambda: ["index.html", "index.htm"])
     directory_listing: bool = False
+    archive_downloads: bool = False  # GET /dir/?archive=tar|tar.zst|zip
+    archive_workers: int = 4  # concurrent archive downloads, 503 beyond
+    static_index: bool = False  # in-memory tree index for fast 404s
+    large_file_engine: bool = True  # pread sender when sendfile is unavailable
+    large_file_threshold: int = 64 * 1024 * 1024
+    large_file_chunk_size: int = 1024 * 1024
+    
+    # Connection tuning
+    backlog: int = 1024
+    keepalive_timeout: float = 75.0
+    tcp_nodelay: bool = True
+    so_sndbuf: Optional[int] = None
+    so_rcvbuf: Optional[int] = None
+    reuse_port: bool = False
+    max_connections: int = 0  # concurrent requests, 0 = unlimited
     
     # Stealth
     stealth_mode: bool = False
@@ -116,6 +166,30 @@ class RateLimiter:
         """Reset bucket for IP"""
         self.buckets.pop(ip, None)
 
+# ============================================================================
+# ADMISSION CONTROL
+# ============================================================================
+
+class AdmissionLimiter:
+    """Concurrent request cap - sheds overload instead of queueing it"""
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.shed = 0
+    
+    def try_acquire(self) -> bool:
+        """Reserve a slot, False when the server is saturated"""
+        if self.limit and self.active >= self.limit:
+            self.shed += 1
+            return False
+        self.active += 1
+        return True
+    
+    def release(self):
+        """Free a slot"""
+        self.active -= 1
+
 # ============================================================================
 # JWT AUTHENTICATION
 # ============================================================================
@@ -150,6 +224,863 @@ class JWTAuth:
             return auth[7:]
         return None
 
+# ============================================================================
+# CREDENTIAL STORE
+# ============================================================================
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt (scrypt when bcrypt is unavailable)"""
+    if BCRYPT_AVAILABLE:
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=2 ** 14, r=8, p=1)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+def check_password(password: str, stored: str) -> bool:
+    """Verify a password against a bcrypt or scrypt hash (CPU-bound)"""
+    if stored.startswith("scrypt$"):
+        _, salt, digest = stored.split("$")
+        candidate = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt), n=2 ** 14, r=8, p=1)
+        return hmac.compare_digest(candidate.hex(), digest)
+    if BCRYPT_AVAILABLE:
+        return bcrypt.checkpw(password.encode(), stored.encode())
+    return False
+
+class CredentialStore(ABC):
+    """Username -> password hash storage"""
+    
+    @abstractmethod
+    def get_hash(self, username: str) -> Optional[str]:
+        ...
+    
+    @abstractmethod
+    def set_password(self, username: str, password: str):
+        ...
+    
+    @staticmethod
+    def open(path: Path) -> "CredentialStore":
+        """Pick a backend from the file suffix"""
+        if path.suffix in (".db", ".sqlite", ".sqlite3"):
+            return SQLiteCredentialStore(path)
+        return FileCredentialStore(path)
+
+class FileCredentialStore(CredentialStore):
+    """JSON file backend, reloaded when the file changes"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._users: Dict[str, str] = {}
+        self._mtime = 0.0
+    
+    def _load(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            self._users = {}
+            return
+        if mtime != self._mtime:
+            self._users = json.loads(self.path.read_text() or "{}")
+            self._mtime = mtime
+    
+    def get_hash(self, username: str) -> Optional[str]:
+        self._load()
+        return self._users.get(username)
+    
+    def set_password(self, username: str, password: str):
+        self._load()
+        self._users[username] = hash_password(password)
+        self.path.write_text(json.dumps(self._users, indent=2))
+        self.path.chmod(0o600)
+
+class SQLiteCredentialStore(CredentialStore):
+    """SQLite backend"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()  # shared by the hash worker threads
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, password_hash TEXT NOT NULL)"
+        )
+        self._db.commit()
+    
+    def get_hash(self, username: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT password_hash FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_password(self, username: str, password: str):
+        password_hash = hash_password(password)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO users (username, password_hash) VALUES (?, ?)",
+                (username, password_hash)
+            )
+            self._db.commit()
+
+class PasswordVerifier:
+    """Verify logins off the event loop with a short-lived success cache
+    
+    Hash checks run on a dedicated thread pool (bcrypt releases the GIL).
+    Successful checks are remembered as a keyed digest of the password for
+    cache_ttl seconds so repeat logins skip the hash entirely; anything that
+    does not match the cached digest still goes through the hash.
+    """
+    
+    def __init__(self, store: Optional[CredentialStore], workers: int = 4, cache_ttl: int = 300):
+        self.store = store
+        self.cache_ttl = cache_ttl
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pw-hash")
+        self._cache_key = secrets.token_bytes(32)
+        self._verified: Dict[str, Tuple[bytes, float, str]] = {}
+        # Unknown users still pay for one hash so timing does not leak them
+        self._dummy_hash = hash_password(secrets.token_hex(16)) if store else ""
+    
+    def _digest(self, password: str) -> bytes:
+        return hmac.new(self._cache_key, password.encode(), hashlib.sha256).digest()
+    
+    async def verify(self, username: str, password: str) -> bool:
+        """Check credentials (any non-empty pair when no store is configured)"""
+        if self.store is None:
+            return bool(username and password)
+        
+        loop = asyncio.get_running_loop()
+        stored = await loop.run_in_executor(self.executor, self.store.get_hash, username)
+        
+        digest = self._digest(password)
+        cached = self._verified.get(username)
+        if (cached and cached[1] > time.time() and cached[2] == stored
+                and hmac.compare_digest(cached[0], digest)):
+            return True
+        
+        # Misses, including wrong guesses for a cached user, pay the full hash
+        ok = await loop.run_in_executor(
+            self.executor, check_password, password, stored or self._dummy_hash
+        )
+        ok = ok and stored is not None
+        if ok:
+            self._verified[username] = (digest, time.time() + self.cache_ttl, stored)
+        return ok
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class RefreshTokens:
+    """Opaque, rotating per-user refresh tokens (kept in memory)
+    
+    Expired tokens are swept from issue() at most every PURGE_INTERVAL
+    seconds, so with no credential store (any username logs in) memory
+    stays bounded by the tokens issued within one expiry period.
+    """
+    
+    PURGE_INTERVAL = 60
+    
+    def __init__(self, expiry: int = 86400, per_user: int = 5):
+        self.expiry = expiry
+        self.per_user = per_user
+        self._tokens: Dict[str, Tuple[str, float]] = {}  # sha256(token) -> (user, exp)
+        self._by_user: Dict[str, list] = defaultdict(list)  # oldest first
+        self._next_purge = 0.0
+    
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def issue(self, username: str) -> str:
+        """Create a refresh token, evicting the user's oldest beyond per_user"""
+        now = time.time()
+        if now >= self._next_purge:
+            self._purge(now)
+            self._next_purge = now + self.PURGE_INTERVAL
+        
+        token = secrets.token_urlsafe(32)
+        key = self._key(token)
+        self._tokens[key] = (username, now + self.expiry)
+        
+        keys = self._by_user[username]
+        keys.append(key)
+        while len(keys) > self.per_user:
+            self._tokens.pop(keys.pop(0), None)
+        return token
+    
+    def consume(self, token: str) -> Optional[str]:
+        """Return the username and invalidate the token (rotation)"""
+        key = self._key(token)
+        entry = self._tokens.pop(key, None)
+        if not entry:
+            return None
+        username, exp = entry
+        keys = self._by_user.get(username, [])
+        if key in keys:
+            keys.remove(key)
+        if not keys:
+            self._by_user.pop(username, None)
+        return username if exp > time.time() else None
+    
+    def _purge(self, now: float):
+        """Drop expired tokens, and users left without any"""
+        for username in list(self._by_user):
+            keys = self._by_user[username]
+            # Same expiry for every token: each user's list is in expiry order
+            while keys and self._tokens.get(keys[0], ("", 0.0))[1] <= now:
+                self._tokens.pop(keys.pop(0), None)
+            if not keys:
+                del self._by_user[username]
+
+# ============================================================================
+# STATIC TREE INDEX
+# ============================================================================
+
+class _Inotify:
+    """Minimal ctypes inotify binding (Linux only)"""
+    
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_DONTFOLLOW = 0x02000000
+    IN_ISDIR = 0x40000000
+    
+    WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_ONLYDIR | IN_DONTFOLLOW)
+    _EVENT = struct.Struct("iIII")
+    
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._ctypes = ctypes
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    
+    def add_watch(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+    
+    def rm_watch(self, wd: int):
+        self._libc.inotify_rm_watch(self.fd, wd)
+    
+    def read_events(self, timeout: float):
+        """Yield (wd, mask, name) tuples, waiting up to timeout seconds"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            yield wd, mask, name
+    
+    def close(self):
+        os.close(self.fd)
+
+class StaticIndex:
+    """In-memory hash-set index of the serve tree for syscall-free lookups
+    
+    Built with os.scandir in a background thread and kept current via
+    inotify. Until the index is built (or if inotify is unavailable) every
+    lookup returns UNKNOWN and callers fall back to the filesystem.
+    """
+    
+    UNKNOWN = object()
+    
+    def __init__(self, root: Path):
+        self.root = str(root.resolve())
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = {""}
+        self.links: Set[str] = set()  # symlinks are resolved on disk
+        self.special: Set[str] = set()  # FIFOs, sockets, devices: left to the disk checks
+        self.ready = threading.Event()
+        self.live = False
+        self.build_time = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._watch_failed = False  # a directory went unwatched (ENOSPC)
+    
+    # -- lookups (event loop thread) --
+    
+    def lookup(self, rel_path: str):
+        """Return 'file', 'dir', None (missing) or UNKNOWN"""
+        if not self.live or not self.ready.is_set():
+            return self.UNKNOWN
+        
+        parts = [p for p in rel_path.split("/") if p and p != "."]
+        if ".." in parts:
+            return self.UNKNOWN
+        key = "/".join(parts)
+        
+        if key in self.files:
+            return "file"
+        if key in self.dirs:
+            return "dir"
+        if key in self.special:
+            return self.UNKNOWN
+        if self.links:
+            for i in range(len(parts), 0, -1):
+                if "/".join(parts[:i]) in self.links:
+                    return self.UNKNOWN
+        return None
+    
+    def _snapshot(self) -> List[List[str]]:
+        """Copies of files/dirs/links/special, taken while the index thread may be mutating them"""
+        while True:
+            try:
+                return [list(s) for s in (self.files, self.dirs, self.links, self.special)]
+            except RuntimeError:  # set changed size during the copy
+                continue
+    
+    def memory_stats(self) -> Dict[str, float]:
+        """Approximate memory footprint of the index"""
+        sets = (self.files, self.dirs, self.links, self.special)
+        snapshot = self._snapshot()
+        entries = sum(len(s) for s in snapshot)
+        size = sum(sys.getsizeof(s) for s in sets)
+        size += sum(sys.getsizeof(p) for s in snapshot for p in s)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "mb_per_million": size / max(entries, 1) * 1_000_000 / (1024 * 1024),
+        }
+    
+    # -- lifecycle --
+    
+    def start(self):
+        """Build and watch in a daemon thread"""
+        self._thread = threading.Thread(target=self._run, name="static-index", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+    
+    def _run(self):
+        try:
+            self._inotify = _Inotify()
+        except (OSError, AttributeError):
+            self._inotify = None
+        
+        started = time.perf_counter()
+        try:
+            files, dirs, links, special = self._scan("")
+        except OSError:
+            self.ready.set()  # stays not-live, lookups fall back to disk
+            return
+        
+        self.files, self.dirs, self.links, self.special = files, dirs, links, special
+        self.build_time = time.perf_counter() - started
+        # Without change notifications a stale index would serve wrong 404s
+        self.live = self._inotify is not None and not self._watch_failed
+        self.ready.set()
+        
+        if not self._inotify:
+            return
+        try:
+            while not self._stop.is_set():
+                for wd, mask, name in self._inotify.read_events(timeout=1.0):
+                    self._apply(wd, mask, name)
+        finally:
+            self._inotify.close()
+    
+    # -- index maintenance (index thread) --
+    
+    def _scan(self, rel_dir: str):
+        """Walk a subtree iteratively; returns (files, dirs, links, special)"""
+        files: Set[str] = set()
+        dirs: Set[str] = {rel_dir}
+        links: Set[str] = set()
+        special: Set[str] = set()
+        stack = [rel_dir]
+        
+        while stack:
+            current = stack.pop()
+            abs_dir = os.path.join(self.root, current) if current else self.root
+            # Watch before listing so entries created mid-scan are not lost
+            self._watch(current, abs_dir)
+            try:
+                with os.scandir(abs_dir) as it:
+                    for entry in it:
+                        rel = f"{current}/{entry.name}" if current else entry.name
+                        if entry.is_symlink():
+                            links.add(rel)
+                        elif entry.is_dir(follow_symlinks=False):
+                            dirs.add(rel)
+                            stack.append(rel)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.add(rel)
+                        else:
+                            special.add(rel)
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                continue
+        
+        return files, dirs, links, special
+    
+    def _watch(self, rel_dir: str, abs_dir: str):
+        if not self._inotify:
+            return
+        try:
+            self._watches[self._inotify.add_watch(abs_dir)] = rel_dir
+        except OSError:
+            # Out of watches (ENOSPC) - the index can no longer be trusted
+            self._watch_failed = True
+            self.live = False
+    
+    def _remove(self, rel: str):
+        self.files.discard(rel)
+        self.links.discard(rel)
+        self.special.discard(rel)
+        if rel in self.dirs:
+            prefix = rel + "/"
+            self.dirs = {d for d in self.dirs if d != rel and not d.startswith(prefix)}
+            self.files = {f for f in self.files if not f.startswith(prefix)}
+            self.links = {l for l in self.links if not l.startswith(prefix)}
+            self.special = {x for x in self.special if not x.startswith(prefix)}
+            for wd, path in list(self._watches.items()):
+                if path == rel or path.startswith(prefix):
+                    self._inotify.rm_watch(wd)
+                    del self._watches[wd]
+    
+    def _apply(self, wd: int, mask: int, name: str):
+        ino = _Inotify
+        if mask & ino.IN_Q_OVERFLOW:
+            # Events were dropped - rebuild from scratch
+            files, dirs, links, special = self._scan("")
+            self.files, self.dirs, self.links, self.special = files, dirs, links, special
+            return
+        if mask & ino.IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        
+        parent = self._watches.get(wd)
+        if parent is None or not name:
+            return
+        rel = f"{parent}/{name}" if parent else name
+        
+        if mask & (ino.IN_DELETE | ino.IN_MOVED_FROM):
+            self._remove(rel)
+        elif mask & (ino.IN_CREATE | ino.IN_MOVED_TO):
+            abs_path = os.path.join(self.root, rel)
+            if os.path.islink(abs_path):
+                self.links.add(rel)
+            elif mask & ino.IN_ISDIR:
+                files, dirs, links, special = self._scan(rel)
+                self.files |= files
+                self.dirs |= dirs
+                self.links |= links
+                self.special |= special
+            else:
+                try:
+                    regular = stat.S_ISREG(os.lstat(abs_path).st_mode)
+                except OSError:
+                    return  # already gone; its delete event follows
+                (self.files if regular else self.special).add(rel)
+
+# ============================================================================
+# LARGE FILE ENGINE
+# ============================================================================
+
+def iter_extents(fd: int, start: int, end: int):
+    """Yield (offset, length, is_data) runs, skipping holes via SEEK_DATA/SEEK_HOLE"""
+    pos = start
+    while pos < end:
+        try:
+            data = os.lseek(fd, pos, os.SEEK_DATA)
+        except OSError as e:
+            # ENXIO: only a hole remains; anything else: no hole support
+            yield pos, end - pos, e.errno != errno.ENXIO
+            return
+        if data > pos:
+            yield pos, min(data, end) - pos, False
+        if data >= end:
+            return
+        hole = os.lseek(fd, data, os.SEEK_HOLE)
+        yield data, min(hole, end) - data, True
+        pos = hole
+
+class LargeFileSender:
+    """pread-based sender for large files when sendfile is unavailable (TLS)
+    
+    The next chunk is read on a private reader thread while the current one
+    is being written, with read-ahead hints for the window after it; holes
+    in sparse files are sent from a shared zero buffer without touching the
+    disk. pread (unlike a mapping) turns a file truncated mid-transfer into
+    a short read, and the transfer is aborted. Conditional requests are left
+    to FileResponse (see HTTPHandlers._use_large_sender); the ETag matches
+    the one FileResponse would send.
+    """
+    
+    def __init__(self, filepath: Path, chunk_size: int = 1024 * 1024):
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self._zeros = bytes(chunk_size)
+    
+    def _pieces(self, fd: int, start: int, end: int):
+        """Split extents into (offset, length, is_data) chunks"""
+        for offset, length, is_data in iter_extents(fd, start, end):
+            stop = offset + length
+            while offset < stop:
+                size = min(self.chunk_size, stop - offset)
+                yield offset, size, is_data
+                offset += size
+    
+    @staticmethod
+    def _read(fd: int, offset: int, size: int) -> bytes:
+        """Hint the following window, then read this one"""
+        os.posix_fadvise(fd, offset + size, size * 2, os.POSIX_FADV_WILLNEED)
+        return os.pread(fd, size, offset)
+    
+    def _truncated(self, offset: int) -> OSError:
+        return OSError(errno.EIO, f"{self.filepath} shrank below {offset} bytes while being sent")
+    
+    async def send(self, request: web.Request, content_type: str) -> web.StreamResponse:
+        """Stream the file (or a single requested range)"""
+        with open(self.filepath, "rb") as f:
+            fd = f.fileno()
+            st = os.fstat(fd)
+            size = st.st_size
+            
+            try:
+                rng = request.http_range
+                start, stop = rng.start, rng.stop
+            except ValueError:
+                start = stop = None
+            
+            if start is None and stop is None:
+                start, end, status = 0, size, 200
+            else:
+                if start is not None and start < 0:
+                    start, end = max(size + start, 0), size  # suffix range
+                else:
+                    start = start or 0
+                    end = min(stop if stop is not None else size, size)
+                if start >= size or start >= end:
+                    return web.Response(status=416, headers={"Content-Range": f"bytes */{size}"})
+                status = 206
+            
+            response = web.StreamResponse(status=status, headers={
+                "Content-Type": content_type,
+                "Accept-Ranges": "bytes",
+            })
+            response.content_length = end - start
+            response.last_modified = st.st_mtime
+            response.etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+            if status == 206:
+                response.headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+            await response.prepare(request)
+            
+            if request.method == "HEAD":
+                return response
+            
+            os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_SEQUENTIAL)
+            # Own reader thread: the fd must outlive any read still running on it
+            reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="large-file")
+            pending = None  # (future, offset, length) of the read in flight
+            try:
+                for offset, length, is_data in self._pieces(fd, start, end):
+                    chunk = None
+                    if is_data:
+                        chunk = (reader.submit(self._read, fd, offset, length), offset, length)
+                    if pending is not None:
+                        await self._write(response, pending)
+                    pending = chunk
+                    if chunk is None:
+                        if os.fstat(fd).st_size < offset + length:
+                            raise self._truncated(offset + length)
+                        await response.write(self._zeros[:length])
+                if pending is not None:
+                    await self._write(response, pending)
+                    pending = None
+            finally:
+                # Client gone or an error: drop the read ahead, or wait for it
+                # to finish before the file is closed under it
+                if pending is not None and not pending[0].cancel():
+                    await asyncio.gather(asyncio.wrap_future(pending[0]), return_exceptions=True)
+                reader.shutdown(wait=False)
+        
+        await response.write_eof()
+        return response
+    
+    async def _write(self, response: web.StreamResponse, pending):
+        future, offset, length = pending
+        data = await asyncio.wrap_future(future)
+        if len(data) < length:
+            raise self._truncated(offset + length)
+        await response.write(data)
+
+# ============================================================================
+# ARCHIVE STREAMING
+# ============================================================================
+
+class _QueueWriter:
+    """File-like sink for archive writers running in a worker thread
+    
+    Output is coalesced into chunk_size blocks and handed to the event loop
+    through a bounded asyncio.Queue, so memory stays flat however large the
+    tree is and a slow client throttles the producer.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, chunk_size: int):
+        self.loop = loop
+        self.queue = queue
+        self.chunk_size = chunk_size
+        self.cancelled = threading.Event()
+        self._buffer = bytearray()
+        self._offset = 0
+    
+    def write(self, data) -> int:
+        if self.cancelled.is_set():
+            raise ConnectionAbortedError("client went away")
+        self._buffer += data
+        self._offset += len(data)
+        if len(self._buffer) >= self.chunk_size:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._offset
+    
+    def flush(self):
+        pass
+    
+    def _put(self, item):
+        asyncio.run_coroutine_threadsafe(self.queue.put(item), self.loop).result()
+    
+    def close(self):
+        """Flush the tail and signal end of stream"""
+        if self._buffer and not self.cancelled.is_set():
+            self._put(bytes(self._buffer))
+        self._buffer.clear()
+        self._put(None)
+
+class _SizedReader:
+    """Reads exactly `size` bytes from f for a tar member
+    
+    The member header is already out when the data is copied, so a file
+    that shrinks (or fails to read) mid-copy is zero-padded to its declared
+    size to keep the archive well-formed; `short` records that it happened.
+    """
+    
+    def __init__(self, f, size: int):
+        self.f = f
+        self.remaining = size
+        self.short = False
+    
+    def read(self, n: int = -1) -> bytes:
+        if n < 0 or n > self.remaining:
+            n = self.remaining
+        data = b""
+        if not self.short:
+            try:
+                data = self.f.read(n)
+            except OSError:
+                data = b""
+            if len(data) < n:
+                self.short = True
+        data += bytes(n - len(data))
+        self.remaining -= n
+        return data
+
+class ArchiveWorkers:
+    """Dedicated, bounded producer threads for archive downloads
+    
+    A producer is blocked for as long as its client takes to read, so
+    archives never borrow the loop's default executor (aiofiles, DNS).
+    When every worker is busy, start() refuses instead of queueing.
+    """
+    
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self.active = 0
+        self.rejected = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive")
+    
+    def start(self, fn, *args) -> Optional[asyncio.Future]:
+        """Run fn on a free worker; None when all are busy"""
+        if self.active >= self.workers:
+            self.rejected += 1
+            return None
+        self.active += 1
+        future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        future.add_done_callback(self._release)
+        return future
+    
+    def _release(self, _):
+        self.active -= 1
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class ArchiveStreamer:
+    """On-the-fly tar / tar.zst / zip of a directory subtree
+    
+    Tar members that shrink while being copied are zero-padded (and
+    logged); zip members cannot be repaired in a stream, so a read error
+    there aborts the response and the client sees a truncated transfer.
+    """
+    
+    FORMATS = {
+        "tar": ("application/x-tar", ".tar"),
+        "tar.zst": ("application/zstd", ".tar.zst"),
+        "zip": ("application/zip", ".zip"),
+    }
+    
+    def __init__(self, root: Path, fmt: str, level: Optional[int] = None,
+                 chunk_size: int = 256 * 1024, queue_depth: int = 8):
+        self.root = root
+        self.fmt = fmt
+        self.level = level
+        self.chunk_size = chunk_size
+        self.queue_depth = queue_depth
+    
+    def _entries(self):
+        """Yield (abs_path, arcname, stat, is_dir); symlinks are never followed"""
+        base = self.root.name or "root"
+        stack = [(str(self.root), base)]
+        while stack:
+            abs_dir, arc_dir = stack.pop()
+            try:
+                with os.scandir(abs_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                arcname = f"{arc_dir}/{entry.name}"
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        yield entry.path, arcname, entry.stat(follow_symlinks=False), True
+                        stack.append((entry.path, arcname))
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, arcname, entry.stat(follow_symlinks=False), False
+                except OSError:
+                    continue
+    
+    def _write_tar(self, sink):
+        with tarfile.open(fileobj=sink, mode="w|", format=tarfile.PAX_FORMAT,
+                          copybufsize=self.chunk_size) as tar:
+            for path, arcname, st, is_dir in self._entries():
+                info = tarfile.TarInfo(arcname)
+                info.mtime = int(st.st_mtime)
+                info.mode = st.st_mode & 0o777
+                if is_dir:
+                    info.type = tarfile.DIRTYPE
+                    tar.addfile(info)
+                    continue
+                try:
+                    f = open(path, "rb")
+                except OSError:
+                    continue  # nothing written for it yet
+                with f:
+                    info.size = os.fstat(f.fileno()).st_size
+                    reader = _SizedReader(f, info.size)
+                    tar.addfile(info, reader)
+                if reader.short:
+                    server_logger.warning("Archive: %s changed while being read, zero-padded in %s",
+                                          path, arcname)
+    
+    def _write_zip(self, sink):
+        compression = zipfile.ZIP_DEFLATED if self.level else zipfile.ZIP_STORED
+        with zipfile.ZipFile(sink, mode="w", compression=compression,
+                             compresslevel=self.level or None) as zf:
+            for path, arcname, st, is_dir in self._entries():
+                info = zipfile.ZipInfo(arcname + ("/" if is_dir else ""),
+                                       time.localtime(max(st.st_mtime, 315532800))[:6])
+                info.external_attr = (st.st_mode & 0xFFFF) << 16
+                if is_dir:
+                    zf.writestr(info, b"")
+                    continue
+                info.compress_type = compression
+                try:
+                    src = open(path, "rb")
+                except OSError:
+                    continue  # nothing written for it yet
+                try:
+                    with src, zf.open(info, "w", force_zip64=st.st_size > 2 ** 31) as dst:
+                        shutil.copyfileobj(src, dst, self.chunk_size)
+                except OSError:
+                    # The local header is out: abort rather than emit a silently short member
+                    server_logger.error("Archive: reading %s failed mid-member, aborting", path)
+                    raise
+    
+    def _produce(self, sink: _QueueWriter):
+        """Worker thread: build the archive into the sink"""
+        try:
+            if self.fmt == "zip":
+                self._write_zip(sink)
+            elif self.fmt == "tar.zst":
+                level = self.level if self.level is not None else 3
+                compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+                with compressor.stream_writer(sink, closefd=False) as zst:
+                    self._write_tar(zst)
+            else:
+                self._write_tar(sink)
+        finally:
+            if not sink.cancelled.is_set():
+                sink.close()
+    
+    async def send(self, request: web.Request, workers: ArchiveWorkers) -> web.StreamResponse:
+        """Stream the archive as a chunked response (503 when no worker is free)"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        sink = _QueueWriter(loop, queue, self.chunk_size)
+        
+        producer = workers.start(self._produce, sink)
+        if producer is None:
+            return web.json_response(
+                {"error": "Service unavailable", "message": "All archive workers are busy"},
+                status=503,
+                headers={"Retry-After": "5"}
+            )
+        
+        content_type, suffix = self.FORMATS[self.fmt]
+        response = web.StreamResponse(headers={
+            "Content-Type": content_type,
+            "Content-Disposition": f'attachment; filename="{self.root.name or "root"}{suffix}"',
+        })
+        response.enable_chunked_encoding()
+        try:
+            await response.prepare(request)
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                await response.write(chunk)
+            await producer
+        except ConnectionError:
+            return response  # client went away (reset or lost), worker is stopped below
+        finally:
+            if not producer.done():
+                # Client disconnected - unblock and stop the worker
+                sink.cancelled.set()
+                while not producer.done():
+                    while not queue.empty():
+                        queue.get_nowait()
+                    await asyncio.wait({producer}, timeout=0.05)
+                producer.exception()  # retrieved, the abort is expected
+        
+        await response.write_eof()
+        return response
+
 # ============================================================================
 # MIDDLEWARE
 # ============================================================================
@@ -160,8 +1091,8 @@ async def auth_middleware(request: web.Request, handler):
     config = request.app['config']
     jwt_auth = request.app['jwt_auth']
     
-    # Skip auth for login endpoint
-    if request.path == "/auth/login":
+    # Skip auth for token endpoints
+    if request.path in ("/auth/login", "/auth/refresh"):
         return await handler(request)
     
     # Check for token
@@ -178,6 +1109,30 @@ async def auth_middleware(request: web.Request, handler):
         status=401
     )
 
+@web.middleware
+async def admission_middleware(request: web.Request, handler):
+    """Connection admission middleware (outermost)"""
+    config = request.app['config']
+    limiter = request.app['admission']
+    
+    if not config.tcp_nodelay:
+        # asyncio forces TCP_NODELAY on every accepted transport
+        sock = request.transport.get_extra_info('socket') if request.transport else None
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
+    
+    if not limiter.try_acquire():
+        return web.json_response(
+            {"error": "Service unavailable", "message": "Server overloaded"},
+            status=503,
+            headers={"Retry-After": "1"}
+        )
+    
+    # aiohttp sends the body from the same task, so releasing on task
+    # completion keeps slow downloads counted against the cap
+    asyncio.current_task().add_done_callback(lambda _: limiter.release())
+    return await handler(request)
+
 @web.middleware
 async def rate_limit_middleware(request: web.Request, handler):
     """Rate limiting middleware"""
@@ -244,15 +1199,8 @@ class HTTPHandlers:
             username = data.get("username")
             password = data.get("password")
             
-            # Simple validation (in production, use proper user management)
-            if username and password:
-                jwt_auth = request.app['jwt_auth']
-                token = jwt_auth.create_token({"username": username})
-                
-                return web.json_response({
-                    "token": token,
-                    "expires_in": request.app['config'].jwt_expiry
-                })
+            if username and password and await request.app['verifier'].verify(username, password):
+                return HTTPHandlers._issue_tokens(request, username)
         except Exception:
             pass
         
@@ -261,6 +1209,35 @@ class HTTPHandlers:
             status=401
         )
     
+    @staticmethod
+    async def refresh(request: web.Request) -> web.Response:
+        """Exchange a refresh token for a new token pair"""
+        try:
+            data = await request.json()
+            username = request.app['refresh_tokens'].consume(data.get("refresh_token", ""))
+            if username:
+                return HTTPHandlers._issue_tokens(request, username)
+        except Exception:
+            pass
+        
+        return web.json_response(
+            {"error": "Invalid refresh token"},
+            status=401
+        )
+    
+    @staticmethod
+    def _issue_tokens(request: web.Request, username: str) -> web.Response:
+        """Access JWT + rotating refresh token"""
+        jwt_auth = request.app['jwt_auth']
+        token = jwt_auth.create_token({"username": username})
+        
+        return web.json_response({
+            "token": token,
+            "expires_in": request.app['config'].jwt_expiry,
+            "refresh_token": request.app['refresh_tokens'].issue(username),
+            "refresh_expires_in": request.app['config'].refresh_expiry
+        })
+    
     @staticmethod
     async def upload_file(request: web.Request) -> web.Response:
         """Handle file upload with validation"""
@@ -341,6 +1318,14 @@ class HTTPHandlers:
         rel_path = request.match_info.get('path', '')
         filepath = config.serve_dir / rel_path
         
+        # Fast 404: misses known to the static index never touch the disk
+        index = request.app.get('static_index')
+        if index and index.lookup(rel_path) is None:
+            return web.json_response(
+                {"error": "Not found"},
+                status=404
+            )
+        
         # Security: prevent directory traversal
         try:
             filepath = filepath.resolve()
@@ -355,13 +1340,19 @@ class HTTPHandlers:
                 status=400
             )
         
+        kind = HTTPHandlers._classify(index, rel_path, filepath)
+        
         # Handle directory
-        if filepath.is_dir():
+        if kind == "dir" and "archive" in request.query:
+            return await HTTPHandlers._send_archive(request, filepath)
+        
+        if kind == "dir":
             # Try index files
-            for index in config.index_files:
-                index_path = filepath / index
-                if index_path.is_file():
+            for index_name in config.index_files:
+                index_path = filepath / index_name
+                if HTTPHandlers._classify(index, f"{rel_path}/{index_name}", index_path) == "file":
                     filepath = index_path
+                    kind = "file"
                     break
             else:
                 # Directory listing
@@ -374,10 +1365,14 @@ class HTTPHandlers:
                     )
         
         # Serve file
-        if filepath.is_file():
+        if kind == "file":
             # Determine MIME type
             mime_type, _ = mimetypes.guess_type(str(filepath))
             
+            if HTTPHandlers._use_large_sender(request, filepath):
+                sender = LargeFileSender(filepath, config.large_file_chunk_size)
+                return await sender.send(request, mime_type or 'application/octet-stream')
+            
             return web.FileResponse(
                 filepath,
                 headers={'Content-Type': mime_type or 'application/octet-stream'}
@@ -388,6 +1383,75 @@ class HTTPHandlers:
             status=404
         )
     
+    @staticmethod
+    async def _send_archive(request: web.Request, dirpath: Path) -> web.StreamResponse:
+        """Validate ?archive=&level= and stream the subtree"""
+        config = request.app['config']
+        
+        if not config.archive_downloads:
+            return web.json_response(
+                {"error": "Archive downloads disabled"},
+                status=403
+            )
+        
+        fmt = request.query.get("archive", "tar")
+        if fmt not in ArchiveStreamer.FORMATS or (fmt == "tar.zst" and not ZSTD_AVAILABLE):
+            return web.json_response(
+                {"error": f"Unsupported archive format: {fmt}"},
+                status=400
+            )
+        
+        level = None
+        if "level" in request.query:
+            try:
+                level = int(request.query["level"])
+            except ValueError:
+                level = -1
+            limit = 22 if fmt == "tar.zst" else 9
+            if not 0 <= level <= limit or fmt == "tar":
+                return web.json_response(
+                    {"error": f"Invalid compression level for {fmt}"},
+                    status=400
+                )
+        
+        return await ArchiveStreamer(dirpath, fmt, level).send(request, request.app['archive_workers'])
+    
+    @staticmethod
+    def _use_large_sender(request: web.Request, filepath: Path) -> bool:
+        """Large file engine for big files that sendfile cannot serve well"""
+        config = request.app['config']
+        if not config.large_file_engine or not hasattr(os, "posix_fadvise"):
+            return False
+        
+        # Validators (304/412, If-Range) are FileResponse's job
+        if (request.if_modified_since or request.if_unmodified_since or request.if_range
+                or request.if_match is not None or request.if_none_match is not None):
+            return False
+        
+        try:
+            st = filepath.stat()
+        except OSError:
+            return False
+        if st.st_size < config.large_file_threshold:
+            return False
+        
+        # sendfile is disabled for TLS (or via env); sparse files benefit either way
+        tls = request.transport is not None and request.transport.get_extra_info("sslcontext") is not None
+        sparse = st.st_blocks * 512 < st.st_size
+        return tls or sparse or bool(os.environ.get("AIOHTTP_NOSENDFILE"))
+    
+    @staticmethod
+    def _classify(index: Optional[StaticIndex], rel_path: str, filepath: Path) -> Optional[str]:
+        """'dir', 'file' or None - from the static index when it can answer, else disk"""
+        kind = index.lookup(rel_path) if index else StaticIndex.UNKNOWN
+        if kind is not StaticIndex.UNKNOWN:
+            return kind
+        if filepath.is_dir():
+            return "dir"
+        if filepath.is_file():
+            return "file"
+        return None
+    
     @staticmethod
     async def _list_directory(dirpath: Path, rel_path: str) -> web.Response:
         """Generate directory listing"""
@@ -448,6 +1512,7 @@ async def create_app(config: ServerConfig) -> web.Application:
     # Create app with middlewares
     app = web.Application(
         middlewares=[
+            admission_middleware,
             rate_limit_middleware,
             cors_middleware,
             stealth_middleware,
@@ -458,15 +1523,94 @@ async def create_app(config: ServerConfig) -> web.Application:
     app['config'] = config
     app['jwt_auth'] = JWTAuth(config.jwt_secret, config.jwt_algorithm, config.jwt_expiry)
     app['rate_limiter'] = RateLimiter(config.rate_limit_requests, config.rate_limit_window)
+    app['admission'] = AdmissionLimiter(config.max_connections)
+    
+    # Credentials
+    store = CredentialStore.open(config.credential_store) if config.credential_store else None
+    app['verifier'] = PasswordVerifier(store, config.hash_workers, config.verify_cache_ttl)
+    app['refresh_tokens'] = RefreshTokens(config.refresh_expiry, config.max_refresh_tokens)
+    
+    async def close_verifier(app: web.Application):
+        app['verifier'].close()
+    
+    app.on_cleanup.append(close_verifier)
+    
+    # Archive producers (their own threads, never the default executor)
+    if config.archive_downloads:
+        app['archive_workers'] = ArchiveWorkers(config.archive_workers)
+        
+        async def close_archive_workers(app: web.Application):
+            app['archive_workers'].close()
+        
+        app.on_cleanup.append(close_archive_workers)
+    
+    # Static tree index (built in the background)
+    if config.static_index:
+        index = StaticIndex(config.serve_dir)
+        index.start()
+        app['static_index'] = index
+        
+        async def stop_index(app: web.Application):
+            app['static_index'].stop()
+        
+        app.on_cleanup.append(stop_index)
     
     # Setup routes
     app.router.add_post('/auth/login', HTTPHandlers.login)
+    app.router.add_post('/auth/refresh', HTTPHandlers.refresh)
     app.router.add_post('/upload', HTTPHandlers.upload_file)
     app.router.add_get('/health', HTTPHandlers.health_check)
     app.router.add_get('/{path:.*}', HTTPHandlers.serve_file)
     
     return app
 
+def create_listen_socket(config: ServerConfig) -> socket.socket:
+    """Create a tuned listening socket (options are inherited by accepted sockets)"""
+    family = socket.AF_INET6 if ":" in config.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    
+    if config.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    
+    # Buffer sizes must be set before listen() to affect window scaling
+    if config.so_sndbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, config.so_sndbuf)
+    if config.so_rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, config.so_rcvbuf)
+    
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(config.tcp_nodelay))
+    sock.bind((config.host, config.port))
+    sock.setblocking(False)
+    return sock
+
+async def start_server(config: ServerConfig, ssl_context: Optional[ssl.SSLContext] = None) -> web.AppRunner:
+    """Create app, bind the tuned socket and start serving"""
+    app = await create_app(config)
+    
+    runner = web.AppRunner(app, keepalive_timeout=config.keepalive_timeout)
+    await runner.setup()
+    
+    site = web.SockSite(
+        runner,
+        create_listen_socket(config),
+        ssl_context=ssl_context,
+        backlog=config.backlog
+    )
+    
+    await site.start()
+    return runner
+
+async def report_static_index(index: StaticIndex):
+    """Print index size once the background build finishes"""
+    while not index.ready.is_set():
+        await asyncio.sleep(0.1)
+    
+    stats = index.memory_stats()
+    print(f"Static index: {stats['entries']} entries in {index.build_time:.2f}s, "
+          f"{stats['bytes'] / 1024 / 1024:.1f}MB "
+          f"(~{stats['mb_per_million']:.0f}MB per million entries, live={index.live})")
+
 async def run_server(config: ServerConfig):
     """Run the HTTP server"""
     
@@ -489,21 +1633,8 @@ async def run_server(config: ServerConfig):
         ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
         ssl_context.load_cert_chain(config.cert_path, config.key_path)
     
-    # Create app
-    app = await create_app(config)
-    
     # Start server
-    runner = web.AppRunner(app)
-    await runner.setup()
-    
-    site = web.TCPSite(
-        runner,
-        config.host,
-        config.port,
-        ssl_context=ssl_context
-    )
-    
-    await site.start()
+    runner = await start_server(config, ssl_context)
     
     protocol = "HTTPS" if config.use_ssl else "HTTP"
     print(f"Server running on {protocol}://{config.host}:{config.port}")
@@ -511,6 +1642,11 @@ async def run_server(config: ServerConfig):
     print(f"Upload enabled: {config.upload_enabled}")
     print(f"Rate limiting: {config.rate_limit_enabled}")
     print(f"Stealth mode: {config.stealth_mode}")
+    print(f"Credential store: {config.credential_store or 'disabled (any login accepted)'}")
+    print(f"Backlog: {config.backlog} | Max connections: {config.max_connections or 'unlimited'}")
+    
+    if runner.app.get('static_index'):
+        asyncio.create_task(report_static_index(runner.app['static_index']))
     
     # Keep running
     try:
@@ -535,9 +1671,37 @@ def main():
     parser.add_argument("--upload", action="store_true", help="Enable uploads")
     parser.add_argument("--stealth", action="store_true", help="Stealth mode")
     parser.add_argument("--no-rate-limit", action="store_true", help="Disable rate limiting")
+    parser.add_argument("--users", type=Path, help="Credential store (.json or .db)")
+    parser.add_argument("--add-user", metavar="USERNAME", help="Add/update a user in --users and exit")
+    parser.add_argument("--backlog", type=int, default=1024, help="Listen backlog")
+    parser.add_argument("--keepalive-timeout", type=float, default=75.0, help="Idle keep-alive timeout (s)")
+    parser.add_argument("--no-tcp-nodelay", action="store_true", help="Disable TCP_NODELAY")
+    parser.add_argument("--sndbuf", type=int, help="SO_SNDBUF size in bytes")
+    parser.add_argument("--rcvbuf", type=int, help="SO_RCVBUF size in bytes")
+    parser.add_argument("--archive", action="store_true",
+                        help="Allow ?archive=tar|tar.zst|zip directory downloads")
+    parser.add_argument("--archive-workers", type=int, default=4,
+                        help="Concurrent archive downloads before shedding with 503")
+    parser.add_argument("--static-index", action="store_true",
+                        help="Index the serve tree in memory for syscall-free 404s")
+    parser.add_argument("--no-large-file-engine", action="store_true",
+                        help="Disable the pread large file engine (sendfile-less TLS, sparse files)")
+    parser.add_argument("--large-file-threshold", type=int, default=64 * 1024 * 1024,
+                        help="Minimum file size in bytes for the large file engine")
+    parser.add_argument("--reuse-port", action="store_true", help="Enable SO_REUSEPORT")
+    parser.add_argument("--max-connections", type=int, default=0,
+                        help="Max concurrent requests before shedding with 503 (0 = unlimited)")
     
     args = parser.parse_args()
     
+    if args.add_user:
+        if not args.users:
+            parser.error("--add-user requires --users")
+        import getpass
+        CredentialStore.open(args.users).set_password(args.add_user, getpass.getpass("Password: "))
+        print(f"User {args.add_user} stored in {args.users}")
+        return
+    
     config = ServerConfig(
         host=args.host,
         port=args.port,
@@ -545,7 +1709,20 @@ def main():
         upload_enabled=args.upload,
         serve_dir=args.dir or Path("."),
         stealth_mode=args.stealth,
-        rate_limit_enabled=not args.no_rate_limit
+        rate_limit_enabled=not args.no_rate_limit,
+        backlog=args.backlog,
+        keepalive_timeout=args.keepalive_timeout,
+        tcp_nodelay=not args.no_tcp_nodelay,
+        so_sndbuf=args.sndbuf,
+        so_rcvbuf=args.rcvbuf,
+        reuse_port=args.reuse_port,
+        max_connections=args.max_connections,
+        credential_store=args.users,
+        archive_downloads=args.archive,
+        archive_workers=args.archive_workers,
+        static_index=args.static_index,
+        large_file_engine=not args.no_large_file_engine,
+        large_file_threshold=args.large_file_threshold
     )
     
     try:
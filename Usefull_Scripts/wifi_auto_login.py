@@ -6,6 +6,8 @@
 ═══════════════════════════════════════════════════════════════════
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import time
@@ -13,25 +15,58 @@ import subprocess
 import logging
 import json
 import re
+import hashlib
+import sqlite3
 import asyncio
 import shutil
+import socket
+import struct
+import functools
+import contextlib
+import contextvars
+import math
+import importlib.util
+import concurrent.futures
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple, NamedTuple
-from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, Optional, List, Tuple, NamedTuple, Iterable, Iterator
+from urllib.parse import urlparse, urljoin
+from html.parser import HTMLParser
+from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from dataclasses import dataclass
 from enum import Enum
 
-import aiohttp
-from cryptography.fernet import Fernet
+# Heavy dependencies load on first use: --status/--report never pay for
+# them, and selenium is only imported when the browser path is taken.
+
+def _lazy_import(name: str):
+    """Top-level module that executes on first attribute access (None if not installed)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+aiohttp = _lazy_import("aiohttp")
+if aiohttp is None:
+    raise ImportError("aiohttp is required: pip install aiohttp")
 
-try:
-    import keyring
-    KEYRING_AVAILABLE = True
-except ImportError:
-    KEYRING_AVAILABLE = False
+keyring = _lazy_import("keyring")
+KEYRING_AVAILABLE = keyring is not None
 
-try:
+SELENIUM_AVAILABLE = importlib.util.find_spec("selenium") is not None
+
+@functools.lru_cache(maxsize=None)
+def selenium_api() -> SimpleNamespace:
+    """The selenium names we use, imported on first call"""
     from selenium import webdriver
     from selenium.webdriver.common.by import By
     from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -39,9 +74,16 @@ try:
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.common.exceptions import TimeoutException, WebDriverException
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
+    return SimpleNamespace(
+        webdriver=webdriver,
+        By=By,
+        ChromeOptions=ChromeOptions,
+        FirefoxOptions=FirefoxOptions,
+        WebDriverWait=WebDriverWait,
+        EC=EC,
+        TimeoutException=TimeoutException,
+        WebDriverException=WebDriverException,
+    )
 
 # ═══════════════════════════════════════════════════════════════════
 # CONFIGURATION & DATA STRUCTURES
@@ -65,6 +107,7 @@ class WiFiNetwork(NamedTuple):
     security: str
     frequency: str
     in_use: bool = False
+    interface: Optional[str] = None  # adapter it was seen on (strongest, after merging)
 
 @dataclass
 class Config:
@@ -75,12 +118,19 @@ class Config:
     password: str
     
     # Advanced Options
+    browser_max_uses: int = 10
     max_retries: int = 5
     retry_delay: int = 3
     connection_timeout: int = 15
     portal_timeout: int = 25
     health_check_interval: int = 300
     scan_interval: int = 10
+    status_socket: Path = Path.home() / ".wifi_shadow" / "supervisor.sock"
+    
+    # Connectivity Probes
+    probe_endpoints: Optional[List[str]] = None  # None = public defaults
+    probe_timeout: float = 5.0
+    probe_hedge_delay: float = 0.0  # 0 = fire all probes at once
     
     # Signal Strength Thresholds
     min_signal_strength: int = 30
@@ -109,8 +159,12 @@ class SecureCredentials:
     
     def __init__(self, keyring_service: str = "shadow_wifi_arsenal"):
         self.service = keyring_service
-        self.key = self._get_or_create_key()
-        self.cipher = Fernet(self.key)
+    
+    @functools.cached_property
+    def cipher(self):
+        """Fernet cipher, built (and the key fetched) on first encrypt/decrypt"""
+        from cryptography.fernet import Fernet
+        return Fernet(self._get_or_create_key())
     
     def _get_or_create_key(self) -> bytes:
         """Retrieve or generate encryption key"""
@@ -133,6 +187,7 @@ class SecureCredentials:
                 pass
 
         # Generate new key
+        from cryptography.fernet import Fernet
         key = Fernet.generate_key()
         
         if KEYRING_AVAILABLE:
@@ -194,6 +249,562 @@ class SecureCredentials:
         
         return None, None
 
+# ═══════════════════════════════════════════════════════════════════
+# ASYNC SUBPROCESS
+# ═══════════════════════════════════════════════════════════════════
+
+async def run_command(args: List[str], timeout: float) -> Tuple[int, str, str]:
+    """
+    Run a command without blocking the event loop
+    
+    Output is forced to English (LC_ALL=C). The child is killed if the
+    timeout expires or the calling task is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, "LC_ALL": "C"}
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+# ═══════════════════════════════════════════════════════════════════
+# READINESS WAITS
+# ═══════════════════════════════════════════════════════════════════
+
+async def wait_until(check, deadline: float, initial: float = 0.05, max_interval: float = 1.0) -> bool:
+    """
+    Poll an async predicate until it is true or `deadline` seconds pass
+    
+    The interval starts short and doubles up to max_interval: quick
+    transitions are noticed within tens of milliseconds, slow ones don't
+    spin. A check that raises counts as "not ready yet".
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + deadline
+    interval = initial
+    while True:
+        try:
+            if await check():
+                return True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        remaining = end - loop.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+# ═══════════════════════════════════════════════════════════════════
+# RUN RECORDS
+# ═══════════════════════════════════════════════════════════════════
+
+_current_run: contextvars.ContextVar[Optional["RunRecorder"]] = contextvars.ContextVar("current_run", default=None)
+
+class RunRecorder:
+    """
+    Span durations, counters and attributes of one execute() run
+    
+    Components call the module-level span()/count()/note() helpers, which
+    record into the run active in the current context (asyncio tasks
+    inherit it) and do nothing when no run is being recorded. Each run is
+    appended as one JSON line to cache_dir/runs.jsonl; once the log grows
+    past MAX_BYTES it is trimmed to the last KEEP_RUNS runs.
+    """
+    
+    FILENAME = "runs.jsonl"
+    MAX_BYTES = 1 << 20
+    KEEP_RUNS = 1000
+    
+    def __init__(self):
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.attrs: Dict[str, object] = {}
+        self._token = None
+    
+    def __enter__(self) -> "RunRecorder":
+        self._token = _current_run.set(self)
+        return self
+    
+    def __exit__(self, *exc):
+        _current_run.reset(self._token)
+    
+    @contextlib.contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+    
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+    
+    def note(self, key: str, value):
+        self.attrs[key] = value
+    
+    def summary(self) -> str:
+        return ", ".join(f"{name} {secs:.2f}s" for name, secs in self.phases.items())
+    
+    def to_dict(self, success: bool) -> Dict:
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "success": success,
+            "total": round(time.perf_counter() - self._start, 4),
+            "phases": {name: round(secs, 4) for name, secs in self.phases.items()},
+            "counters": self.counters,
+            **self.attrs,
+        }
+    
+    def save(self, cache_dir: Path, success: bool) -> bool:
+        """Append this run to the run log, trimming it when it gets large"""
+        path = cache_dir / self.FILENAME
+        try:
+            with open(path, "a") as f:
+                f.write(json.dumps(self.to_dict(success), default=str) + "\n")
+                size = f.tell()
+            if size > self.MAX_BYTES:
+                self._trim(path)
+            return True
+        except OSError:
+            return False
+    
+    @classmethod
+    def _trim(cls, path: Path):
+        """Keep the last KEEP_RUNS lines (atomic replace, so readers never see half a log)"""
+        with open(path, "rb") as f:
+            lines = f.readlines()[-cls.KEEP_RUNS:]
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.writelines(lines)
+        tmp.replace(path)
+
+def span(name: str):
+    """Time a block into the current run (no-op outside a run)"""
+    run = _current_run.get()
+    return run.span(name) if run else contextlib.nullcontext()
+
+def count(name: str, n: int = 1):
+    run = _current_run.get()
+    if run:
+        run.count(name, n)
+
+def note(key: str, value):
+    run = _current_run.get()
+    if run:
+        run.note(key, value)
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+def summarize_runs(cache_dir: Path, last: int = 0) -> str:
+    """p50/p95 per phase across recorded runs"""
+    records = []
+    try:
+        with open(cache_dir / RunRecorder.FILENAME) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    if last:
+        records = records[-last:]
+    if not records:
+        return f"No run records in {cache_dir / RunRecorder.FILENAME}"
+    
+    samples: Dict[str, List[float]] = {}
+    for record in records:
+        for name, secs in record.get("phases", {}).items():
+            samples.setdefault(name, []).append(secs)
+        samples.setdefault("total", []).append(record.get("total", 0.0))
+    
+    successes = sum(1 for r in records if r.get("success"))
+    lines = [
+        f"{len(records)} runs, {successes} successful",
+        f"{'phase':<16} {'runs':>5} {'p50':>8} {'p95':>8} {'max':>8}",
+    ]
+    for name, values in samples.items():
+        values.sort()
+        lines.append(
+            f"{name:<16} {len(values):>5} {_percentile(values, 0.5):>7.2f}s "
+            f"{_percentile(values, 0.95):>7.2f}s {values[-1]:>7.2f}s"
+        )
+    
+    strategies: Dict[str, int] = {}
+    for record in records:
+        strategy = record.get("strategy", "none")
+        strategies[strategy] = strategies.get(strategy, 0) + 1
+    lines.append("strategies: " + ", ".join(f"{k}={v}" for k, v in sorted(strategies.items())))
+    
+    retries = [r.get("counters", {}).get("auth_retries", 0) for r in records]
+    lines.append(f"auth retries: mean {sum(retries) / len(retries):.2f}, max {max(retries)}")
+    return "\n".join(lines)
+
+# ═══════════════════════════════════════════════════════════════════
+# SSID PATTERN MATCHING
+# ═══════════════════════════════════════════════════════════════════
+
+class SSIDMatcher:
+    """
+    SSID glob patterns compiled once, matched case-insensitively
+    
+    Only '*' (any run) and '?' (one character) are wildcards; every other
+    character, regex metacharacters included, matches literally. Patterns
+    without wildcards are a set lookup, 'prefix*' patterns a single
+    str.startswith over all prefixes, and the rest share one combined
+    regex.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = tuple(patterns)
+        exact, prefixes, globs = set(), [], []
+        
+        for pattern in self.patterns:
+            folded = pattern.lower()
+            head = folded[:-1]
+            if "*" not in folded and "?" not in folded:
+                exact.add(folded)
+            elif folded.endswith("*") and "*" not in head and "?" not in head:
+                prefixes.append(head)
+            else:
+                globs.append(self._translate(pattern))
+        
+        self._exact = frozenset(exact)
+        self._prefixes = tuple(prefixes)
+        self._regex = re.compile("|".join(globs), re.IGNORECASE | re.DOTALL) if globs else None
+    
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Glob to regex, escaping everything that isn't a wildcard"""
+        parts = []
+        for ch in pattern:
+            if ch == "*":
+                if not parts or parts[-1] != ".*":
+                    parts.append(".*")
+            elif ch == "?":
+                parts.append(".")
+            else:
+                parts.append(re.escape(ch))
+        return "(?:" + "".join(parts) + ")"
+    
+    def matches(self, ssid: str) -> bool:
+        folded = ssid.lower()
+        if folded in self._exact:
+            return True
+        if self._prefixes and folded.startswith(self._prefixes):
+            return True
+        return bool(self._regex and self._regex.fullmatch(ssid))
+    
+    def filter(self, networks: List[WiFiNetwork]) -> List[WiFiNetwork]:
+        """Networks whose SSID matches any pattern, in scan order"""
+        return [network for network in networks if self.matches(network.ssid)]
+
+# ═══════════════════════════════════════════════════════════════════
+# SIGNAL HISTORY
+# ═══════════════════════════════════════════════════════════════════
+
+class _SignalRing:
+    """Last N samples of one BSSID (one byte each) plus a running EWMA"""
+    
+    __slots__ = ("samples", "pos", "count", "ewma", "updated")
+    
+    def __init__(self, size: int):
+        self.samples = array("B", bytes(size))
+        self.pos = 0
+        self.count = 0
+        self.ewma = 0.0
+        self.updated = 0.0
+    
+    def add(self, value: int, alpha: float, now: float):
+        self.samples[self.pos] = max(0, min(100, value))
+        self.pos = (self.pos + 1) % len(self.samples)
+        self.ewma = float(value) if self.count == 0 else alpha * value + (1 - alpha) * self.ewma
+        self.count = min(self.count + 1, len(self.samples))
+        self.updated = now
+    
+    def ordered(self) -> List[int]:
+        """Samples, oldest first"""
+        if self.count < len(self.samples):
+            return self.samples[:self.count].tolist()
+        return (self.samples[self.pos:] + self.samples[:self.pos]).tolist()
+    
+    def trend(self) -> float:
+        """Least-squares slope in signal points per sample (0 until 3 samples)"""
+        values = self.ordered()
+        n = len(values)
+        if n < 3:
+            return 0.0
+        mean_x = (n - 1) / 2
+        mean_y = sum(values) / n
+        num = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+        den = sum((x - mean_x) ** 2 for x in range(n))
+        return num / den
+
+class SignalHistory:
+    """
+    Per-BSSID signal history used to rank networks
+    
+    Each BSSID keeps a fixed-size ring of recent samples (array-backed,
+    bounded to max_bssids entries) and an EWMA. Selection uses the EWMA
+    projected TREND_HORIZON samples ahead along the trend, so one noisy
+    reading neither wins nor loses a comparison. Rings idle for longer
+    than STALE_AFTER start over. Persisted to a small JSON file.
+    """
+    
+    STALE_AFTER = 3600
+    TREND_HORIZON = 2
+    
+    def __init__(self, path: Optional[Path] = None, size: int = 16, alpha: float = 0.3, max_bssids: int = 512):
+        self.path = path
+        self.size = size
+        self.alpha = alpha
+        self.max_bssids = max_bssids
+        self._rings: Dict[str, _SignalRing] = {}
+        self._dirty = False
+        if path:
+            self.load()
+    
+    def record(self, networks: Iterable[WiFiNetwork], now: Optional[float] = None):
+        """Add one sample per BSSID from a scan"""
+        now = now or time.time()
+        for network in networks:
+            ring = self._rings.get(network.bssid)
+            if ring is None or now - ring.updated > self.STALE_AFTER:
+                if ring is None and len(self._rings) >= self.max_bssids:
+                    oldest = min(self._rings, key=lambda b: self._rings[b].updated)
+                    del self._rings[oldest]
+                ring = self._rings[network.bssid] = _SignalRing(self.size)
+            ring.add(network.signal, self.alpha, now)
+        self._dirty = True
+    
+    def get(self, bssid: str) -> Optional[_SignalRing]:
+        return self._rings.get(bssid)
+    
+    def score(self, bssid: str, fallback: int) -> float:
+        """Smoothed, trend-projected signal (the raw sample for unknown BSSIDs)"""
+        ring = self._rings.get(bssid)
+        if ring is None or not ring.count:
+            return float(fallback)
+        return max(0.0, min(100.0, ring.ewma + self.TREND_HORIZON * ring.trend()))
+    
+    def load(self):
+        """Read the saved history, skipping stale or malformed entries"""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        entries = data.get("bssids") if isinstance(data, dict) else None
+        if not isinstance(entries, dict):
+            return
+        now = time.time()
+        for bssid, entry in entries.items():
+            ring = self._parse_ring(entry, now)
+            if ring is not None:
+                self._rings[bssid] = ring
+    
+    def _parse_ring(self, entry, now: float) -> Optional[_SignalRing]:
+        """Rebuild one saved [ewma, updated, samples] entry; None if stale or malformed"""
+        if not isinstance(entry, list) or len(entry) != 3:
+            return None
+        ewma, updated, samples = entry
+        number = (int, float)
+        if (not isinstance(ewma, number) or not isinstance(updated, number)
+                or isinstance(ewma, bool) or isinstance(updated, bool)
+                or not isinstance(samples, list) or not samples
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in samples)):
+            return None
+        if now - updated > self.STALE_AFTER:
+            return None
+        ring = _SignalRing(self.size)
+        for value in samples[-self.size:]:
+            ring.add(value, self.alpha, updated)
+        ring.ewma = float(ewma)
+        return ring
+    
+    def save(self):
+        """Write the history if it changed since the last save"""
+        if not self.path or not self._dirty:
+            return
+        data = {
+            "bssids": {
+                bssid: [round(ring.ewma, 2), ring.updated, ring.ordered()]
+                for bssid, ring in self._rings.items()
+            }
+        }
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, separators=(",", ":")))
+            tmp.replace(self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+# ═══════════════════════════════════════════════════════════════════
+# NETWORK OUTCOME HISTORY
+# ═══════════════════════════════════════════════════════════════════
+
+class OutcomeStore:
+    """
+    Per-BSSID connect/auth outcomes in SQLite (cache_dir/outcomes.db)
+    
+    Aggregates of the last WINDOW seconds are loaded once and kept in
+    memory; new outcomes update them immediately but are only written
+    to disk by flush(), in one transaction at the end of a run.
+    """
+    
+    WINDOW = 30 * 86400
+    LATENCY_WEIGHT = 0.5  # score points per second of time to internet
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outcomes (
+            ts REAL NOT NULL,
+            ssid TEXT,
+            bssid TEXT NOT NULL,
+            connect_s REAL,
+            auth_s REAL,
+            tti_s REAL,
+            success INTEGER NOT NULL,
+            strategy TEXT
+        );
+        CREATE INDEX IF NOT EXISTS outcomes_bssid_ts ON outcomes (bssid, ts);
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._pending: List[Tuple] = []
+        # bssid -> [attempts, successes, tti_sum, tti_count]
+        self._stats: Dict[str, List[float]] = {}
+        self._load()
+    
+    def _load(self):
+        try:
+            with contextlib.closing(sqlite3.connect(str(self.path))) as db:
+                db.executescript(self.SCHEMA)
+                rows = db.execute(
+                    "SELECT bssid, COUNT(*), SUM(success), SUM(CASE WHEN success THEN tti_s END), "
+                    "SUM(CASE WHEN success AND tti_s IS NOT NULL THEN 1 ELSE 0 END) "
+                    "FROM outcomes WHERE ts > ? GROUP BY bssid",
+                    (time.time() - self.WINDOW,)
+                ).fetchall()
+        except sqlite3.Error:
+            return
+        for bssid, attempts, successes, tti_sum, tti_count in rows:
+            self._stats[bssid] = [attempts, successes or 0, tti_sum or 0.0, tti_count or 0]
+    
+    def add(
+        self,
+        ssid: str,
+        bssid: str,
+        success: bool,
+        connect_s: Optional[float] = None,
+        auth_s: Optional[float] = None,
+        tti_s: Optional[float] = None,
+        strategy: Optional[str] = None
+    ):
+        """Queue one outcome (written by flush)"""
+        self._pending.append((time.time(), ssid, bssid, connect_s, auth_s, tti_s, int(success), strategy))
+        stats = self._stats.setdefault(bssid, [0, 0, 0.0, 0])
+        stats[0] += 1
+        if success:
+            stats[1] += 1
+            if tti_s is not None:
+                stats[2] += tti_s
+                stats[3] += 1
+    
+    def flush(self):
+        """Write queued outcomes in one transaction"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            with contextlib.closing(sqlite3.connect(str(self.path))) as db, db:
+                db.executemany("INSERT INTO outcomes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", pending)
+        except sqlite3.Error:
+            self._pending = pending + self._pending
+    
+    def adjust(self, bssid: str, signal_score: float) -> float:
+        """
+        Combine a signal score with history
+        
+        The score is scaled by 0.5 + the Laplace-smoothed success rate, so
+        an unknown BSSID (rate 1/2) keeps its signal, one that keeps
+        failing sinks towards half of it and a reliable one gains up to
+        half again. It is then reduced by the mean time to internet of
+        its successful runs.
+        """
+        attempts, successes, tti_sum, tti_count = self._stats.get(bssid, (0, 0, 0.0, 0))
+        rate = (successes + 1) / (attempts + 2)
+        penalty = min(tti_sum / tti_count, 60.0) * self.LATENCY_WEIGHT if tti_count else 0.0
+        return signal_score * (0.5 + rate) - penalty
+
+# ═══════════════════════════════════════════════════════════════════
+# NMCLI TERSE OUTPUT
+# ═══════════════════════════════════════════════════════════════════
+
+def split_terse(line: str) -> List[str]:
+    """
+    Split one `nmcli -t` line into unescaped fields
+    
+    Terse mode escapes ':' as '\\:' and '\\' as '\\\\' inside values. Escapes
+    are swapped for control characters absent from the line, so the split
+    and restore run as a few C-level str operations; anything unusual
+    (stray backslashes, those control characters present) goes through
+    the exact single-pass scanner.
+    """
+    if "\\" not in line:
+        return line.split(":")
+    if "\x00" in line or "\x01" in line:
+        return _split_terse_exact(line)
+    
+    # Left-to-right replacement pairs escapes correctly: backslash pairs first, then '\\:'
+    protected = line.replace("\\\\", "\x01").replace("\\:", "\x00")
+    if "\\" in protected:
+        return _split_terse_exact(line)
+    return [
+        field.replace("\x00", ":").replace("\x01", "\\") if "\x00" in field or "\x01" in field else field
+        for field in protected.split(":")
+    ]
+
+def _split_terse_exact(line: str) -> List[str]:
+    """Single pass: jump between delimiters and escapes with str.find"""
+    fields: List[str] = []
+    parts: List[str] = []
+    pos = 0
+    colon = line.find(":")
+    slash = line.find("\\")
+    while True:
+        if slash != -1 and (colon == -1 or slash < colon):
+            parts.append(line[pos:slash])
+            parts.append(line[slash + 1:slash + 2])  # escaped char, taken literally
+            pos = slash + 2
+            slash = line.find("\\", pos)
+            if colon != -1 and colon < pos:
+                colon = line.find(":", pos)
+        elif colon != -1:
+            parts.append(line[pos:colon])
+            fields.append("".join(parts))
+            parts = []
+            pos = colon + 1
+            colon = line.find(":", pos)
+        else:
+            parts.append(line[pos:])
+            fields.append("".join(parts))
+            return fields
+
 # ═══════════════════════════════════════════════════════════════════
 # WiFi RECONNAISSANCE ENGINE - FIXED
 # ═══════════════════════════════════════════════════════════════════
@@ -201,13 +812,25 @@ class SecureCredentials:
 class WiFiRecon:
     """Elite WiFi scanning & signal analysis - FIXED PARSING"""
     
-    def __init__(self, logger: logging.Logger, debug: bool = False):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        debug: bool = False,
+        signal_history: Optional[SignalHistory] = None,
+        outcomes: Optional[OutcomeStore] = None
+    ):
         self.logger = logger
         self.debug = debug
-        self.interface = self._detect_interface()
+        self.signal_history = signal_history
+        self.outcomes = outcomes
+        self.interfaces = self._detect_interfaces()
+        self.interface = self.interfaces[0] if self.interfaces else None  # primary adapter
+        self.sightings: Dict[str, Dict[str, int]] = {}  # bssid -> {interface: signal}, last scan
+        self._matcher: Optional[SSIDMatcher] = None
     
-    def _detect_interface(self) -> Optional[str]:
-        """Auto-detect WiFi interface"""
+    def _detect_interfaces(self) -> List[str]:
+        """Auto-detect WiFi interfaces (every radio, in `iw dev` order)"""
+        interfaces = []
         try:
             result = subprocess.run(
                 ["iw", "dev"],
@@ -217,20 +840,85 @@ class WiFiRecon:
             )
             for line in result.stdout.split("\n"):
                 if "Interface" in line:
-                    return line.split()[-1]
+                    name = line.split()[-1]
+                    if not name.startswith("p2p-") and name not in interfaces:
+                        interfaces.append(name)
         except Exception:
             pass
+        if interfaces:
+            return interfaces
         
         # Fallback to common names
         for iface in ["wlan0", "wlp2s0", "wlo1", "wlp3s0", "wlan1"]:
             if Path(f"/sys/class/net/{iface}").exists():
-                return iface
+                return [iface]
         
-        return None
+        return []
+    
+    SCAN_FIELDS = "IN-USE,BSSID,SSID,CHAN,SIGNAL,SECURITY,FREQ"
     
     def scan_networks(self) -> List[WiFiNetwork]:
+        """Blocking wrapper around scan_networks_async for non-async callers"""
+        return asyncio.run(self.scan_networks_async())
+    
+    async def scan_networks_async(self, timeout: float = 15.0) -> List[WiFiNetwork]:
+        """
+        Scan for all available WiFi networks without blocking the event loop
+        
+        With several adapters every one scans concurrently and the results
+        are merged by BSSID (merge_scans); each network then carries the
+        adapter that hears it best.
+        """
+        with span("scan"):
+            if len(self.interfaces) > 1:
+                scans = await asyncio.gather(
+                    *(self._scan_interface(iface, timeout) for iface in self.interfaces)
+                )
+                networks = self.merge_scans(scans)
+            else:
+                networks = await self._scan_interface(self.interface, timeout)
+                self.sightings = {n.bssid: {n.interface: n.signal} for n in networks}
+            
+            if networks and self.signal_history is not None:
+                self.signal_history.record(networks)
+            if len(self.interfaces) > 1:
+                self.logger.info(f"📡 Scanned {len(networks)} networks on {len(self.interfaces)} adapters")
+            else:
+                self.logger.info(f"📡 Scanned {len(networks)} networks")
+            return networks
+    
+    def merge_scans(self, scans: Iterable[List[WiFiNetwork]]) -> List[WiFiNetwork]:
+        """
+        One record per BSSID from per-adapter scans
+        
+        The strongest sighting wins (and names the adapter); which adapters
+        heard which BSSID is kept in self.sightings for connect planning.
+        """
+        best: Dict[str, WiFiNetwork] = {}
+        sightings: Dict[str, Dict[str, int]] = {}
+        for networks in scans:
+            for net in networks:
+                sightings.setdefault(net.bssid, {})[net.interface] = net.signal
+                seen = best.get(net.bssid)
+                if seen is None:
+                    best[net.bssid] = net
+                elif net.signal > seen.signal:
+                    best[net.bssid] = net._replace(in_use=net.in_use or seen.in_use)
+                elif net.in_use and not seen.in_use:
+                    best[net.bssid] = seen._replace(in_use=True)
+        self.sightings = sightings
+        return list(best.values())
+    
+    async def _scan_interface(self, interface: Optional[str], timeout: float) -> List[WiFiNetwork]:
         """
-        FIXED: Scan for all available WiFi networks with detailed info
+        Scan on one adapter (None: whatever devices nmcli picks)
+        
+        `dev wifi list --rescan yes` makes nmcli request a scan and wait for
+        NetworkManager's LastScan timestamp to move, so there is no fixed
+        sleep: we return as soon as results are fresh. If another scan is
+        already in flight we poll until it completes; any other refusal
+        (radio busy, scan just finished) or the deadline falls back to the
+        cached list. Cancelling the task kills nmcli.
         
         CRITICAL FIX:
         - Use LC_ALL=C to force English output (prevents locale issues)
@@ -238,101 +926,94 @@ class WiFiRecon:
         - Fields: IN-USE:BSSID:SSID:CHAN:SIGNAL:SECURITY:FREQ
         - SSID is field index 2 (0-indexed), not 3!
         """
+        list_cmd = ["nmcli", "-t", "-f", self.SCAN_FIELDS, "dev", "wifi", "list"]
+        if interface:
+            list_cmd += ["ifname", interface]
+        
         try:
-            # Trigger rescan
-            subprocess.run(
-                ["nmcli", "dev", "wifi", "rescan"],
-                capture_output=True,
-                timeout=5,
-                env={**os.environ, "LC_ALL": "C"}
-            )
-            time.sleep(2)  # Wait for scan
-            
-            # Get detailed network list in TERSE mode
-            # CRITICAL: Use LC_ALL=C to ensure consistent English output
-            result = subprocess.run(
-                ["nmcli", "-t", "-f", "IN-USE,BSSID,SSID,CHAN,SIGNAL,SECURITY,FREQ", "dev", "wifi", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                env={**os.environ, "LC_ALL": "C"}
-            )
+            loop = asyncio.get_running_loop()
+            end = loop.time() + timeout
+            outcome = (-1, "", f"rescan timed out after {timeout}s")
             
-            if result.returncode != 0:
-                self.logger.error(f"nmcli failed: {result.stderr}")
-                return []
+            async def rescan() -> bool:
+                nonlocal outcome
+                outcome = await run_command(list_cmd + ["--rescan", "yes"], max(end - loop.time(), 0.1))
+                return outcome[0] == 0 or "already scanning" not in outcome[2].lower()
             
-            if self.debug:
-                self.logger.debug(f"nmcli raw output:\n{result.stdout}")
+            await wait_until(rescan, timeout, initial=0.25)
+            code, stdout, stderr = outcome
             
-            networks = []
-            for line in result.stdout.strip().split("\n"):
-                if not line.strip():
-                    continue
-                
-                # Terse mode uses ':' as delimiter, with ':' and '\\' escaped as '\\:' and '\\\\'
-                # Split on unescaped ':' and then unescape fields
-                parts = re.split(r"(?<!\\):", line)
-                parts = [p.replace("\\:", ":").replace("\\\\", "\\") for p in parts]
-                
-                if self.debug:
-                    self.logger.debug(f"Parsing line: {line}")
-                    self.logger.debug(f"Parts ({len(parts)}): {parts}")
-                
-                # Need at least 7 fields: IN-USE:BSSID:SSID:CHAN:SIGNAL:SECURITY:FREQ
-                if len(parts) < 7:
-                    if self.debug:
-                        self.logger.debug(f"Skipping line (insufficient fields): {line}")
-                    continue
-                
-                try:
-                    # Parse fields (0-indexed)
-                    in_use = parts[0].strip() == "*"
-                    bssid = parts[1].strip()
-                    ssid = parts[2].strip()  # CRITICAL: SSID is index 2, not 3!
-                    channel_str = parts[3].strip()
-                    signal_str = parts[4].strip()
-                    security = parts[5].strip()
-                    freq = parts[6].strip()
-                    
-                    # Skip if SSID is empty or "--"
-                    if not ssid or ssid == "--":
-                        if self.debug:
-                            self.logger.debug(f"Skipping (no SSID): {line}")
-                        continue
-                    
-                    # Parse signal strength
-                    signal = int(signal_str) if signal_str.isdigit() else 0
-                    
-                    # Parse channel
-                    channel = int(channel_str) if channel_str.isdigit() else 0
-                    
-                    network = WiFiNetwork(
-                        ssid=ssid,
-                        bssid=bssid,
-                        signal=signal,
-                        channel=channel,
-                        security=security if security else "--",
-                        frequency=freq if freq else "Unknown",
-                        in_use=in_use
-                    )
-                    networks.append(network)
-                    
-                    if self.debug:
-                        self.logger.debug(f"✅ Parsed: {network}")
-                
-                except (ValueError, IndexError) as e:
-                    if self.debug:
-                        self.logger.debug(f"Parse error on line '{line}': {e}")
-                    continue
+            if code != 0:
+                self.logger.debug(f"Rescan unavailable ({stderr.strip()}) - using cached results")
+                code, stdout, stderr = await run_command(list_cmd + ["--rescan", "no"], 10)
             
-            self.logger.info(f"📡 Scanned {len(networks)} networks")
-            return networks
+            if code != 0:
+                self.logger.error(f"nmcli failed{f' on {interface}' if interface else ''}: {stderr}")
+                return []
             
+            return self._parse_scan_output(stdout, interface or self.interface)
+        
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            self.logger.error(f"Network scan failed: {e}")
+            self.logger.error(f"Network scan failed{f' on {interface}' if interface else ''}: {e}")
             return []
     
+    def _parse_scan_output(self, output: str, interface: Optional[str] = None) -> List[WiFiNetwork]:
+        """Parse nmcli terse output into WiFiNetwork records"""
+        if self.debug:
+            self.logger.debug("nmcli raw output:\n%s", output)
+        return list(self.iter_scan_records(output.splitlines(), interface))
+    
+    def iter_scan_records(self, lines: Iterable[str], interface: Optional[str] = None) -> Iterator[WiFiNetwork]:
+        """
+        Lazily turn `nmcli -t -f SCAN_FIELDS` lines into WiFiNetwork records
+        
+        Fields: IN-USE:BSSID:SSID:CHAN:SIGNAL:SECURITY:FREQ (SSID is index 2).
+        Per-line debug output is only produced when debug logging is
+        actually enabled.
+        """
+        debug = self.debug and self.logger.isEnabledFor(logging.DEBUG)
+        
+        for line in lines:
+            if not line.strip():
+                continue
+            
+            parts = split_terse(line)
+            if debug:
+                self.logger.debug("Parsing line: %s -> %r", line, parts)
+            
+            # Need at least 7 fields: IN-USE:BSSID:SSID:CHAN:SIGNAL:SECURITY:FREQ
+            if len(parts) < 7:
+                if debug:
+                    self.logger.debug("Skipping line (insufficient fields): %s", line)
+                continue
+            
+            in_use, bssid, ssid, channel, signal, security, freq = parts[:7]
+            ssid = ssid.strip()
+            
+            # Skip if SSID is empty or "--"
+            if not ssid or ssid == "--":
+                if debug:
+                    self.logger.debug("Skipping (no SSID): %s", line)
+                continue
+            
+            signal = signal.strip()
+            channel = channel.strip()
+            security = security.strip()
+            freq = freq.strip()
+            
+            yield WiFiNetwork(
+                ssid,
+                bssid.strip(),
+                int(signal) if signal.isdigit() else 0,
+                int(channel) if channel.isdigit() else 0,
+                security or "--",
+                freq or "Unknown",
+                in_use.strip() == "*",
+                interface
+            )
+    
     def find_matching_networks(
         self, 
         networks: List[WiFiNetwork], 
@@ -344,28 +1025,35 @@ class WiFiRecon:
         Pattern examples:
         - "STWCU_LR-*" matches STWCU_LR-1, STWCU_LR-2, etc.
         - "STWCU_ICR-*" matches STWCU_ICR-1, STWCU_ICR-2, etc.
+        
+        The patterns are compiled once (SSIDMatcher) and reused while
+        they stay the same.
         """
-        matched = []
+        if self._matcher is None or self._matcher.patterns != tuple(patterns):
+            self._matcher = SSIDMatcher(patterns)
         
-        for network in networks:
-            for pattern in patterns:
-                # Convert glob pattern to regex
-                # * becomes .* (any chars)
-                # ? becomes . (single char)
-                regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-                regex_pattern = f"^{regex_pattern}$"
-                
-                if re.match(regex_pattern, network.ssid, re.IGNORECASE):
-                    matched.append(network)
-                    if self.debug:
-                        self.logger.debug(f"✅ Matched '{network.ssid}' with pattern '{pattern}'")
-                    break
+        matched = self._matcher.filter(networks)
         
         if self.debug:
+            for network in matched:
+                self.logger.debug(f"✅ Matched '{network.ssid}'")
             self.logger.debug(f"Found {len(matched)} matching networks")
         
         return matched
     
+    def signal(self, network: WiFiNetwork) -> float:
+        """Smoothed signal from the history, else the raw sample"""
+        if self.signal_history is None:
+            return float(network.signal)
+        return self.signal_history.score(network.bssid, network.signal)
+    
+    def score(self, network: WiFiNetwork) -> float:
+        """Selection score: smoothed signal weighted by past outcomes"""
+        signal = self.signal(network)
+        if self.outcomes is None:
+            return signal
+        return self.outcomes.adjust(network.bssid, signal)
+    
     def get_best_network(
         self, 
         networks: List[WiFiNetwork],
@@ -374,33 +1062,40 @@ class WiFiRecon:
         hysteresis: int = 10
     ) -> Optional[WiFiNetwork]:
         """
-        Select best network based on signal strength
+        Select best network by score (smoothed signal and past outcomes)
+        
+        The signal threshold applies to the smoothed signal alone, so a
+        bad history lowers a network's rank without hiding it.
         
         Hysteresis prevents constant switching:
-        - If connected, new network must be significantly better
-        - If disconnected, just pick strongest
+        - If connected, another BSSID must score significantly better
+        - If disconnected, just pick the best score
         """
         if not networks:
             return None
         
         # Filter by minimum signal strength
-        viable = [n for n in networks if n.signal >= min_signal]
+        viable = [n for n in networks if self.signal(n) >= min_signal]
         if not viable:
             self.logger.warning(f"No networks above {min_signal}% signal threshold")
             return None
         
-        # Sort by signal strength (descending)
-        viable.sort(key=lambda n: n.signal, reverse=True)
+        # Sort by score (descending)
+        viable.sort(key=self.score, reverse=True)
         best = viable[0]
         
-        # Apply hysteresis if currently connected
-        if current_network and current_network.ssid in [n.ssid for n in viable]:
-            current_signal = next((n.signal for n in viable if n.ssid == current_network.ssid), 0)
-            
-            # Only switch if new network is significantly better
-            if best.signal < current_signal + hysteresis:
-                self.logger.info(f"Staying with {current_network.ssid} ({current_signal}%) - hysteresis active")
-                return current_network
+        # Apply hysteresis if currently connected (same BSSID, not just same SSID)
+        if current_network:
+            current = next((n for n in viable if n.bssid == current_network.bssid), None)
+            if current and current is not best:
+                current_score = self.score(current)
+                
+                # Only switch if new network is significantly better
+                if self.score(best) < current_score + hysteresis:
+                    self.logger.info(
+                        f"Staying with {current.ssid} [{current.bssid}] ({current_score:.0f}%) - hysteresis active"
+                    )
+                    return current
         
         return best
 
@@ -499,9 +1194,9 @@ class StealthTools:
             return False
     
     @staticmethod
-    def get_stealth_chrome_options() -> ChromeOptions:
+    def get_stealth_chrome_options():
         """Chrome with maximum stealth"""
-        options = ChromeOptions()
+        options = selenium_api().ChromeOptions()
         options.add_argument("--headless=new")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
@@ -514,173 +1209,1121 @@ class StealthTools:
         return options
     
     @staticmethod
-    def get_stealth_firefox_options() -> FirefoxOptions:
+    def get_stealth_firefox_options():
         """Firefox with privacy hardening"""
-        options = FirefoxOptions()
+        options = selenium_api().FirefoxOptions()
         options.add_argument("--headless")
         options.set_preference("general.useragent.override", StealthTools.random_user_agent())
         options.set_preference("privacy.resistFingerprinting", True)
         return options
 
 # ═══════════════════════════════════════════════════════════════════
-# NETWORK UTILITIES
+# BROWSER POOL
 # ═══════════════════════════════════════════════════════════════════
 
-class NetworkTools:
-    """Network connectivity & captive portal detection"""
+class BrowserPool:
+    """
+    One warm headless WebDriver shared across authentication attempts
+    
+    The driver is launched in the background (prewarm) once a portal login
+    is needed, so it warms up while the browser-free attempt runs; it is
+    reset between attempts instead of quit, and recycled after max_uses or
+    whenever it crashes. close() never waits for a launch nobody used.
+    
+    Every WebDriver call goes through run(), which executes it on a single
+    dedicated browser thread: the event loop never blocks on the browser,
+    and the driver is only ever touched from one thread.
+    """
+    
+    def __init__(self, logger: logging.Logger, max_uses: int = 10, page_load_timeout: int = 25):
+        self.logger = logger
+        self.max_uses = max_uses
+        self.page_load_timeout = page_load_timeout
+        self._driver = None
+        self._uses = 0
+        self._launching: Optional[asyncio.Future] = None
+        self._launch_job: Optional[concurrent.futures.Future] = None
+        self._worker: Optional[ThreadPoolExecutor] = None
+        self._detached: List[asyncio.Task] = []
+    
+    def _thread(self) -> ThreadPoolExecutor:
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+        return self._worker
+    
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking browser call on the browser thread and await it"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread(), functools.partial(fn, *args, **kwargs))
+    
+    def _launch(self):
+        """Start the first working webdriver (blocking)"""
+        webdriver = selenium_api().webdriver
+        for driver_name in WebDriverManager.get_available_drivers(self.logger):
+            try:
+                if driver_name == "chrome":
+                    self.logger.debug("Initializing Chrome webdriver...")
+                    driver = webdriver.Chrome(options=StealthTools.get_stealth_chrome_options())
+                else:
+                    self.logger.debug("Initializing Firefox webdriver...")
+                    driver = webdriver.Firefox(options=StealthTools.get_stealth_firefox_options())
+                driver.set_page_load_timeout(self.page_load_timeout)
+                self.logger.info(f"✅ {driver_name.capitalize()} webdriver initialized")
+                return driver
+            except Exception as e:
+                self.logger.error(f"Failed to initialize {driver_name}: {e}")
+        return None
+    
+    def prewarm(self):
+        """Launch the browser in the background if none is ready"""
+        if SELENIUM_AVAILABLE and self._driver is None and self._launching is None:
+            self._launch_job = self._thread().submit(self._launch)
+            self._launching = asyncio.wrap_future(self._launch_job)
+    
+    async def acquire(self):
+        """Return a ready driver, launching one if needed (None if impossible)"""
+        if self._driver is None:
+            self.prewarm()
+            if self._launching is None:
+                return None
+            try:
+                with span("browser_launch"):
+                    self._driver = await self._launching
+            finally:
+                self._launching = self._launch_job = None
+            self._uses = 0
+        self._uses += 1
+        return self._driver
     
     @staticmethod
-    async def detect_captive_portal(session: aiohttp.ClientSession) -> Tuple[bool, Optional[str]]:
-        """Multi-method captive portal detection"""
-        endpoints = [
-            "http://clients3.google.com/generate_204",
-            "http://captive.apple.com/hotspot-detect.html",
-            "http://connectivitycheck.gstatic.com/generate_204",
-        ]
+    def _reset(driver):
+        """Clear cookies and storage so the next attempt starts clean (blocking)"""
+        try:
+            origin = driver.execute_script("return window.location.origin")
+            if hasattr(driver, "execute_cdp_cmd") and origin and origin != "null":
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            else:
+                driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        except Exception:
+            pass
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    async def release(self, driver, healthy: bool = True):
+        """Return the driver: reset for reuse, or recycle it"""
+        if driver is None or driver is not self._driver:
+            return
         
-        for endpoint in endpoints:
+        if healthy and self._uses < self.max_uses:
             try:
-                async with session.get(endpoint, timeout=aiohttp.ClientTimeout(total=5), allow_redirects=False) as resp:
-                    if resp.status == 204:
-                        return False, None
-                    
-                    if resp.status == 200:
-                        content = await resp.text()
-                        if len(content) > 0:
-                            return True, str(resp.url)
-                    
-                    if resp.status in [301, 302, 303, 307, 308]:
-                        return True, resp.headers.get("Location")
-                    
-                    if resp.status == 511:
-                        return True, str(resp.url)
-                        
-            except Exception:
-                continue
+                await self.run(self._reset, driver)
+                return
+            except Exception as e:
+                self.logger.debug(f"Browser reset failed, recycling: {e}")
         
-        return False, None
+        self._driver = None
+        await self.run(self._quit, driver)
+        self.logger.debug("♻️  Webdriver recycled")
     
-    @staticmethod
-    async def check_internet(session: aiohttp.ClientSession) -> bool:
-        """Verify full internet connectivity"""
-        endpoints = [
-            "http://clients3.google.com/generate_204",
-            "http://connectivitycheck.gstatic.com/generate_204",
-        ]
-
-        for endpoint in endpoints:
-            try:
-                async with session.get(
-                    endpoint,
-                    timeout=aiohttp.ClientTimeout(total=5),
-                    allow_redirects=False,
-                ) as resp:
-                    if resp.status == 204:
-                        return True
-                    if resp.status in {200, 301, 302, 303, 307, 308, 511}:
-                        return False
-            except Exception:
-                continue
-
-        return False
+    def detach(self, task: asyncio.Task):
+        """Hand over an abandoned browser task; close() waits for it"""
+        self._detached.append(task)
+    
+    def _quit_launched(self, job: concurrent.futures.Future):
+        """Quit a driver whose launch finished after close() (browser thread)"""
+        if not job.cancelled() and job.exception() is None and job.result() is not None:
+            self._quit(job.result())
+    
+    async def close(self):
+        """Shut down the pooled browser; a launch still in progress is not awaited"""
+        if self._detached:
+            await asyncio.gather(*self._detached, return_exceptions=True)
+            self._detached.clear()
+        if self._launching is not None:
+            launching, job = self._launching, self._launch_job
+            self._launching = self._launch_job = None
+            if launching.done():
+                if not launching.cancelled() and launching.exception() is None:
+                    self._driver = launching.result()
+            else:
+                # Cancel the launch if it hasn't started; one already inside
+                # the WebDriver constructor is quit as soon as it returns
+                launching.cancel()
+                if not job.cancel():
+                    job.add_done_callback(self._quit_launched)
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            await self.run(self._quit, driver)
+        if self._worker is not None:
+            self._worker.shutdown(wait=False)
+            self._worker = None
 
 # ═══════════════════════════════════════════════════════════════════
-# CONNECTION MANAGER
+# HTTP SESSIONS
 # ═══════════════════════════════════════════════════════════════════
 
-class ConnectionManager:
-    """WiFi connection orchestration"""
+class HTTPSessionFactory:
+    """
+    One tuned aiohttp session shared by probing, detection and portal login
     
-    def __init__(self, config: Config, recon: WiFiRecon, logger: logging.Logger):
+    Connections are kept alive and DNS answers cached across phases.
+    Portal cookies (set during detection, needed at login) live in one
+    jar per network (AuthCache.network: SSID + gateway MAC), so a portal
+    at 192.168.1.1 never sees another network's cookies for the same
+    address. Jars are persisted as plain JSON to cache_dir/cookies.json.
+    Call network_changed() after switching networks: pooled sockets and
+    cached DNS belong to the old link and are dropped, and the jar of the
+    new network is swapped in.
+    """
+    
+    CONNECT_TIMEOUT = 5.0
+    DNS_TTL = 60  # short: portals hijack DNS until we're logged in
+    KEEPALIVE = 15.0
+    LIMIT = 32
+    LIMIT_PER_HOST = 4
+    MAX_NETWORKS = 64  # cookie jars kept on disk, least recently saved dropped first
+    
+    def __init__(self, config: Config, logger: logging.Logger):
         self.config = config
-        self.recon = recon
         self.logger = logger
-        self.state = ConnectionState.DISCONNECTED
-        self.current_network: Optional[WiFiNetwork] = None
+        self.cookie_file = config.cache_dir / "cookies.json"
+        self.network: Optional[str] = None  # owner of cookie_jar (None: not persisted)
+        self.cookie_jar: Optional[aiohttp.CookieJar] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._saved: Optional[Dict[str, List[Dict]]] = None
     
-    def _run_nmcli(self, args: List[str], timeout: int = 15) -> Tuple[bool, str]:
-        """Execute nmcli command"""
-        try:
-            result = subprocess.run(
-                ["nmcli"] + args,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                env={**os.environ, "LC_ALL": "C"}
-            )
-            return result.returncode == 0, result.stdout
-        except Exception as e:
-            return False, str(e)
+    def timeout(self, total: Optional[float] = None) -> aiohttp.ClientTimeout:
+        """Request timeout with the shared connect limit (default: portal_timeout)"""
+        total = total or self.config.portal_timeout
+        return aiohttp.ClientTimeout(total=total, sock_connect=min(self.CONNECT_TIMEOUT, total))
     
-    def connect_to_network(self, network: WiFiNetwork) -> bool:
-        """Connect to specific network"""
-        self.logger.info(f"🔌 Connecting to: {network.ssid} (Signal: {network.signal}%)")
-        
-        self.state = ConnectionState.CONNECTING
+    def _stored(self) -> Dict[str, List[Dict]]:
+        """Saved jars by network (read once)"""
+        if self._saved is None:
+            try:
+                data = json.loads(self.cookie_file.read_text())
+                self._saved = {k: v for k, v in data.items() if isinstance(v, list)}
+            except (OSError, ValueError, AttributeError):
+                self._saved = {}
+        return self._saved
+    
+    def _load_cookies(self) -> aiohttp.CookieJar:
+        from http.cookies import CookieError, SimpleCookie
+        from yarl import URL
         
-        # MAC randomization
-        if self.config.randomize_mac and self.recon.interface:
-            if StealthTools.randomize_mac(self.recon.interface):
-                self.logger.info("🎭 MAC address randomized")
+        # unsafe: portals are commonly addressed by IP
+        jar = aiohttp.CookieJar(unsafe=True)
+        for cookie in self._stored().get(self.network, []) if self.network else ():
+            try:
+                morsels = SimpleCookie()
+                morsels[cookie["name"]] = cookie["value"]
+                morsels[cookie["name"]].update(cookie["attrs"])
+                # No domain attribute: host-only for the host it came from
+                jar.update_cookies(morsels, URL.build(scheme="http", host=cookie["host"]))
+            except (KeyError, TypeError, ValueError, AttributeError, CookieError):
+                continue
+        return jar
+    
+    def save_cookies(self):
+        """Write the current network's jar into cookies.json"""
+        if self.cookie_jar is None or self.network is None:
+            return
+        jar = self.cookie_jar
+        live = {id(morsel) for morsel in jar}  # iterating drops expired cookies
+        host_only = getattr(jar, "_host_only_cookies", ())
+        cookies = []
+        # (domain, path) buckets: the only place the host of a host-only cookie is kept
+        for (host, path), bucket in jar._cookies.items():
+            for name, morsel in bucket.items():
+                if id(morsel) not in live:
+                    continue
+                # max-age is relative to when it was set: only absolute expiry survives a
+                # restart. A host-only cookie must come back without a domain attribute,
+                # or it would be sent to subdomains too.
+                skip = {"max-age"} | ({"domain"} if (host, path, name) in host_only else set())
+                cookies.append({
+                    "host": host,
+                    "name": morsel.key,
+                    "value": morsel.value,
+                    "attrs": {attr: value for attr, value in morsel.items() if value and attr not in skip},
+                })
+        stored = self._stored()
+        stored.pop(self.network, None)
+        if cookies:
+            stored[self.network] = cookies
+        while len(stored) > self.MAX_NETWORKS:
+            stored.pop(next(iter(stored)))
+        try:
+            tmp = self.cookie_file.with_suffix(".tmp")
+            tmp.unlink(missing_ok=True)
+            with open(tmp, "w", opener=lambda path, flags: os.open(path, flags, 0o600)) as f:
+                json.dump(stored, f)
+            tmp.replace(self.cookie_file)
+        except OSError as e:
+            self.logger.debug(f"Could not save cookie jar: {e}")
+    
+    async def session(self) -> aiohttp.ClientSession:
+        """The shared session (created on first use)"""
+        if self._session is None or self._session.closed:
+            if self.cookie_jar is None:
+                self.cookie_jar = self._load_cookies()
+            connector = aiohttp.TCPConnector(
+                limit=self.LIMIT,
+                limit_per_host=self.LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_TTL,
+                keepalive_timeout=self.KEEPALIVE
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=self.cookie_jar,
+                timeout=self.timeout()
+            )
+        return self._session
+    
+    def clear_dns_cache(self):
+        """Forget resolutions (after login, hijacked answers are stale)"""
+        if self._session is not None and not self._session.closed:
+            self._session.connector.clear_dns_cache()
+    
+    async def network_changed(self, network: Optional[str] = None):
+        """Drop pooled connections and DNS from the previous link, switch to network's jar"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if network != self.network:
+            self.save_cookies()
+            self.network = network
+            self.cookie_jar = None  # loaded for the new network with the next session
+    
+    async def close(self):
+        self.save_cookies()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+# ═══════════════════════════════════════════════════════════════════
+# NETWORK UTILITIES
+# ═══════════════════════════════════════════════════════════════════
+
+class NetworkTools:
+    """Network connectivity & captive portal detection"""
+    
+    PORTAL_ENDPOINTS = [
+        "http://clients3.google.com/generate_204",
+        "http://captive.apple.com/hotspot-detect.html",
+        "http://connectivitycheck.gstatic.com/generate_204",
+    ]
+    
+    INTERNET_ENDPOINTS = [
+        "http://clients3.google.com/generate_204",
+        "http://connectivitycheck.gstatic.com/generate_204",
+    ]
+    
+    ONLINE = "online"
+    PORTAL = "portal"
+    
+    @staticmethod
+    def default_gateway(interface: Optional[str] = None) -> Optional[str]:
+        """IPv4 default gateway from /proc/net/route (optionally for one interface)"""
+        try:
+            with open("/proc/net/route") as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 4 or fields[1] != "00000000" or not int(fields[3], 16) & 0x1:
+                        continue
+                    if interface is None or fields[0] == interface:
+                        return socket.inet_ntoa(struct.pack("<L", int(fields[2], 16)))
+        except (OSError, StopIteration, ValueError):
+            pass
+        return None
+    
+    @staticmethod
+    def gateway_mac(interface: Optional[str] = None) -> Optional[str]:
+        """MAC address of the default gateway from the ARP table"""
+        gateway = NetworkTools.default_gateway(interface)
+        if not gateway:
+            return None
+        try:
+            with open("/proc/net/arp") as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 4 and fields[0] == gateway and fields[3] != "00:00:00:00:00:00":
+                        return fields[3].lower()
+        except (OSError, StopIteration):
+            pass
+        return None
+    
+    @staticmethod
+    async def resolves(host: str, timeout: float = 2.0) -> bool:
+        """True if the resolver answers for host within timeout"""
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.getaddrinfo(host, 80, type=socket.SOCK_STREAM), timeout)
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
+    
+    @staticmethod
+    async def _probe_one(
+        session: aiohttp.ClientSession,
+        endpoint: str,
+        timeout: float
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """Probe one endpoint: (ONLINE, None), (PORTAL, url) or None if inconclusive"""
+        try:
+            async with session.get(endpoint, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=False) as resp:
+                if resp.status == 204:
+                    return NetworkTools.ONLINE, None
+                
+                if resp.status == 200:
+                    content = await resp.text()
+                    # Apple's probe answers 200 "Success" when online
+                    if "<TITLE>Success</TITLE>" in content:
+                        return NetworkTools.ONLINE, None
+                    if len(content) > 0:
+                        return NetworkTools.PORTAL, str(resp.url)
+                
+                if resp.status in [301, 302, 303, 307, 308]:
+                    return NetworkTools.PORTAL, resp.headers.get("Location")
+                
+                if resp.status == 511:
+                    return NetworkTools.PORTAL, str(resp.url)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+        
+        return None
+    
+    @staticmethod
+    async def probe(
+        session: aiohttp.ClientSession,
+        endpoints: List[str],
+        timeout: float = 5.0,
+        hedge_delay: float = 0.0
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Race connectivity probes, resolving on the first conclusive answer
+        
+        With hedge_delay=0 every endpoint fires at once. Otherwise the next
+        endpoint is launched only when the previous ones have been silent for
+        hedge_delay seconds (or have failed), which saves traffic when the
+        first endpoint is healthy. Losing probes are cancelled.
+        """
+        queue = list(endpoints)
+        pending = set()
+        
+        def launch():
+            pending.add(asyncio.create_task(NetworkTools._probe_one(session, queue.pop(0), timeout)))
+        
+        try:
+            while queue and (hedge_delay <= 0 or not pending):
+                launch()
+            
+            while pending:
+                wait_for = hedge_delay if queue and hedge_delay > 0 else None
+                done, _ = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    launch()  # hedge: the current probes are slow
+                    continue
+                
+                for task in done:
+                    pending.discard(task)
+                    result = task.result()
+                    if result:
+                        return result
+                
+                if queue and not pending:
+                    launch()  # inconclusive failure - try the next one now
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        return None
+    
+    @staticmethod
+    async def detect_captive_portal(
+        session: aiohttp.ClientSession,
+        endpoints: Optional[List[str]] = None,
+        timeout: float = 5.0,
+        hedge_delay: float = 0.0
+    ) -> Tuple[bool, Optional[str]]:
+        """Multi-method captive portal detection (concurrent probes)"""
+        with span("portal_detect"):
+            result = await NetworkTools.probe(
+                session, endpoints or NetworkTools.PORTAL_ENDPOINTS, timeout, hedge_delay
+            )
+        if result and result[0] == NetworkTools.PORTAL:
+            note("portal_url", result[1])
+            return True, result[1]
+        return False, None
+    
+    @staticmethod
+    async def check_internet(
+        session: aiohttp.ClientSession,
+        endpoints: Optional[List[str]] = None,
+        timeout: float = 5.0,
+        hedge_delay: float = 0.0
+    ) -> bool:
+        """Verify full internet connectivity (concurrent probes)"""
+        result = await NetworkTools.probe(
+            session, endpoints or NetworkTools.INTERNET_ENDPOINTS, timeout, hedge_delay
+        )
+        return bool(result and result[0] == NetworkTools.ONLINE)
+
+# ═══════════════════════════════════════════════════════════════════
+# CONNECTION MANAGER
+# ═══════════════════════════════════════════════════════════════════
+
+class ConnectionManager:
+    """
+    WiFi connection orchestration
+    
+    With one adapter candidates are tried one after another. With
+    several, the leading candidates are paired with distinct adapters
+    (assign_adapters) and associate concurrently; the best-ranked one
+    that comes up wins and the other adapters are released.
+    """
+    
+    def __init__(self, config: Config, recon: WiFiRecon, logger: logging.Logger):
+        self.config = config
+        self.recon = recon
+        self.logger = logger
+        self.state = ConnectionState.DISCONNECTED
+        self.current_network: Optional[WiFiNetwork] = None
+        self.last_scan: List[WiFiNetwork] = []
+        self.last_scan_time = 0.0  # loop.time() of last_scan
+        self.candidates: List[WiFiNetwork] = []  # ranked from last_scan
+        self._profiles: Optional[set] = None  # NetworkManager connection names
+        self._unlocked: set = set()  # our profiles known to carry no BSSID
+    
+    FAILOVER_ATTEMPTS = 3
+    PROFILE_PREFIX = "shadow-"
+    
+    @property
+    def interface(self) -> Optional[str]:
+        """Adapter carrying the current link (primary adapter if none)"""
+        if self.current_network and self.current_network.interface:
+            return self.current_network.interface
+        return self.recon.interface
+    
+    async def scan(self) -> List[WiFiNetwork]:
+        """Scan, remember the results and re-rank the failover candidates"""
+        networks = await self.recon.scan_networks_async()
+        if networks:
+            self.last_scan = networks
+            self.last_scan_time = asyncio.get_running_loop().time()
+            self.candidates = self.rank_candidates(networks)
+        return networks
+    
+    def rank_candidates(self, networks: List[WiFiNetwork]) -> List[WiFiNetwork]:
+        """Matching, strong-enough networks: the hysteresis pick first, then by signal"""
+        with span("match"):
+            matched = self.recon.find_matching_networks(networks, self.config.wifi_patterns)
+        best = self.recon.get_best_network(
+            matched,
+            self.current_network,
+            self.config.min_signal_strength,
+            self.config.signal_hysteresis
+        )
+        if not best:
+            return []
+        
+        ranked, seen = [best], {best.bssid}
+        for net in sorted(matched, key=self.recon.score, reverse=True):
+            if self.recon.signal(net) >= self.config.min_signal_strength and net.bssid not in seen:
+                seen.add(net.bssid)
+                ranked.append(net)
+        return ranked
+    
+    def candidates_age(self) -> Optional[float]:
+        """Seconds since the candidate list was refreshed (None before any scan)"""
+        if not self.last_scan_time:
+            return None
+        return asyncio.get_running_loop().time() - self.last_scan_time
+    
+    def warm_candidates(self, max_age: float) -> Optional[List[WiFiNetwork]]:
+        """The candidate list if it is younger than max_age seconds"""
+        age = self.candidates_age()
+        if self.candidates and age is not None and age <= max_age:
+            return list(self.candidates)
+        return None
+    
+    async def _run_nmcli(self, args: List[str], timeout: int = 15) -> Tuple[bool, str]:
+        """Execute nmcli command (non-blocking, cancellable)"""
+        try:
+            code, stdout, stderr = await run_command(["nmcli"] + args, timeout)
+            return code == 0, stdout if code == 0 else (stderr or stdout)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            return False, f"nmcli timed out after {timeout}s"
+        except Exception as e:
+            return False, str(e)
+    
+    async def _known_profiles(self) -> set:
+        """Names of NetworkManager connection profiles (listed once)"""
+        if self._profiles is None:
+            ok, output = await self._run_nmcli(["-t", "-f", "NAME", "con", "show"], timeout=5)
+            self._profiles = {split_terse(line)[0] for line in output.splitlines() if line} if ok else set()
+        return self._profiles
+    
+    async def _activate(self, network: WiFiNetwork) -> Tuple[bool, str]:
+        """
+        Bring the network up on exactly network.bssid
         
-        success, output = self._run_nmcli(
-            ["dev", "wifi", "connect", network.ssid],
-            timeout=self.config.connection_timeout
+        Each SSID gets one profile per adapter, named PROFILE_PREFIX +
+        SSID + "-" + interface: NetworkManager runs a profile on one
+        device at a time, and a batch may bring the same SSID up on
+        several radios at once. Once it exists, `con up ... ap <bssid>`
+        activates it pinned to the AP we ranked best, without
+        NetworkManager re-picking the AP or rescanning. The first connect
+        creates the profile with `dev wifi connect ... bssid <bssid> name
+        <profile>`, which also stores the BSSID in the profile; that lock
+        is cleared right away (see _unlock) so the pin only ever comes
+        from `ap`. nmcli's own --wait enforces connection_timeout; the
+        subprocess deadline backs it up.
+        """
+        interface = network.interface or self.recon.interface
+        name = f"{self.PROFILE_PREFIX}{network.ssid}" + (f"-{interface}" if interface else "")
+        wait = ["--wait", str(self.config.connection_timeout)]
+        iface = ["ifname", interface] if interface else []
+        deadline = self.config.connection_timeout + 5
+        
+        profiles = await self._known_profiles()
+        if name in profiles:
+            if name not in self._unlocked:
+                await self._unlock(name)  # may predate unlocking, or be edited by hand
+            success, output = await self._run_nmcli(
+                wait + ["con", "up", "id", name] + iface + ["ap", network.bssid], timeout=deadline
+            )
+            if success or "unknown connection" not in output.lower():
+                return success, output
+            profiles.discard(name)  # deleted behind our back
+        
+        success, output = await self._run_nmcli(
+            wait + ["dev", "wifi", "connect", network.ssid] + iface + ["bssid", network.bssid, "name", name],
+            timeout=deadline
         )
+        if success:
+            profiles.add(name)
+            await self._unlock(name)
+        return success, output
+    
+    async def _unlock(self, name: str):
+        """
+        Clear 802-11-wireless.bssid on one of our profiles
+        
+        A profile with a BSSID only activates on that AP, so a later
+        `con up ... ap <other>` would fail. Affects the next activation,
+        not the current link.
+        """
+        ok, _ = await self._run_nmcli(["con", "modify", name, "802-11-wireless.bssid", ""], timeout=5)
+        if ok:
+            self._unlocked.add(name)
+    
+    async def _attempt(self, network: WiFiNetwork) -> Tuple[bool, str]:
+        """Associate on network.interface; a failure goes to the outcome history"""
+        interface = network.interface or self.recon.interface
+        
+        # MAC randomization
+        if self.config.randomize_mac and interface:
+            if await asyncio.to_thread(StealthTools.randomize_mac, interface):
+                self.logger.info(f"🎭 MAC address randomized ({interface})")
+        
+        count("connect_attempts")
+        success, output = await self._activate(network)
+        if not success and self.recon.outcomes is not None:
+            self.recon.outcomes.add(network.ssid, network.bssid, False, strategy="connect_failed")
+        return success, output
+    
+    def _connected(self, network: WiFiNetwork):
+        note("connected", network.bssid)
+        self.current_network = network
+        self.state = ConnectionState.CONNECTED
+        where = f" on {network.interface}" if len(self.recon.interfaces) > 1 else ""
+        self.logger.info(f"✅ Connected to {network.ssid}{where}")
+    
+    async def connect_to_network(self, network: WiFiNetwork) -> bool:
+        """Connect to a specific network, pinned to its BSSID"""
+        self.logger.info(f"🔌 Connecting to: {network.ssid} [{network.bssid}] (Signal: {network.signal}%)")
+        
+        self.state = ConnectionState.CONNECTING
+        
+        note("ssid", network.ssid)
+        note("bssid", network.bssid)
+        note("signal", network.signal)
+        
+        with span("connect"):
+            success, output = await self._attempt(network)
         
         if success:
-            self.current_network = network
-            self.state = ConnectionState.CONNECTED
-            self.logger.info(f"✅ Connected to {network.ssid}")
+            self._connected(network)
             return True
         
         self.state = ConnectionState.FAILED
         self.logger.error(f"❌ Connection failed: {output}")
         return False
     
-    def auto_connect_best(self) -> bool:
-        """Scan and connect to best available network"""
+    def assign_adapters(self, candidates: List[WiFiNetwork]) -> List[WiFiNetwork]:
+        """
+        Pair the leading candidates with distinct adapters
+        
+        Each candidate, in rank order, gets the free adapter that heard it
+        strongest in the last scan. The batch stops at the first candidate
+        no free adapter can reach, so it is always a prefix of the ranking.
+        """
+        batch, used = [], set()
+        for net in candidates:
+            heard = self.recon.sightings.get(net.bssid) or {net.interface: net.signal}
+            free = [(signal, iface) for iface, signal in heard.items() if iface not in used]
+            if not free:
+                break
+            interface = max(free)[1]
+            used.add(interface)
+            batch.append(net._replace(interface=interface))
+        return batch
+    
+    async def _connect_batch(self, batch: List[WiFiNetwork]) -> Optional[WiFiNetwork]:
+        """Associate every batch member at once; the best-ranked success wins"""
+        for net in batch:
+            self.logger.info(
+                f"🔌 Connecting to: {net.ssid} [{net.bssid}] on {net.interface} (Signal: {net.signal}%)"
+            )
+        tasks = [asyncio.create_task(self._attempt(net)) for net in batch]
+        winner = None
+        try:
+            for net, task in zip(batch, tasks):
+                success, output = await task
+                if success:
+                    winner = net
+                    break
+                self.logger.error(f"❌ Connection failed on {net.interface}: {output}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # NetworkManager keeps activating after nmcli is killed: release the
+        # other adapters so they don't fight the winner for the default route
+        for net, task in zip(batch, tasks):
+            if net is not winner and (task.cancelled() or task.exception() or task.result()[0]):
+                await self._run_nmcli(["dev", "disconnect", net.interface], timeout=5)
+        return winner
+    
+    async def _connect_across_adapters(self, candidates: List[WiFiNetwork]) -> bool:
+        """Failover over several adapters, one concurrent batch at a time"""
+        self.state = ConnectionState.CONNECTING
+        pending = list(candidates)
+        
+        with span("connect"):
+            while pending:
+                batch = self.assign_adapters(pending)
+                pending = pending[len(batch):]
+                winner = await self._connect_batch(batch)
+                if winner:
+                    note("ssid", winner.ssid)
+                    note("bssid", winner.bssid)
+                    note("signal", winner.signal)
+                    note("interface", winner.interface)
+                    self._connected(winner)
+                    return True
+        
+        self.state = ConnectionState.FAILED
+        return False
+    
+    async def auto_connect_best(self, max_age: float = 0.0, demote: Tuple[str, ...] = ()) -> bool:
+        """
+        Connect to the best available network
+        
+        With max_age > 0 a warm candidate list (from background scans) no
+        older than that is used directly; otherwise we rescan. Candidates
+        are tried in rank order, BSSIDs in `demote` (e.g. the network that
+        just failed) last.
+        """
         self.state = ConnectionState.SCANNING
         
-        # Scan networks
-        all_networks = self.recon.scan_networks()
-        if not all_networks:
-            self.logger.error("❌ No networks found")
-            return False
+        candidates = self.warm_candidates(max_age) if max_age > 0 else None
+        if candidates is not None:
+            self.logger.info(f"⚡ Warm candidate list: {len(candidates)} networks, {self.candidates_age():.1f}s old")
+            note("candidates", "warm")
+        else:
+            # Scan networks
+            all_networks = await self.scan()
+            if not all_networks:
+                self.logger.error("❌ No networks found")
+                return False
+            
+            candidates = self.candidates
+            if not candidates:
+                self.logger.error(f"❌ No viable networks matching patterns: {self.config.wifi_patterns}")
+                self.logger.info(f"💡 Available networks: {[n.ssid for n in all_networks[:10]]}")
+                return False
+            note("candidates", "scan")
         
-        # Find matching networks
-        matched = self.recon.find_matching_networks(all_networks, self.config.wifi_patterns)
-        if not matched:
-            self.logger.error(f"❌ No networks matching patterns: {self.config.wifi_patterns}")
-            self.logger.info(f"💡 Available networks: {[n.ssid for n in all_networks[:10]]}")
-            return False
+        self.logger.info(f"📡 Found {len(candidates)} candidate networks:")
+        for net in candidates[:5]:
+            self.logger.info(f"  - {net.ssid} [{net.bssid}]: {net.signal}% signal")
         
-        self.logger.info(f"📡 Found {len(matched)} matching networks:")
-        for net in sorted(matched, key=lambda n: n.signal, reverse=True)[:5]:
-            self.logger.info(f"  - {net.ssid}: {net.signal}% signal")
+        if demote:
+            candidates = [n for n in candidates if n.bssid not in demote] + \
+                         [n for n in candidates if n.bssid in demote]
         
-        # Select best network
-        best = self.recon.get_best_network(
-            matched,
-            self.current_network,
-            self.config.min_signal_strength,
-            self.config.signal_hysteresis
-        )
+        candidates = candidates[:self.FAILOVER_ATTEMPTS]
+        if len(self.recon.interfaces) > 1:
+            return await self._connect_across_adapters(candidates)
         
-        if not best:
-            self.logger.error("❌ No viable networks (signal too weak)")
-            return False
+        # Connect, falling through to the next candidate on failure
+        for net in candidates:
+            if await self.connect_to_network(net):
+                return True
         
-        # Connect
-        return self.connect_to_network(best)
+        return False
     
-    def disconnect(self):
+    async def disconnect(self):
         """Disconnect from current network"""
-        if self.recon.interface:
-            self._run_nmcli(["dev", "disconnect", self.recon.interface])
+        if self.interface:
+            await self._run_nmcli(["dev", "disconnect", self.interface])
         self.state = ConnectionState.DISCONNECTED
         self.current_network = None
 
+# ═══════════════════════════════════════════════════════════════════
+# FORM SELECTOR CACHE
+# ═══════════════════════════════════════════════════════════════════
+
+class FormSelectorCache:
+    """
+    Persistent per-portal memory of which selectors worked
+    
+    Keyed by portal host + a fingerprint of the page's input/button
+    elements, so a redesigned portal is treated as unknown again.
+    """
+    
+    USERNAME_NAMES = ["username", "user", "email", "login", "uid"]
+    PASSWORD_NAMES = ["password", "pass", "pwd"]
+    
+    # One round-trip returns every candidate control on the page
+    COLLECT_JS = """
+        return Array.from(document.querySelectorAll('input, button')).map((el, i) => ({
+            tag: el.tagName.toLowerCase(),
+            type: (el.getAttribute('type') || '').toLowerCase(),
+            name: el.getAttribute('name') || '',
+            id: el.id || '',
+            index: i,
+            visible: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+        }));
+    """
+    
+    def __init__(self, cache_dir: Path):
+        self.path = cache_dir / "form_selectors.json"
+        try:
+            self._entries: Dict[str, dict] = json.loads(self.path.read_text())
+        except Exception:
+            self._entries = {}
+    
+    @staticmethod
+    def fingerprint(controls: List[dict]) -> str:
+        """Stable hash of the page's form controls"""
+        shape = sorted(f"{c['tag']}|{c['type']}|{c['name']}|{c['id']}" for c in controls)
+        return hashlib.sha1("\n".join(shape).encode()).hexdigest()[:16]
+    
+    def get(self, host: str, fingerprint: str) -> Optional[dict]:
+        return self._entries.get(f"{host}|{fingerprint}")
+    
+    def store(self, host: str, fingerprint: str, selectors: dict):
+        self._entries[f"{host}|{fingerprint}"] = {**selectors, "updated": datetime.now().isoformat()}
+        self._save()
+    
+    def forget(self, host: str, fingerprint: str):
+        if self._entries.pop(f"{host}|{fingerprint}", None) is not None:
+            self._save()
+    
+    def _save(self):
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._entries, indent=2))
+            tmp.replace(self.path)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _selector(control: dict) -> List[str]:
+        """Most specific selector for a collected control"""
+        if control["id"]:
+            return ["id", control["id"]]
+        if control["name"]:
+            return ["css selector", f"{control['tag']}[name='{control['name']}']"]
+        return ["xpath", f"(//input|//button)[{control['index'] + 1}]"]
+    
+    @classmethod
+    def discover(cls, controls: List[dict]) -> Optional[dict]:
+        """Pick username/password/submit selectors from collected controls"""
+        visible = [c for c in controls if c["visible"] and c["type"] != "hidden"] or controls
+        
+        def by_names(names, candidates):
+            for name in names:
+                for c in candidates:
+                    if name in (c["name"].lower(), c["id"].lower()):
+                        return c
+            return None
+        
+        password = next((c for c in visible if c["type"] == "password"), None)
+        password = password or by_names(cls.PASSWORD_NAMES, visible)
+        
+        text_inputs = [c for c in visible if c["tag"] == "input" and c["type"] in ("", "text", "email", "tel")]
+        user = by_names(cls.USERNAME_NAMES, text_inputs) or (text_inputs[0] if text_inputs else None)
+        
+        submit = (
+            next((c for c in visible if c["type"] == "submit"), None)
+            or by_names(["submit", "login"], [c for c in visible if c["tag"] == "button" or c["type"] == "button"])
+            or next((c for c in visible if c["tag"] == "button"), None)
+        )
+        
+        if not user or not password or not submit:
+            return None
+        
+        return {
+            "username": cls._selector(user),
+            "password": cls._selector(password),
+            "submit": cls._selector(submit),
+        }
+
+# ═══════════════════════════════════════════════════════════════════
+# HTML LOGIN FORM EXTRACTION
+# ═══════════════════════════════════════════════════════════════════
+
+class _FormCollector(HTMLParser):
+    """Collect every <form> with its controls (stdlib html.parser)"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms: List[dict] = []
+        self._form: Optional[dict] = None
+        self._orphans: List[dict] = []  # controls outside any <form>
+        self._select: Optional[dict] = None
+        self._textarea: Optional[dict] = None
+    
+    def _add(self, control: dict):
+        (self._form["controls"] if self._form is not None else self._orphans).append(control)
+    
+    def handle_starttag(self, tag, attrs):
+        a = {k: (v or "") for k, v in attrs}
+        if tag == "form":
+            self._form = {"action": a.get("action", ""), "method": a.get("method", "get").lower(), "controls": []}
+            self.forms.append(self._form)
+        elif tag in ("input", "button"):
+            default_type = "submit" if tag == "button" else "text"
+            self._add({
+                "tag": tag,
+                "type": (a.get("type") or default_type).lower(),
+                "name": a.get("name", ""),
+                "id": a.get("id", ""),
+                "value": a.get("value", ""),
+                "checked": "checked" in a,
+            })
+        elif tag == "select":
+            self._select = {"tag": "select", "type": "select", "name": a.get("name", ""),
+                            "id": a.get("id", ""), "value": None, "checked": False}
+            self._add(self._select)
+        elif tag == "option" and self._select is not None:
+            if self._select["value"] is None or "selected" in a:
+                self._select["value"] = a.get("value", "")
+        elif tag == "textarea":
+            self._textarea = {"tag": "textarea", "type": "textarea", "name": a.get("name", ""),
+                              "id": a.get("id", ""), "value": "", "checked": False}
+            self._add(self._textarea)
+    
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "select":
+            self._select = None
+        elif tag == "textarea":
+            self._textarea = None
+    
+    def handle_data(self, data):
+        if self._textarea is not None:
+            self._textarea["value"] += data
+    
+    def close(self):
+        super().close()
+        # Formless pages: treat stray controls as one implicit form
+        if self._orphans:
+            self.forms.append({"action": "", "method": "post", "controls": self._orphans})
+
+@dataclass
+class LoginForm:
+    """A portal login form ready to submit"""
+    action: str
+    method: str
+    username_field: str
+    password_field: str
+    fields: Dict[str, str]  # hidden inputs, CSRF tokens, defaults, submit button
+    
+    @staticmethod
+    def extract(html: str, page_url: str) -> Optional["LoginForm"]:
+        """Locate the login form in a page and resolve its action URL"""
+        collector = _FormCollector()
+        try:
+            collector.feed(html)
+            collector.close()
+        except Exception:
+            return None
+        
+        user_names = FormSelectorCache.USERNAME_NAMES
+        
+        def user_rank(control) -> int:
+            name = control["name"].lower()
+            for i, candidate in enumerate(user_names):
+                if candidate in name:
+                    return i
+            return len(user_names)
+        
+        for form in collector.forms:
+            controls = [c for c in form["controls"] if c["name"]]
+            password = next((c for c in controls if c["type"] == "password"), None)
+            if not password:
+                continue
+            
+            text_inputs = [c for c in controls if c["tag"] == "input" and c["type"] in ("text", "email", "tel")]
+            if not text_inputs:
+                continue
+            user = min(text_inputs, key=user_rank)
+            
+            fields: Dict[str, str] = {}
+            submit_added = False
+            for c in controls:
+                if c is user or c is password:
+                    continue
+                if c["type"] in ("checkbox", "radio"):
+                    if c["checked"]:
+                        fields[c["name"]] = c["value"] or "on"
+                elif c["type"] in ("submit", "image"):
+                    # Only the first submit button is "clicked"
+                    if not submit_added:
+                        fields[c["name"]] = c["value"]
+                        submit_added = True
+                elif c["type"] not in ("button", "reset", "file"):
+                    fields[c["name"]] = c["value"] or ""
+            
+            return LoginForm(
+                action=urljoin(page_url, form["action"]),
+                method="post" if form["method"] == "post" else "get",
+                username_field=user["name"],
+                password_field=password["name"],
+                fields=fields,
+            )
+        
+        return None
+    
+    def payload(self, username: str, password: str) -> Dict[str, str]:
+        return {**self.fields, self.username_field: username, self.password_field: password}
+
+# ═══════════════════════════════════════════════════════════════════
+# PORTAL SESSION CACHE
+# ═══════════════════════════════════════════════════════════════════
+
+class AuthCache:
+    """
+    Portal logins per network, keyed by SSID + gateway MAC + portal host
+    
+    A hit is only a hint that callers confirm with one fast probe. When a
+    session is found expired and the last time it still worked is known,
+    that span is recorded; the median of recent spans becomes the
+    portal's learned lifetime (one early cutoff doesn't drag it down),
+    used both to expire hits and to re-authenticate just before the
+    portal would cut us off. Persisted to cache_dir/auth_cache.json.
+    """
+    
+    DEFAULT_TTL = 4 * 3600  # until a lifetime has been observed
+    MAX_OBSERVATIONS = 5
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        try:
+            data = json.loads(path.read_text())
+            self._entries = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, ValueError, AttributeError):
+            pass
+    
+    @staticmethod
+    def network(ssid: Optional[str], gateway_mac: Optional[str]) -> str:
+        """Identity of a network, without the portal"""
+        return f"{ssid or '?'}|{gateway_mac or '?'}"
+    
+    @staticmethod
+    def key(network: str, portal_url: str) -> str:
+        host = urlparse(portal_url).hostname or portal_url
+        return f"{network}|{host}"
+    
+    def lifetime(self, key: str) -> Optional[float]:
+        """Learned session lifetime in seconds (None until one was observed)"""
+        observed = sorted(self._entries.get(key, {}).get("observed") or ())
+        return observed[(len(observed) - 1) // 2] if observed else None
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """The entry if its session should still be alive"""
+        entry = self._entries.get(key)
+        if not entry or not entry.get("authenticated_at"):
+            return None
+        ttl = self.lifetime(key) or self.DEFAULT_TTL
+        return entry if time.time() - entry["authenticated_at"] < ttl else None
+    
+    def expires_at(self, key: str) -> Optional[float]:
+        """When the current session is expected to end (learned lifetimes only)"""
+        entry = self._entries.get(key)
+        lifetime = self.lifetime(key)
+        if not entry or not entry.get("authenticated_at") or lifetime is None:
+            return None
+        return entry["authenticated_at"] + lifetime
+    
+    def portal_url(self, key: str) -> Optional[str]:
+        return self._entries.get(key, {}).get("portal_url")
+    
+    def store(self, key: str, portal_url: str):
+        entry = self._entries.setdefault(key, {})
+        entry["authenticated_at"] = time.time()
+        entry["portal_url"] = portal_url
+        self.save()
+    
+    def expired(self, key: str, alive_until: Optional[float] = None):
+        """
+        Record that the session is gone
+        
+        alive_until is the last time it was known to work. Only then is
+        the span since login recorded: it is a lower bound on the real
+        lifetime, as tight as the caller's probe interval. Without it
+        (e.g. a stale cache hit found hours later) the entry is just
+        invalidated, since "now" says nothing about when it ended.
+        """
+        entry = self._entries.get(key)
+        if not entry or not entry.get("authenticated_at"):
+            return
+        if alive_until is not None and alive_until > entry["authenticated_at"]:
+            observed = round(alive_until - entry["authenticated_at"])
+            entry["observed"] = (entry.get("observed", []) + [observed])[-self.MAX_OBSERVATIONS:]
+        entry["authenticated_at"] = None
+        self.save()
+    
+    def save(self):
+        try:
+            self.path.write_text(json.dumps(self._entries))
+        except OSError:
+            pass
+
 # ═══════════════════════════════════════════════════════════════════
 # CAPTIVE PORTAL AUTHENTICATOR
 # ═══════════════════════════════════════════════════════════════════
@@ -688,94 +2331,155 @@ class ConnectionManager:
 class PortalAuthenticator:
     """Automated captive portal bypass with multiple strategies"""
     
-    def __init__(self, config: Config, logger: logging.Logger):
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger,
+        browser_pool: Optional[BrowserPool] = None,
+        http: Optional[HTTPSessionFactory] = None
+    ):
         self.config = config
         self.logger = logger
-        self.cache_file = config.cache_dir / "auth_cache.json"
-    
-    def _is_cached(self) -> bool:
-        """Check authentication cache"""
-        try:
-            if not self.cache_file.exists():
-                return False
-            
-            cache = json.loads(self.cache_file.read_text())
-            last_auth = datetime.fromisoformat(cache.get("timestamp", ""))
-            
-            # Cache valid for 4 hours
-            return datetime.now() - last_auth < timedelta(hours=4)
-        except Exception as e:
-            self.logger.debug(f"Cache check failed: {e}")
-            return False
+        self.http = http or HTTPSessionFactory(config, logger)
+        self.auth_cache = AuthCache(config.cache_dir / "auth_cache.json")
+        self._cache_key: Optional[str] = None
+        self._portal_url: Optional[str] = None
+        self.browser_pool = browser_pool or BrowserPool(logger, config.browser_max_uses, config.portal_timeout)
+        self.form_cache = FormSelectorCache(config.cache_dir)
     
     def _cache_auth(self):
-        """Cache successful authentication"""
-        try:
-            cache = {"timestamp": datetime.now().isoformat()}
-            self.cache_file.write_text(json.dumps(cache))
+        """Remember the login for the network being authenticated"""
+        if self._cache_key:
+            self.auth_cache.store(self._cache_key, self._portal_url)
             self.logger.debug("✅ Authentication cached")
-        except Exception as e:
-            self.logger.warning(f"Failed to cache authentication: {e}")
+    
+    async def _probe_online(self) -> bool:
+        """One fast connectivity probe"""
+        return await NetworkTools.check_internet(
+            await self.http.session(), self.config.probe_endpoints, min(self.config.probe_timeout, 2.0),
+            self.config.probe_hedge_delay
+        )
+    
+    SUCCESS_INDICATORS = [
+        "success", "logged in", "welcome", "authenticated",
+        "dashboard", "logout", "access granted"
+    ]
     
     async def authenticate_via_http(self, portal_url: str, username: str, password: str) -> bool:
-        """HTTP-based fallback authentication (no Selenium required)"""
-        self.logger.info("🔄 Attempting HTTP-based authentication (Selenium unavailable)...")
+        """
+        Browser-free authentication: read the portal's login form and submit it once
+        
+        The form's action URL, method, hidden inputs (CSRF tokens etc.) and
+        real field names come from the page itself. Only when no login form
+        can be found do we fall back to guessing common field names.
+        """
+        self.logger.info("🔄 Attempting HTTP form authentication...")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # Common field names to try
-                field_combinations = [
-                    {"user": "username", "pass": "password"},
-                    {"user": "user", "pass": "password"},
-                    {"user": "email", "pass": "password"},
-                    {"user": "login", "pass": "pass"},
-                ]
-                
-                for fields in field_combinations:
-                    try:
-                        # Prepare form data
-                        form_data = {
-                            fields["user"]: username,
-                            fields["pass"]: password,
-                        }
-                        
-                        self.logger.debug(f"Trying HTTP fields: {fields}")
-                        
-                        async with session.post(
-                            portal_url,
-                            data=form_data,
-                            timeout=aiohttp.ClientTimeout(total=10),
-                            allow_redirects=True
-                        ) as resp:
-                            response_text = await resp.text()
-                            
-                            # Check for success indicators
-                            success_indicators = [
-                                "success", "logged in", "welcome", "authenticated",
-                                "dashboard", "logout", "access granted", "redirect"
-                            ]
-                            
-                            if any(ind in response_text.lower() for ind in success_indicators):
-                                self.logger.info(f"✅ HTTP authentication successful with fields: {fields}")
-                                self._cache_auth()
-                                return True
-                            
-                            # Check for redirect (sign of successful auth)
-                            if resp.status in [200, 301, 302, 303, 307, 308]:
-                                self.logger.debug(f"Response status {resp.status} - might indicate success")
-                    
-                    except Exception as e:
-                        self.logger.debug(f"HTTP attempt with fields {fields} failed: {e}")
-                        continue
+            session = await self.http.session()
+            timeout = self.http.timeout()
+            
+            async with session.get(portal_url, timeout=timeout, allow_redirects=True) as resp:
+                page = await resp.text(errors="replace")
+                page_url = str(resp.url)
+            
+            form = LoginForm.extract(page, page_url)
+            if not form:
+                self.logger.debug("No login form in portal HTML - guessing field names")
+                return await self._authenticate_via_field_guessing(session, portal_url, username, password)
+            
+            payload = form.payload(username, password)
+            self.logger.debug(f"Submitting login form: {form.method.upper()} {form.action} fields={list(payload)}")
+            
+            if form.method == "post":
+                request = session.post(form.action, data=payload, timeout=timeout, allow_redirects=True)
+            else:
+                request = session.get(form.action, params=payload, timeout=timeout, allow_redirects=True)
+            
+            async with request as resp:
+                status = resp.status
+                response_text = await resp.text(errors="replace")
+            
+            if await self._login_accepted(status, response_text):
+                note("strategy", "http_form")
+                self.logger.info("✅ HTTP form authentication successful")
+                self._cache_auth()
+                return True
+            
+            self.logger.debug(f"Form submission returned {status} but we're not online")
         
         except Exception as e:
             self.logger.error(f"HTTP authentication failed: {e}")
         
         return False
     
+    async def _login_accepted(self, status: int, page: str) -> bool:
+        """
+        The login form is gone and a connectivity probe gets through
+        
+        Page text proves nothing: a rejected login often re-renders the
+        form with "Welcome" or "Login unsuccessful" on it, and a page
+        without a password field may be a JS-rendered login, an error
+        page or an interstitial.
+        """
+        if status >= 400:
+            return False
+        if re.search(r"type\s*=\s*[\"']?password", page, re.IGNORECASE):
+            return False  # the form came back: rejected
+        return await self._probe_online()
+    
+    async def _authenticate_via_field_guessing(
+        self,
+        session: aiohttp.ClientSession,
+        portal_url: str,
+        username: str,
+        password: str
+    ) -> bool:
+        """Blind POSTs with common field names (portals without a parseable form)"""
+        # Common field names to try
+        field_combinations = [
+            {"user": "username", "pass": "password"},
+            {"user": "user", "pass": "password"},
+            {"user": "email", "pass": "password"},
+            {"user": "login", "pass": "pass"},
+        ]
+        
+        for fields in field_combinations:
+            try:
+                # Prepare form data
+                form_data = {
+                    fields["user"]: username,
+                    fields["pass"]: password,
+                }
+                
+                self.logger.debug(f"Trying HTTP fields: {fields}")
+                
+                async with session.post(
+                    portal_url,
+                    data=form_data,
+                    timeout=self.http.timeout(10),
+                    allow_redirects=True
+                ) as resp:
+                    status = resp.status
+                    response_text = await resp.text(errors="replace")
+                
+                if await self._login_accepted(status, response_text):
+                    note("strategy", "http_guess")
+                    self.logger.info(f"✅ HTTP authentication successful with fields: {fields}")
+                    self._cache_auth()
+                    return True
+            
+            except Exception as e:
+                self.logger.debug(f"HTTP attempt with fields {fields} failed: {e}")
+                continue
+        
+        return False
+    
     def _find_form_field(self, driver, field_names: List[str], wait_time: int = 5):
         """Find form field with multiple selector strategies"""
-        wait = WebDriverWait(driver, wait_time)
+        sel = selenium_api()
+        By = sel.By
+        wait = sel.WebDriverWait(driver, wait_time)
         
         # Try different selector methods
         selectors_to_try = [
@@ -791,137 +2495,207 @@ class PortalAuthenticator:
             for selector_func in selectors_to_try:
                 try:
                     selector = selector_func(field_name)
-                    element = wait.until(EC.presence_of_element_located(selector))
+                    element = wait.until(sel.EC.presence_of_element_located(selector))
                     self.logger.debug(f"✅ Found field '{field_name}' using {selector}")
                     return element
                 except Exception:
                     continue
         
-        raise TimeoutException(f"Could not find form field with any of these names: {field_names}")
+        raise sel.TimeoutException(f"Could not find form field with any of these names: {field_names}")
+    
+    def _locate_form(self, driver):
+        """
+        Find username, password and submit elements
+        
+        Known portals (host + form fingerprint) use their cached selectors
+        in a single lookup. Unknown portals are resolved from one DOM query
+        that returns every candidate control at once; the serial
+        _find_form_field brute force is only the last resort.
+        
+        Returns (username, password, submit, learned) where learned is the
+        (host, fingerprint, selectors) to cache once login succeeds.
+        """
+        sel = selenium_api()
+        By = sel.By
+        
+        # One wait for the form to render, instead of one per guess
+        sel.WebDriverWait(driver, 10).until(sel.EC.presence_of_element_located((By.CSS_SELECTOR, "input")))
+        
+        controls = driver.execute_script(FormSelectorCache.COLLECT_JS) or []
+        host = urlparse(driver.current_url).hostname or ""
+        fingerprint = FormSelectorCache.fingerprint(controls)
+        
+        cached = self.form_cache.get(host, fingerprint)
+        if cached:
+            try:
+                elements = [driver.find_element(*cached[key]) for key in ("username", "password", "submit")]
+                self.logger.debug(f"⚡ Using cached form selectors for {host}")
+                return (*elements, None)
+            except Exception:
+                self.logger.debug(f"Cached selectors for {host} are stale")
+                self.form_cache.forget(host, fingerprint)
+        
+        selectors = FormSelectorCache.discover(controls)
+        if selectors:
+            try:
+                elements = [driver.find_element(*selectors[key]) for key in ("username", "password", "submit")]
+                return (*elements, (host, fingerprint, selectors))
+            except Exception as e:
+                self.logger.debug(f"Discovered selectors failed: {e}")
+        
+        # Last resort: serial selector brute force
+        username_field = self._find_form_field(driver, FormSelectorCache.USERNAME_NAMES, wait_time=2)
+        password_field = self._find_form_field(driver, FormSelectorCache.PASSWORD_NAMES, wait_time=2)
+        try:
+            submit_btn = driver.find_element(By.NAME, "submit")
+        except Exception:
+            submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit'], input[type='submit']")
+        return username_field, password_field, submit_btn, None
+    
+    @staticmethod
+    def _open_portal(driver, portal_url: str):
+        """Hide webdriver fingerprints and load the portal (browser thread)"""
+        try:
+            driver.execute_script("""
+                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+                window.navigator.chrome = {runtime: {}};
+            """)
+        except Exception:
+            pass
+        driver.get(portal_url)
+    
+    @staticmethod
+    def _submit_form(username_field, password_field, submit_btn, username: str, password: str):
+        """Fill the credentials and click submit (browser thread)"""
+        username_field.clear()
+        username_field.send_keys(username)
+        password_field.clear()
+        password_field.send_keys(password)
+        submit_btn.click()
+    
+    @classmethod
+    def _submitted(cls, driver, form_url: str) -> bool:
+        """Has the portal reacted to the submit? (browser thread)"""
+        if driver.current_url != form_url:
+            return True
+        page = driver.page_source.lower()
+        return any(ind in page for ind in cls.SUCCESS_INDICATORS)
+    
+    async def _wait_until_online(self, interval: float = 1.0) -> bool:
+        """Poll connectivity until the network is online (runs until cancelled)"""
+        timeout = min(self.config.probe_timeout, 3.0)
+        session = await self.http.session()
+        while True:
+            if await NetworkTools.check_internet(
+                session, self.config.probe_endpoints, timeout, self.config.probe_hedge_delay
+            ):
+                return True
+            await asyncio.sleep(interval)
     
     async def authenticate_via_selenium(self, portal_url: str, username: str, password: str) -> bool:
-        """Selenium-based authentication with robust error handling"""
+        """
+        Selenium-based authentication, raced against a connectivity poll
         
-        # Check driver availability first
-        available_drivers = WebDriverManager.get_available_drivers(self.logger)
-        if not available_drivers:
-            self.logger.warning("❌ No webdrivers available (Chrome/Firefox)")
-            return False
+        Some portals grant access as soon as the form is submitted (or the
+        page is merely loaded) while the browser is still busy rendering.
+        The poll ends the flow as soon as the network is online instead of
+        waiting for the browser to finish.
+        """
+        browser = asyncio.create_task(self._selenium_attempts(portal_url, username, password))
+        online = asyncio.create_task(self._wait_until_online())
+        
+        try:
+            done, _ = await asyncio.wait({browser, online}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            online.cancel()
+            await asyncio.gather(online, return_exceptions=True)
+            if not browser.done():
+                # Don't wait for the browser call in flight; the pool reaps it
+                browser.cancel()
+                self.browser_pool.detach(browser)
+        
+        if browser in done and not browser.cancelled():
+            return browser.result()
+        
+        self._cache_auth()
+        note("strategy", "connectivity")
+        self.logger.info("✅ Network is online - portal authentication complete")
+        return True
+    
+    async def _selenium_attempts(self, portal_url: str, username: str, password: str) -> bool:
+        """Selenium login attempts; every driver call runs on the browser thread"""
         
+        run = self.browser_pool.run
+        sel = await run(selenium_api)  # off the event loop (usually already loaded by prewarm)
         driver = None
         
         for attempt in range(1, self.config.max_retries + 1):
+            healthy = True
             try:
                 self.logger.info(f"🌐 Selenium auth attempt {attempt}/{self.config.max_retries}")
+                if attempt > 1:
+                    count("auth_retries")
                 
-                # Try available drivers
-                for driver_name in available_drivers:
-                    try:
-                        if driver_name == "chrome":
-                            self.logger.debug("Initializing Chrome webdriver...")
-                            options = StealthTools.get_stealth_chrome_options()
-                            driver = webdriver.Chrome(options=options)
-                            self.logger.info("✅ Chrome webdriver initialized")
-                            break
-                        elif driver_name == "firefox":
-                            self.logger.debug("Initializing Firefox webdriver...")
-                            options = StealthTools.get_stealth_firefox_options()
-                            driver = webdriver.Firefox(options=options)
-                            self.logger.info("✅ Firefox webdriver initialized")
-                            break
-                    except Exception as e:
-                        self.logger.error(f"Failed to initialize {driver_name}: {e}")
-                        continue
+                # Warm pooled browser (prelaunched while we were connecting)
+                driver = await self.browser_pool.acquire()
                 
                 if not driver:
                     self.logger.error("❌ Failed to initialize any webdriver")
                     return False
                 
-                driver.set_page_load_timeout(self.config.portal_timeout)
-                
-                # Anti-detection
-                try:
-                    driver.execute_script("""
-                        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                        window.navigator.chrome = {runtime: {}};
-                    """)
-                except Exception as e:
-                    self.logger.debug(f"Anti-detection script failed: {e}")
-                
                 self.logger.info(f"🌐 Navigating to portal: {portal_url}")
-                driver.get(portal_url)
+                with span("page_load"):
+                    await run(self._open_portal, driver, portal_url)
                 
-                # Wait and find form fields with multiple strategies
+                # Locate the form (cached selectors, one DOM query, or brute force)
                 self.logger.debug("Searching for login form fields...")
-                username_field = self._find_form_field(
-                    driver,
-                    ["username", "user", "email", "login", "uid"],
-                    wait_time=10
-                )
-                
-                password_field = self._find_form_field(
-                    driver,
-                    ["password", "pass", "pwd"],
-                    wait_time=5
-                )
-                
-                # Try to find submit button
-                submit_btn = None
-                try:
-                    wait = WebDriverWait(driver, 5)
-                    submit_btn = wait.until(
-                        EC.presence_of_element_located((By.NAME, "submit"))
-                    )
-                except Exception:
-                    try:
-                        submit_btn = driver.find_element(By.XPATH, "//button[@type='submit']")
-                    except Exception:
-                        submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
+                with span("form_locate"):
+                    username_field, password_field, submit_btn, learned = await run(self._locate_form, driver)
                 
                 self.logger.debug("✅ Form fields found")
                 
                 # Fill and submit
                 self.logger.debug(f"Submitting credentials for username: {username}")
-                username_field.clear()
-                username_field.send_keys(username)
-                password_field.clear()
-                password_field.send_keys(password)
-                submit_btn.click()
+                form_url = await run(getattr, driver, "current_url")
+                with span("form_fill"):
+                    await run(self._submit_form, username_field, password_field, submit_btn, username, password)
                 
-                # Wait for result
-                await asyncio.sleep(5)
+                # Wait for the portal to react (navigation or a success page)
+                with span("submit_wait"):
+                    await wait_until(
+                        lambda: run(self._submitted, driver, form_url),
+                        min(self.config.portal_timeout, 10), initial=0.1
+                    )
                 
                 # Check success
-                page_source = driver.page_source.lower()
-                success_indicators = [
-                    "success", "logged in", "welcome", "authenticated",
-                    "dashboard", "logout", "access granted"
-                ]
+                page_source = (await run(getattr, driver, "page_source")).lower()
                 
-                if any(ind in page_source for ind in success_indicators):
+                if any(ind in page_source for ind in self.SUCCESS_INDICATORS) and await self._probe_online():
                     self._cache_auth()
+                    if learned:
+                        self.form_cache.store(*learned)
+                    note("strategy", "selenium")
                     self.logger.info("✅ Portal authentication successful (Selenium)")
                     return True
                 
                 self.logger.debug(f"Auth not successful - page source snippet: {page_source[:200]}")
                 
-            except TimeoutException as e:
+            except sel.TimeoutException as e:
                 self.logger.error(f"Timeout (attempt {attempt}/{self.config.max_retries}): Form elements not found - {e}")
                 self.logger.debug("This usually means the portal HTML structure doesn't match expected selectors")
                 
-            except WebDriverException as e:
+            except sel.WebDriverException as e:
+                healthy = False
                 self.logger.error(f"Webdriver error (attempt {attempt}/{self.config.max_retries}): {e}")
                 
             except Exception as e:
+                healthy = False
                 self.logger.error(f"Unexpected error (attempt {attempt}/{self.config.max_retries}): {type(e).__name__}: {e}")
             
             finally:
-                if driver:
-                    try:
-                        driver.quit()
-                    except Exception as e:
-                        self.logger.debug(f"Error closing webdriver: {e}")
-                    driver = None
+                # Reset for the next attempt, or recycle if it crashed
+                await self.browser_pool.release(driver, healthy)
+                driver = None
             
             if attempt < self.config.max_retries:
                 delay = self.config.retry_delay * (2 ** (attempt - 1))
@@ -930,22 +2704,50 @@ class PortalAuthenticator:
         
         return False
     
-    async def authenticate(self, portal_url: str, username: str, password: str) -> bool:
-        """Main authentication method with fallback strategy"""
+    async def authenticate(
+        self,
+        portal_url: str,
+        username: str,
+        password: str,
+        cache_key: Optional[str] = None,
+        force: bool = False
+    ) -> bool:
+        """
+        Main authentication method with fallback strategy
+        
+        cache_key identifies the network (AuthCache.key). A cached session
+        is trusted only after one fast probe confirms we're online; a hit
+        that fails the probe just invalidates the entry (when it expired is
+        unknown, so nothing is learned). force skips the cache (proactive
+        re-login).
+        """
+        self._cache_key = cache_key
+        self._portal_url = portal_url
+        
+        if cache_key and not force and self.auth_cache.get(cache_key):
+            if await self._probe_online():
+                note("strategy", "cache")
+                self.logger.info("✅ Using cached authentication (verified)")
+                return True
+            self.logger.info("⌛ Cached portal session has expired")
+            self.auth_cache.expired(cache_key)
         
-        if self._is_cached():
-            self.logger.info("✅ Using cached authentication")
+        # A login is needed: warm the browser up in case the HTTP path fails
+        self.browser_pool.prewarm()
+        
+        # Browser-free form submission first (fast path)
+        with span("auth_http"):
+            ok = await self.authenticate_via_http(portal_url, username, password)
+        if ok:
             return True
         
-        # Try Selenium first if available
+        # Fallback to Selenium for JavaScript-driven portals
         if SELENIUM_AVAILABLE:
-            result = await self.authenticate_via_selenium(portal_url, username, password)
-            if result:
-                return True
+            self.logger.info("🔄 HTTP form login failed - trying Selenium fallback...")
+            with span("auth_selenium"):
+                return await self.authenticate_via_selenium(portal_url, username, password)
         
-        # Fallback to HTTP-based authentication
-        self.logger.info("🔄 Selenium failed or unavailable - trying HTTP fallback...")
-        return await self.authenticate_via_http(portal_url, username, password)
+        return False
 
 # ═══════════════════════════════════════════════════════════════════
 # MAIN ORCHESTRATOR
@@ -957,10 +2759,19 @@ class ShadowWiFiArsenal:
     def __init__(self, config: Config):
         self.config = config
         self.logger = self._setup_logging()
-        self.credentials = SecureCredentials()
-        self.recon = WiFiRecon(self.logger, debug=config.debug_mode)
+        self.signal_history = SignalHistory(config.cache_dir / "signal_history.json")
+        self.outcomes = OutcomeStore(config.cache_dir / "outcomes.db")
+        self.recon = WiFiRecon(
+            self.logger,
+            debug=config.debug_mode,
+            signal_history=self.signal_history,
+            outcomes=self.outcomes
+        )
         self.connection_mgr = ConnectionManager(config, self.recon, self.logger)
-        self.authenticator = PortalAuthenticator(config, self.logger)
+        self.browser_pool = BrowserPool(self.logger, config.browser_max_uses, config.portal_timeout)
+        self.http = HTTPSessionFactory(config, self.logger)
+        self.authenticator = PortalAuthenticator(config, self.logger, self.browser_pool, self.http)
+        self.auth_key: Optional[str] = None  # AuthCache key of the last login
     
     def _setup_logging(self) -> logging.Logger:
         """Configure logging"""
@@ -987,47 +2798,345 @@ class ShadowWiFiArsenal:
         
         return logger
     
+    async def _check_internet(self) -> bool:
+        return await NetworkTools.check_internet(
+            await self.http.session(),
+            self.config.probe_endpoints,
+            self.config.probe_timeout,
+            self.config.probe_hedge_delay
+        )
+    
+    async def _detect_captive_portal(self) -> Tuple[bool, Optional[str]]:
+        return await NetworkTools.detect_captive_portal(
+            await self.http.session(),
+            self.config.probe_endpoints,
+            self.config.probe_timeout,
+            self.config.probe_hedge_delay
+        )
+    
+    async def _link_ready(self) -> bool:
+        """Default route up on our interface and DNS answering"""
+        if not NetworkTools.default_gateway(self.connection_mgr.interface):
+            return False
+        endpoints = self.config.probe_endpoints or NetworkTools.PORTAL_ENDPOINTS
+        host = urlparse(endpoints[0]).hostname
+        return not host or await NetworkTools.resolves(host)
+    
     async def execute(self) -> bool:
         """Main execution flow"""
-        async with aiohttp.ClientSession() as session:
-            # Check current connectivity
-            if await NetworkTools.check_internet(session):
+        try:
+            return await self.run_once()
+        finally:
+            await self.http.close()
+            await self.browser_pool.close()
+    
+    async def run_once(
+        self,
+        max_age: float = 0.0,
+        demote: Tuple[str, ...] = (),
+        precheck: bool = True
+    ) -> bool:
+        """One connect/authenticate pass, recorded to cache_dir/runs.jsonl"""
+        with RunRecorder() as run:
+            success = False
+            try:
+                success = await self._execute(max_age, demote, precheck)
+                return success
+            finally:
+                run.save(self.config.cache_dir, success)
+                self._record_outcome(run, success)
+                await asyncio.to_thread(self._persist_history)
+                self.logger.info(f"⏱️  Phases: {run.summary()}")
+    
+    def _record_outcome(self, run: RunRecorder, success: bool):
+        """Queue the outcome of the network this run ended on"""
+        network = self.connection_mgr.current_network
+        if network is None or run.attrs.get("connected") != network.bssid:
+            return  # never connected this run (e.g. already online)
+        phases = run.phases
+        tti = sum(phases.get(name, 0.0) for name in ("connect", "stabilize", "portal_detect", "auth", "verify"))
+        self.outcomes.add(
+            network.ssid,
+            network.bssid,
+            success,
+            connect_s=phases.get("connect"),
+            auth_s=phases.get("auth"),
+            tti_s=tti if success else None,
+            strategy=run.attrs.get("strategy")
+        )
+    
+    def _persist_history(self):
+        """Batched end-of-run writes (signal history, outcome database)"""
+        self.signal_history.save()
+        self.outcomes.flush()
+    
+    async def _execute(
+        self,
+        max_age: float = 0.0,
+        demote: Tuple[str, ...] = (),
+        precheck: bool = True
+    ) -> bool:
+        """
+        Connect (from a warm candidate list if max_age allows), detect portal, authenticate
+        
+        precheck=False skips the initial connectivity check, for callers
+        that have just established we're offline.
+        """
+        # Check current connectivity
+        if precheck:
+            with span("precheck"):
+                online = await self._check_internet()
+            if online:
+                note("strategy", "already_online")
                 self.logger.info("✅ Already connected to internet")
                 return True
-            
-            # Connect to best network
-            if not self.connection_mgr.auto_connect_best():
-                self.logger.error("❌ Failed to connect to any network")
-                return False
-            
-            await asyncio.sleep(3)  # Stabilize
-            
-            # Detect captive portal
-            is_captive, portal_url = await NetworkTools.detect_captive_portal(session)
-            
-            if not is_captive:
-                self.logger.info("✅ Direct internet access")
-                return True
-            
-            # Use configured portal URL if detection failed
-            if not portal_url:
-                portal_url = self.config.portal_url
-            
-            self.logger.info(f"🔐 Captive portal detected: {portal_url}")
-            
-            # Authenticate
+        
+        # Connect to best network
+        connected = await self.connection_mgr.auto_connect_best(max_age, demote)
+        if not connected:
+            self.logger.error("❌ Failed to connect to any network")
+            return False
+        
+        # Wait for DHCP/route/DNS instead of a fixed settle delay
+        with span("stabilize"):
+            ready = await wait_until(self._link_ready, self.config.connection_timeout)
+        if not ready:
+            self.logger.warning("⚠️  Link not fully ready (route/DNS) - probing anyway")
+        # After DHCP, so the gateway (and its MAC) identify the network
+        await self.http.network_changed(self.network_id())
+        
+        # Detect captive portal
+        is_captive, portal_url = await self._detect_captive_portal()
+        
+        if not is_captive:
+            note("strategy", "direct")
+            self.logger.info("✅ Direct internet access")
+            return True
+        
+        # Use configured portal URL if detection failed
+        if not portal_url:
+            portal_url = self.config.portal_url
+        
+        self.logger.info(f"🔐 Captive portal detected: {portal_url}")
+        
+        return await self._authenticate(portal_url)
+    
+    def network_id(self) -> str:
+        """The network we're on (AuthCache.network)"""
+        network = self.connection_mgr.current_network
+        return AuthCache.network(
+            network.ssid if network else None,
+            NetworkTools.gateway_mac(self.connection_mgr.interface)
+        )
+    
+    def network_key(self, portal_url: str) -> str:
+        """AuthCache key of the network we're on"""
+        return AuthCache.key(self.network_id(), portal_url)
+    
+    async def _authenticate(self, portal_url: str, force: bool = False) -> bool:
+        """Log in to the portal and confirm we're online"""
+        self.connection_mgr.state = ConnectionState.AUTHENTICATING
+        self.auth_key = self.network_key(portal_url)
+        
+        with span("auth"):
             success = await self.authenticator.authenticate(
                 portal_url,
                 self.config.username,
-                self.config.password
+                self.config.password,
+                cache_key=self.auth_key,
+                force=force
             )
-            
-            if success and await NetworkTools.check_internet(session):
-                self.logger.info("🎯 AUTHENTICATED SUCCESSFULLY!")
-                return True
-            
-            self.logger.error("❌ Authentication failed")
-            return False
+        
+        with span("verify"):
+            if success:
+                # Answers cached while the portal hijacked DNS are stale now
+                self.http.clear_dns_cache()
+                self.http.save_cookies()
+            online = success and await self._check_internet()
+        if online:
+            self.connection_mgr.state = ConnectionState.AUTHENTICATED
+            self.logger.info("🎯 AUTHENTICATED SUCCESSFULLY!")
+            return True
+        
+        self.connection_mgr.state = ConnectionState.FAILED
+        self.logger.error("❌ Authentication failed")
+        return False
+
+# ═══════════════════════════════════════════════════════════════════
+# SUPERVISOR (DAEMON MODE)
+# ═══════════════════════════════════════════════════════════════════
+
+class Supervisor:
+    """
+    Long-running mode: one event loop, one HTTP session factory, one warm browser
+    
+    A cheap connectivity probe runs every health_check_interval seconds.
+    Only when it fails does the supervisor act: an expired portal session
+    on the current network is simply re-authenticated (and its lifetime
+    learned), anything else fails over using the background scan refreshed
+    every scan_interval seconds. Once a portal's session lifetime is
+    known, the login is renewed just before it runs out.
+    The state is served as JSON on a UNIX socket (Config.status_socket).
+    """
+    
+    def __init__(self, arsenal: ShadowWiFiArsenal):
+        self.arsenal = arsenal
+        self.config = arsenal.config
+        self.logger = arsenal.logger
+        self.connection_mgr = arsenal.connection_mgr
+        self.online = False
+        self.started = datetime.now()
+        self.last_check: Optional[datetime] = None
+        self.last_ok: Optional[float] = None  # time.time() of the last good probe
+        self.reauths = 0
+        self.renewals = 0
+        self.failovers = 0
+    
+    async def check_once(self) -> bool:
+        """Probe connectivity; re-authenticate or fail over if it's gone"""
+        arsenal = self.arsenal
+        self.last_check = datetime.now()
+        
+        if await arsenal._check_internet():
+            if self.connection_mgr.state not in (ConnectionState.CONNECTED, ConnectionState.AUTHENTICATED):
+                self.connection_mgr.state = ConnectionState.CONNECTED
+            self.online = True
+            self.last_ok = time.time()
+            return True
+        
+        self.online = False
+        self.logger.warning("⚠️  No connectivity")
+        
+        # Still associated: an expired portal session only needs a new login
+        if self.connection_mgr.current_network and self.connection_mgr.state in (
+            ConnectionState.CONNECTED, ConnectionState.AUTHENTICATED
+        ):
+            is_captive, portal_url = await arsenal._detect_captive_portal()
+            if is_captive:
+                self.reauths += 1
+                if arsenal.auth_key:
+                    arsenal.authenticator.auth_cache.expired(arsenal.auth_key, self.last_ok)
+                self.online = await arsenal._authenticate(portal_url or self.config.portal_url)
+                if self.online:
+                    return True
+        
+        # Fail over from the warm candidate list, the dead network last
+        self.failovers += 1
+        current = self.connection_mgr.current_network
+        demote = (current.bssid,) if current else ()
+        self.online = await arsenal.run_once(2 * self.config.scan_interval, demote, precheck=False)
+        return self.online
+    
+    RENEW_MARGIN = 30  # seconds before the learned expiry to log in again
+    
+    def _renew_in(self) -> Optional[float]:
+        """Seconds until the portal session should be renewed (None if unknown)"""
+        key = self.arsenal.auth_key
+        expires = key and self.arsenal.authenticator.auth_cache.expires_at(key)
+        if not expires:
+            return None
+        return max(0.0, expires - self.RENEW_MARGIN - time.time())
+    
+    async def renew(self) -> bool:
+        """Log in again before the portal ends the session"""
+        arsenal = self.arsenal
+        portal_url = arsenal.authenticator.auth_cache.portal_url(arsenal.auth_key) or self.config.portal_url
+        self.logger.info("🔄 Renewing portal session before it expires")
+        self.renewals += 1
+        ok = await arsenal._authenticate(portal_url, force=True)
+        self.online = self.online and ok
+        return ok
+    
+    async def _health_loop(self):
+        while True:
+            try:
+                ok = await self.check_once()
+                renew_in = self._renew_in() if ok else None
+                if renew_in is not None and renew_in < self.config.health_check_interval:
+                    await asyncio.sleep(renew_in)
+                    ok = await self.renew()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Health check failed: {type(e).__name__}: {e}")
+                ok = False
+            await asyncio.to_thread(self.arsenal._persist_history)
+            # Retry soon while offline, relax once healthy
+            await asyncio.sleep(self.config.health_check_interval if ok else self.config.retry_delay)
+    
+    async def _scan_loop(self):
+        while True:
+            await asyncio.sleep(self.config.scan_interval)
+            if self.connection_mgr.state in (ConnectionState.CONNECTING, ConnectionState.AUTHENTICATING):
+                continue
+            try:
+                await self.connection_mgr.scan()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug(f"Background scan failed: {e}")
+    
+    def status(self) -> Dict:
+        network = self.connection_mgr.current_network
+        age = self.connection_mgr.candidates_age()
+        key = self.arsenal.auth_key
+        expires = self.arsenal.authenticator.auth_cache.expires_at(key) if key else None
+        return {
+            "state": self.connection_mgr.state.name,
+            "online": self.online,
+            "ssid": network.ssid if network else None,
+            "bssid": network.bssid if network else None,
+            "interface": self.connection_mgr.interface,
+            "signal": network.signal if network else None,
+            "started": self.started.isoformat(timespec="seconds"),
+            "last_check": self.last_check.isoformat(timespec="seconds") if self.last_check else None,
+            "candidates": len(self.connection_mgr.candidates),
+            "candidates_age": round(age, 1) if age is not None else None,
+            "reauths": self.reauths,
+            "renewals": self.renewals,
+            "session_expires": (
+                datetime.fromtimestamp(expires).isoformat(timespec="seconds") if expires else None
+            ),
+            "failovers": self.failovers,
+        }
+    
+    async def _serve_status(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            writer.write(json.dumps(self.status()).encode() + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+    
+    async def run(self):
+        """Supervise until cancelled"""
+        path = self.config.status_socket
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        
+        server = await asyncio.start_unix_server(self._serve_status, path=str(path))
+        path.chmod(0o600)
+        self.logger.info(f"🛡️  Supervisor running (status: {path})")
+        tasks = [asyncio.create_task(self._health_loop()), asyncio.create_task(self._scan_loop())]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            server.close()
+            await server.wait_closed()
+            path.unlink(missing_ok=True)
+            self.arsenal._persist_history()
+            await self.arsenal.http.close()
+            await self.arsenal.browser_pool.close()
+
+async def query_status(path: Path) -> Dict:
+    """Read the supervisor's state from its UNIX socket"""
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    try:
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
 
 # ═══════════════════════════════════════════════════════════════════
 # MAIN ENTRY POINT
@@ -1035,6 +3144,30 @@ class ShadowWiFiArsenal:
 
 async def main():
     """Main entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="WiFi Recon & Auto-Connect Arsenal")
+    parser.add_argument("--report", action="store_true",
+                        help="Print p50/p95 phase timings of recorded runs and exit")
+    parser.add_argument("--last", type=int, default=0, metavar="N",
+                        help="Only summarize the last N runs (with --report)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay running: monitor, re-authenticate and fail over")
+    parser.add_argument("--status", action="store_true",
+                        help="Print the running supervisor's state and exit")
+    args = parser.parse_args()
+    
+    if args.report:
+        print(summarize_runs(Config.cache_dir, args.last))
+        return
+    
+    if args.status:
+        try:
+            print(json.dumps(await query_status(Config.status_socket), indent=2))
+        except OSError as e:
+            print(f"❌ No supervisor running ({e})")
+            sys.exit(1)
+        return
     
     print("""
 ╔═══════════════════════════════════════════════════════════════════╗
@@ -1077,6 +3210,10 @@ async def main():
     # Execute
     arsenal = ShadowWiFiArsenal(config)
     
+    if args.daemon:
+        await Supervisor(arsenal).run()
+        return
+    
     print("🔍 Scanning for networks...")
     success = await arsenal.execute()
     